@@ -1,7 +1,7 @@
 import itertools
 from typing import Optional, Sequence
 
-import aocd
+from aoctool import inputs
 
 
 def solve_day1(entries: Sequence[int]) -> Optional[int]:
@@ -26,7 +26,13 @@ def test_solve_day1_part2():
     assert solve_day1_part2([1721, 979, 366, 299, 675, 1456]) == 241861950
 
 
+PARTS = {
+    "part1": lambda data: solve_day1([int(s) for s in data.split("\n")]),
+    "part2": lambda data: solve_day1_part2([int(s) for s in data.split("\n")]),
+}
+
+
 if __name__ == "__main__":
-    data = [int(s) for s in aocd.get_data(day=1, year=2020).split("\n")]
+    data = [int(s) for s in inputs.get_data(day=1, year=2020).split("\n")]
     print(f"Day 1 solution: {solve_day1(data)}")
     print(f"Day 1 part 2 solution: {solve_day1_part2(data)}")
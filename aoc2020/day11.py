@@ -1,7 +1,6 @@
-import aocd
-import numba
 import numpy as np
-from numba import njit
+import pytest
+from aoctool import grid, inputs, jit
 
 TEST_DATA = """L.LL.LL.LL
 LLLLLLL.LL
@@ -22,39 +21,115 @@ MAP = {".": EMPTY, "L": SEAT, "#": OCCUPIED}
 
 
 def parse(data: str) -> np.ndarray:
-    return np.array([[MAP[c] for c in line] for line in data.split("\n")])
-
-
-def neighborhood(data: np.ndarray) -> np.ndarray:
-    data = np.pad(data, ((1, 1), (1, 1)), "constant") == OCCUPIED
-    return np.stack(
-        [
-            data[:-2, :-2],
-            data[:-2, 1:-1],
-            data[:-2, 2:],
-            data[1:-1, :-2],
-            data[1:-1, 2:],
-            data[2:, :-2],
-            data[2:, 1:-1],
-            data[2:, 2:],
-        ],
-        axis=2,
-    ).sum(axis=2)
+    return grid.parse(data, MAP, dtype=int)
+
+
+# the 8 directions, towards which every seat sees at most one other seat
+DIRECTIONS = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+
+
+@jit.njit
+def nearest_seats(seats: np.ndarray, di: int, dj: int, line_of_sight: bool) -> np.ndarray:
+    """Seat seen from every cell towards (di, dj), -1 if there is none.
+
+    `seats` holds the seat numbers, -1 on the floor. Cells are visited so that the
+    next cell in the direction is done first, and can pass on what it sees.
+    """
+    height, width = seats.shape
+    nearest = np.full((height, width), -1, dtype=np.int32)
+    for ii in range(height):
+        i = height - 1 - ii if di > 0 else ii
+        for jj in range(width):
+            j = width - 1 - jj if dj > 0 else jj
+            ni, nj = i + di, j + dj
+            if 0 <= ni < height and 0 <= nj < width:
+                if seats[ni, nj] >= 0 or not line_of_sight:
+                    nearest[i, j] = seats[ni, nj]
+                else:
+                    nearest[i, j] = nearest[ni, nj]
+    return nearest
+
+
+def seat_graph(data: np.ndarray, line_of_sight: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Seats seen from every seat, numbered in row-major order, as a CSR array: the
+    neighbours of seat `s` are `indices[indptr[s]:indptr[s + 1]]`."""
+    is_seat = data != EMPTY
+    seats = np.where(is_seat, np.cumsum(is_seat).reshape(data.shape) - 1, -1).astype(np.int32)
+    seen = np.stack(
+        [nearest_seats(seats, di, dj, line_of_sight)[is_seat] for di, dj in DIRECTIONS],
+        axis=1,
+    )
+    found = seen >= 0
+    indptr = np.concatenate([[0], np.cumsum(found.sum(axis=1))])
+    return indptr, seen[found]
+
+
+@jit.njit
+def settle(
+    indptr: np.ndarray, indices: np.ndarray, occupied: np.ndarray, tolerance: int
+) -> int:
+    """Update the seats in place until they stop changing, and return the period of the
+    final layout: 1 once stable, 2 if it alternates between two layouts.
+
+    Only the seats next to a change are considered at every round. The rule is a
+    symmetric threshold network, so no longer cycle can happen.
+    """
+    n_seats = len(occupied)
+    seen = np.zeros(n_seats, dtype=np.int32)
+    for s in range(n_seats):
+        if occupied[s]:
+            for k in range(indptr[s], indptr[s + 1]):
+                seen[indices[k]] += 1
+
+    frontier = np.arange(n_seats)
+    n_frontier = n_seats
+    queued = np.full(n_seats, -1)
+    flips = np.empty(n_seats, dtype=np.int64)
+    previous = np.empty(0, dtype=np.int64)
+    generation = 0
+    while True:
+        n_flips = 0
+        for f in range(n_frontier):
+            s = frontier[f]
+            if (seen[s] >= tolerance) if occupied[s] else (seen[s] == 0):
+                flips[n_flips] = s
+                n_flips += 1
+        if n_flips == 0:
+            return 1
+        changed = np.sort(flips[:n_flips])
+        if len(changed) == len(previous) and (changed == previous).all():
+            return 2
+        previous = changed
+
+        generation += 1
+        n_frontier = 0
+        for s in changed:
+            delta = -1 if occupied[s] else 1
+            occupied[s] = 1 - occupied[s]
+            if queued[s] != generation:
+                queued[s] = generation
+                frontier[n_frontier] = s
+                n_frontier += 1
+            for k in range(indptr[s], indptr[s + 1]):
+                t = indices[k]
+                seen[t] += delta
+                if queued[t] != generation:
+                    queued[t] = generation
+                    frontier[n_frontier] = t
+                    n_frontier += 1
+
+
+def occupied_seats(data: np.ndarray, line_of_sight: bool, tolerance: int) -> int:
+    indptr, indices = seat_graph(data, line_of_sight)
+    occupied = (data[data != EMPTY] == OCCUPIED).astype(np.uint8)
+    period = settle(indptr, indices, occupied, tolerance)
+    if period != 1:
+        raise ValueError(f"the seating layout cycles with period {period}")
+    return int(occupied.sum())
 
 
 def day11_part1(data: np.ndarray) -> int:
-    while True:
-        neighbors = neighborhood(data)
-        new_data = np.where(
-            (data == OCCUPIED) & (neighbors >= 4),
-            SEAT,
-            np.where((data == SEAT) & (neighbors == 0), OCCUPIED, data),
-        )
-
-        if np.all(new_data == data):
-            return int(np.sum(new_data == OCCUPIED))
-        else:
-            data = new_data
+    return occupied_seats(data, line_of_sight=False, tolerance=4)
 
 
 def test_day11_part1():
@@ -68,57 +143,37 @@ def to_string(data: np.ndarray) -> str:
     )
 
 
-@njit
-def first_occupied(line: np.ndarray) -> int:
-    (idx,) = np.where(line != EMPTY)
-    if len(idx) == 0:
-        return 0
-    else:
-        return 1 if line[idx[0]] == OCCUPIED else 0
-
-
-@njit
-def neighborhood_part2(data: np.ndarray) -> np.ndarray:
-    padded_data = np.zeros(shape=(data.shape[0] + 2, data.shape[1] + 2))
-    padded_data[1:-1, 1:-1] = data
-    out = np.empty(shape=data.shape)
-    for i in range(1, padded_data.shape[0] - 1):
-        for j in range(1, padded_data.shape[1] - 1):
-            out[i - 1, j - 1] = (
-                first_occupied(padded_data[i + 1 :, j])
-                + first_occupied(padded_data[i, j + 1 :])
-                + first_occupied(padded_data[i - 1 :: -1, j])
-                + first_occupied(padded_data[i, j - 1 :: -1])
-                + first_occupied(np.diag(padded_data[i + 1 :, j + 1 :]))
-                + first_occupied(np.diag(padded_data[i - 1 :: -1, j - 1 :: -1]))
-                + first_occupied(np.diag(padded_data[i - 1 :: -1, j + 1 :]))
-                + first_occupied(np.diag(padded_data[i + 1 :, j - 1 :: -1]))
-            )
-    return out
-
-
-@njit
 def day11_part2(data: np.ndarray) -> int:
-    while True:
-        neighbors = neighborhood_part2(data)
-        new_data = np.where(
-            (data == OCCUPIED) & (neighbors >= 5),
-            SEAT,
-            np.where((data == SEAT) & (neighbors == 0), OCCUPIED, data),
-        )
-
-        if np.all(new_data == data):
-            return int(np.sum(new_data == OCCUPIED))
-        else:
-            data = new_data
+    return occupied_seats(data, line_of_sight=True, tolerance=5)
 
 
 def test_day11_part2():
     assert day11_part2(parse(TEST_DATA)) == 26
 
 
+def test_seat_graph():
+    indptr, indices = seat_graph(parse(".L.L.#.#.L"), line_of_sight=True)
+    assert indptr.tolist() == [0, 1, 3, 5, 7, 8]
+    assert indices.tolist() == [1, 0, 2, 1, 3, 2, 4, 3]
+    indptr, indices = seat_graph(parse("L.\n.L\n..\nL."), line_of_sight=False)
+    assert indptr.tolist() == [0, 1, 2, 2] and indices.tolist() == [1, 0]
+    # two seats on their own are taken and left forever
+    with pytest.raises(ValueError):
+        occupied_seats(parse("LL"), line_of_sight=False, tolerance=1)
+
+
+def warmup():
+    day11_part2(parse(TEST_DATA))
+
+
+PARTS = {
+    "part1": lambda data: day11_part1(parse(data)),
+    "part2": lambda data: day11_part2(parse(data)),
+}
+
+
 def main():
-    data = parse(aocd.get_data(day=11, year=2020))
+    data = parse(inputs.get_data(day=11, year=2020))
     print(f"day 11 part 1: {day11_part1(data)}")
     print(f"day 11 part 2: {day11_part2(data)}")
 
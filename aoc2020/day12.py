@@ -1,5 +1,5 @@
-import aocd
 import numpy as np
+from aoctool import inputs
 
 TEST_DATA = """F10
 N3
@@ -93,8 +93,8 @@ def test_day12_part2():
 
 
 def main():
-    print(f"day 12 part 1: {day12_part1(aocd.get_data(day=12, year=2020))}")
-    print(f"day 12 part 2: {day12_part2(aocd.get_data(day=12, year=2020))}")
+    print(f"day 12 part 1: {day12_part1(inputs.get_data(day=12, year=2020))}")
+    print(f"day 12 part 2: {day12_part2(inputs.get_data(day=12, year=2020))}")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,8 @@ import math
 from fractions import Fraction
 from typing import Optional
 
-import aocd
 import numpy as np
+from aoctool import inputs, variants
 
 TEST_DATA = """939
 7,13,x,x,59,x,31,19"""
@@ -25,6 +25,14 @@ def test_day13_part1():
     assert day13_part1(TEST_DATA) == 295
 
 
+part2 = variants.VariantGroup(
+    "day13_part2", samples=["17,x,13,19", "3,5,7", "5,x,x,7,x,11,13"]
+)
+
+
+# the first four variants are searches bounded by `max_n`, which cannot reach the answer
+# for actual inputs
+@part2.variant(selectable=False, max_n=10**4)
 def day13_part2(data: str, max_n: Optional[int] = None) -> int:
     data = [(int(x), i) for i, x in enumerate(data.split(",")) if x != "x"]
 
@@ -48,6 +56,7 @@ def day13_part2(data: str, max_n: Optional[int] = None) -> int:
         return min(itrsct) * first_id
 
 
+@part2.variant(selectable=False, max_n=10**6)
 def day13_part2_v2(data: str, max_n: Optional[int] = None) -> int:
     data = [(int(x), i) for i, x in enumerate(data.split(",")) if x != "x"]
 
@@ -80,6 +89,7 @@ def day13_part2_v2(data: str, max_n: Optional[int] = None) -> int:
 
 
 # noinspection DuplicatedCode
+@part2.variant(selectable=False, max_n=10**6)
 def day13_part2_v3(data: str, max_n: Optional[int] = None) -> int:
     data = [(int(x), i) for i, x in enumerate(data.split(",")) if x != "x"]
 
@@ -118,6 +128,7 @@ def day13_part2_v3(data: str, max_n: Optional[int] = None) -> int:
 
 
 # noinspection DuplicatedCode
+@part2.variant(selectable=False, max_n=10**6)
 def day13_part2_v4(data: str, max_n: Optional[int] = None) -> int:
     data = [(int(x), i) for i, x in enumerate(data.split(",")) if x != "x"]
 
@@ -158,6 +169,7 @@ def day13_part2_v4(data: str, max_n: Optional[int] = None) -> int:
         return base_set[0] * first_id
 
 
+@part2.variant
 def day13_part2_v5(data: str) -> int:
     from sympy.ntheory.modular import crt
 
@@ -173,12 +185,22 @@ def test_day13_part2():
     assert day13_part2_v4("1789,37,47,1889", 10000000000) == 1202161486
 
 
+def test_day13_part2_variants():
+    assert part2.check() == [3417, 54, 4505]
+
+
+PARTS = {
+    "part1": day13_part1,
+    "part2": lambda data: part2(data.splitlines()[1]),
+}
+
+
 def main():
-    data = aocd.get_data(day=13, year=2020)
+    data = inputs.get_data(day=13, year=2020)
     print(f"day 13 part 1: {day13_part1(data)}")
 
     _, data_part2 = data.split("\n")
-    print(f"day 13 part 2: {day13_part2_v5(data_part2)}")
+    print(f"day 13 part 2: {part2(data_part2)}")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
-import aocd
 import numpy as np
+from aoctool import inputs
 
 TEST_DATA = """mask = XXXXXXXXXXXXXXXXXXXXXXXXXXXXX1XXXX0X
 mem[8] = 11
@@ -64,8 +64,8 @@ def test_day14_part2():
 
 
 def main():
-    print(f"day 14 part 1: {day14_part1(aocd.get_data(day=14, year=2020))}")
-    print(f"day 14 part 2: {day14_part2(aocd.get_data(day=14, year=2020))}")
+    print(f"day 14 part 1: {day14_part1(inputs.get_data(day=14, year=2020))}")
+    print(f"day 14 part 2: {day14_part2(inputs.get_data(day=14, year=2020))}")
 
 
 if __name__ == "__main__":
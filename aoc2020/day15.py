@@ -1,6 +1,94 @@
+import functools
 from collections import Counter
+from typing import Iterator
 
+import numpy as np
+from aoctool import jit, variants
 
+part = variants.VariantGroup("day15", samples=[("0,3,6", 2020), ("3,1,2", 2020)])
+
+
+# the last turns of numbers below this stay in the CPU cache
+HOT = 1 << 16
+
+
+@jit.njit
+def speak(
+    last_seen: np.ndarray, seen: np.ndarray, spoken: int, turn: int, stop: int, out: np.ndarray
+) -> int:
+    """Play from `turn`, where `spoken` was said, to `stop`, and return the last number.
+
+    `last_seen[n]` is the last turn before `turn` where `n` was said, 0 if it never was.
+    Large numbers are mostly said once: the `seen` bitset tells which ones were said
+    before, so that the large table is rarely read. The numbers said after `turn` are
+    written to `out`, unless it is empty.
+    """
+    record = len(out) > 0
+    for t in range(turn, stop):
+        if spoken < HOT:
+            before = last_seen[spoken]
+            last_seen[spoken] = t
+            spoken = t - before if before else 0
+        else:
+            word = spoken >> 6
+            bit = np.uint64(1) << np.uint64(spoken & 63)
+            if seen[word] & bit:
+                before = last_seen[spoken]
+                last_seen[spoken] = t
+                spoken = t - before
+            else:
+                seen[word] |= bit
+                last_seen[spoken] = t
+                spoken = 0
+        if record:
+            out[t - turn] = spoken
+    return spoken
+
+
+def _start(starting: list[int], rank: int) -> tuple[np.ndarray, np.ndarray]:
+    # numbers said after the starting ones are ages, hence smaller than `rank`; turns are
+    # numbered from 1 so that 0 means "never said"
+    size = max(rank, max(starting) + 1)
+    last_seen = np.zeros(size, dtype=np.int32)
+    seen = np.zeros(size // 64 + 1, dtype=np.uint64)
+    for turn, number in enumerate(starting[:-1], start=1):
+        last_seen[number] = turn
+        seen[number // 64] |= np.uint64(1 << number % 64)
+    return last_seen, seen
+
+
+@part.variant(default=True)
+def day15_table(data: str, rank: int) -> int:
+    starting = [int(c) for c in data.split(",")]
+    if rank <= len(starting):
+        return starting[rank - 1]
+    last_seen, seen = _start(starting, rank)
+    return speak(
+        last_seen, seen, starting[-1], len(starting), rank, np.empty(0, dtype=np.int32)
+    )
+
+
+def stream(data: str, rank: int, chunk: int = 1 << 20) -> Iterator[np.ndarray]:
+    """The numbers said on turns 1 to `rank`, in chunks of at most `chunk` turns.
+
+    Only the tables of last turns are kept, not the numbers said before the current chunk.
+    """
+    starting = [int(c) for c in data.split(",")]
+    if rank <= len(starting):
+        yield np.array(starting[:rank], dtype=np.int32)
+        return
+
+    yield np.array(starting, dtype=np.int32)
+    last_seen, seen = _start(starting, rank)
+    spoken = starting[-1]
+    for turn in range(len(starting), rank, chunk):
+        stop = min(turn + chunk, rank)
+        out = np.empty(stop - turn, dtype=np.int32)
+        spoken = speak(last_seen, seen, spoken, turn, stop, out)
+        yield out
+
+
+@part.variant
 def day15_part1(data: str, rank: int) -> int:
     lst = [int(c) for c in data.split(",")]
 
@@ -25,18 +113,48 @@ def day15_part1(data: str, rank: int) -> int:
 
 
 def test_day15_part1():
-    assert day15_part1("1,3,2", 2020) == 1
-    assert day15_part1("2,1,3", 2020) == 10
-    assert day15_part1("1,2,3", 2020) == 27
-    assert day15_part1("2,3,1", 2020) == 78
-    assert day15_part1("3,2,1", 2020) == 438
-    assert day15_part1("3,1,2", 2020) == 1836
+    for play in (day15_table, day15_part1):
+        assert play("1,3,2", 2020) == 1
+        assert play("2,1,3", 2020) == 10
+        assert play("1,2,3", 2020) == 27
+        assert play("2,3,1", 2020) == 78
+        assert play("3,2,1", 2020) == 438
+        assert play("3,1,2", 2020) == 1836
+
+
+def test_day15_part2():
+    assert day15_table("0,3,6", 30000000) == 175594
+    # large starting numbers go through the bitset
+    assert day15_table("100000,3,100000", 2020) == day15_part1("100000,3,100000", 2020)
+
+
+def test_stream():
+    assert np.concatenate(list(stream("0,3,6", 10, chunk=3))).tolist() == [
+        0, 3, 6, 0, 3, 3, 1, 0, 4, 0
+    ]  # fmt: skip
+    assert np.concatenate(list(stream("0,3,6", 2))).tolist() == [0, 3]
+    assert [len(c) for c in stream("0,3,6", 2020, chunk=1000)] == [3, 1000, 1000, 17]
+    assert list(stream("0,3,6", 2020))[-1][-1] == day15_table("0,3,6", 2020)
+
+
+def test_day15_variants():
+    assert part.check() == [436, 1836]
+
+
+def warmup():
+    day15_table("0,3,6", 10)
+
+
+PARTS = {
+    "part1": functools.partial(part, rank=2020),
+    "part2": functools.partial(part, rank=30000000),
+}
 
 
 def main():
     data = "6,13,1,15,2,0"
-    print(f"day 14 part 1: {day15_part1(data, 2020)}")
-    print(f"day 14 part 2: {day15_part1(data, 30000000)}")
+    print(f"day 14 part 1: {part(data, 2020)}")
+    print(f"day 14 part 2: {part(data, 30000000)}")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,8 @@ import re
 from io import StringIO
 from typing import Dict, List, Tuple
 
-import aocd
 import numpy as np
+from aoctool import inputs
 
 TEST_DATA = """class: 1-3 or 5-7
 row: 6-11 or 33-44
@@ -109,8 +109,8 @@ def day16_part2(data: str) -> int:
 
 
 def main():
-    print(f"day 16 part 1: {day16_part1(aocd.get_data(day=16, year=2020))}")
-    print(f"day 16 part 2: {day16_part2(aocd.get_data(day=16, year=2020))}")
+    print(f"day 16 part 1: {day16_part1(inputs.get_data(day=16, year=2020))}")
+    print(f"day 16 part 2: {day16_part2(inputs.get_data(day=16, year=2020))}")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,16 @@
 import itertools
+import math
 from collections import Counter
 
-import aocd
 import numpy as np
-from scipy.signal import convolve
+from aoctool import automaton, grid, inputs, lazy, variants
+
+convolve = lazy.attribute("scipy.signal", "convolve")
+
+TEST_DATA = ".#.\n..#\n###"
+
+part1 = variants.VariantGroup("day17_part1", samples=[TEST_DATA])
+part2 = variants.VariantGroup("day17_part2", samples=[TEST_DATA])
 
 
 def update_world(world: np.ndarray) -> np.ndarray:
@@ -19,6 +26,8 @@ def update_world(world: np.ndarray) -> np.ndarray:
     return np.where(world, (summed_world == 2) | (summed_world == 3), summed_world == 3)
 
 
+@part2.variant(name="day17_numpy", niter=6, ndim=4)
+@part1.variant(name="day17_numpy", niter=6, ndim=3)
 def day17(data: str, niter: int, ndim: int) -> int:
     seed = np.array([[c == "#" for c in line] for line in data.split("\n")], dtype=bool)
 
@@ -34,15 +43,150 @@ def test_day17():
     assert day17(data, 6, 4) == 848
 
 
-def main():
-    print(f"day 17 part 1: {day17(aocd.get_data(day=17, year=2020), 6, 3)}")
-    print(f"day 17 part 2: {day17(aocd.get_data(day=17, year=2020), 6, 4)}")
+@part2.variant(name="day17_automaton", ndim=4)
+@part1.variant(name="day17_automaton", ndim=3)
+def day17_automaton(data: str, ndim: int) -> int:
+    seed = grid.parse(data, {"#": 1, ".": 0}, dtype=np.uint8)
+    rule = automaton.CountRule.life(neighbours=3**ndim - 1)
+    world = automaton.Automaton(seed.reshape(seed.shape + (1,) * (ndim - 2)), rule)
+    world.run(6)
+    return world.count()
+
+
+def test_day17_automaton():
+    assert day17_automaton(TEST_DATA, 3) == 112
+    assert day17_automaton(TEST_DATA, 4) == 848
+
+
+class Extras:
+    """Canonical coordinates of the extra dimensions, with their neighbourhoods.
+
+    The extra coordinates are all 0 initially, so the world stays symmetric under sign
+    changes and permutations of them. A cell with sorted absolute extra coordinates
+    stands for its `orbit` of symmetric cells, which are not stored.
+    """
+
+    def __init__(self, ndim: int):
+        self.offsets = np.array(list(itertools.product((-1, 0, 1), repeat=ndim)))
+        self.coords: list[tuple[int, ...]] = []
+        self.index: dict[tuple[int, ...], int] = {}
+        self.orbit: list[int] = []
+        self._neighbourhoods: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self.add((0,) * ndim)
+
+    def add(self, coord: tuple[int, ...]) -> int:
+        if coord not in self.index:
+            self.index[coord] = len(self.coords)
+            self.coords.append(coord)
+            permutations = math.factorial(len(coord)) // math.prod(
+                math.factorial(n) for n in Counter(coord).values()
+            )
+            self.orbit.append(permutations * 2 ** sum(c > 0 for c in coord))
+        return self.index[coord]
+
+    def neighbourhood(self, idx: int) -> tuple[np.ndarray, np.ndarray]:
+        """Canonical neighbours of `idx`, itself included, and the number of cells of the
+        orbit of `idx` next to each of them."""
+        if idx not in self._neighbourhoods:
+            moved = np.sort(np.abs(np.array(self.coords[idx]) + self.offsets), axis=1)
+            moved, counts = np.unique(moved, axis=0, return_counts=True)
+            targets = np.array([self.add(tuple(coord)) for coord in moved.tolist()])
+            order = np.argsort(targets)
+            targets, counts = targets[order], counts[order]
+            # pairs of neighbours from the two orbits, counted from either side
+            weights = counts * self.orbit[idx] // np.array(self.orbit)[targets]
+            self._neighbourhoods[idx] = targets, weights
+        return self._neighbourhoods[idx]
+
+
+def _accumulate(keys: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct keys, and the total weight of each.
+
+    The keys come in a few sorted runs, which a stable sort merges in linear time.
+    """
+    order = np.argsort(keys, kind="stable")
+    keys, weights = keys[order], weights[order]
+    starts = np.flatnonzero(np.diff(keys, prepend=keys[0] - 1))
+    return keys[starts], np.add.reduceat(weights, starts)
+
+
+def symmetric_life(seed: np.ndarray, ndim: int, niter: int) -> int:
+    """Number of active cells after `niter` cycles of a 2D seed in `ndim` dimensions.
+
+    Only the active cells with canonical extra coordinates are kept, as packed integers.
+    Neighbour counts are summed one axis at a time by `_accumulate`: over the weighted
+    canonical neighbours of the extra coordinates, then along both axes of the plane.
+    """
+    extras = Extras(ndim - 2)
+    x, y = np.nonzero(seed)
+    e = np.zeros(len(x), dtype=np.int64)
+
+    for _ in range(niter):
+        if len(x) == 0:
+            break
+        uniq, inverse = np.unique(e, return_inverse=True)
+        targets, weights = zip(*(extras.neighbourhood(idx) for idx in uniq.tolist()))
+        lengths = np.array([len(t) for t in targets])
+        starts = np.cumsum(lengths) - lengths
+
+        # every active cell against every canonical neighbour of its extra coordinates
+        counts = lengths[inverse]
+        cells = np.repeat(np.arange(len(x)), counts)
+        flat = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        flat += np.repeat(starts[inverse], counts)
+
+        # a margin of one cell around the plane keeps the packed neighbours apart
+        x0, y0 = x.min() - 1, y.min() - 1
+        width, depth = y.max() - y0 + 2, len(extras.coords)
+        plane = ((x - x0) * width + (y - y0)) * depth
+        keys, totals = _accumulate(
+            plane[cells] + np.concatenate(targets)[flat], np.concatenate(weights)[flat]
+        )
+        for stride in (depth, width * depth):
+            keys, totals = _accumulate(
+                (keys + stride * np.arange(-1, 2)[:, None]).ravel(), np.tile(totals, 3)
+            )
 
+        # the cell itself is counted too
+        active = np.isin(keys, plane + e, assume_unique=True)
+        keys = keys[(totals == 3) | (active & (totals == 4))]
+        xy, e = np.divmod(keys, depth)
+        x, y = np.divmod(xy, width)
+        x, y = x + x0, y + y0
+
+    return int(np.array(extras.orbit)[e].sum())
+
+
+@part2.variant(name="day17_symmetric", ndim=4)
+@part1.variant(name="day17_symmetric", ndim=3)
+def day17_symmetric(data: str, ndim: int, niter: int = 6) -> int:
+    return symmetric_life(grid.parse(data, {"#": True, ".": False}, dtype=bool), ndim, niter)
 
-if __name__ == "__main__":
-    main()
 
+def test_day17_symmetric():
+    assert day17_symmetric(TEST_DATA, 3) == 112
+    assert day17_symmetric(TEST_DATA, 4) == 848
+    assert day17_symmetric(TEST_DATA, 5) == day17(TEST_DATA, 6, 5) == 5760
+    assert day17_symmetric(TEST_DATA, 6) == 35936
+    for niter in range(6):
+        assert day17_symmetric(TEST_DATA, 3, niter) == day17(TEST_DATA, niter, 3)
 
+
+def test_day17_variants():
+    assert part1.check() == [112]
+    assert part2.check() == [848]
+
+
+PARTS = {"part1": part1, "part2": part2}
+
+
+def main():
+    print(f"day 17 part 1: {part1(inputs.get_data(day=17, year=2020))}")
+    print(f"day 17 part 2: {part2(inputs.get_data(day=17, year=2020))}")
+
+
+@part2.variant(dims=4)
+@part1.variant(dims=3)
 def day17_pure_python_u_leijurv(data, dims):
 
     neighbors = [()]
@@ -75,6 +219,7 @@ def test_day17_pure_python_u_leijurv():
     assert day17_pure_python_u_leijurv(data, 4) == 848
 
 
+@part2.variant
 def day17_part2_scipy_u_wimglenn(data):
     def evolve(A, n=6):
         kernel = np.ones((3,) * A.ndim, dtype=A.dtype)
@@ -93,3 +238,7 @@ def day17_part2_scipy_u_wimglenn(data):
 def test_day17_part2_scipy_u_wimglenn():
     data = ".#.\n..#\n###"
     assert day17_part2_scipy_u_wimglenn(data) == 848
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
+import functools
 import re
 
-import aocd
+from aoctool import inputs
 
 
 def simple_expr(expr: str) -> int:
@@ -81,9 +82,15 @@ def day18(data: str, simple_expr_func) -> int:
     return sum(int(full_expr(line, simple_expr_func)) for line in data.splitlines())
 
 
+PARTS = {
+    "part1": functools.partial(day18, simple_expr_func=simple_expr),
+    "part2": functools.partial(day18, simple_expr_func=simple_expr_v2),
+}
+
+
 def main():
-    print(f"day 18 part 1: {day18(aocd.get_data(day=18, year=2020), simple_expr)}")
-    print(f"day 18 part 2: {day18(aocd.get_data(day=18, year=2020), simple_expr_v2)}")
+    print(f"day 18 part 1: {day18(inputs.get_data(day=18, year=2020), simple_expr)}")
+    print(f"day 18 part 2: {day18(inputs.get_data(day=18, year=2020), simple_expr_v2)}")
 
 
 if __name__ == "__main__":
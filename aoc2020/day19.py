@@ -1,8 +1,9 @@
+import re
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
-import aocd
 import pytest
+from aoctool import inputs, variants
 
 TEST_DATA = """0: 4 1 5
 1: 2 3 | 3 2
@@ -149,6 +150,87 @@ def build_matcher(rule: str, rules: Dict[int, str]) -> Matcher:
         )
 
 
+part1 = variants.VariantGroup("day19_part1", samples=[TEST_DATA, TEST_DATA2])
+part2 = variants.VariantGroup("day19_part2", samples=[TEST_DATA2])
+
+
+class Grammar:
+    """Rules lowered to regular expressions, each rule being compiled once."""
+
+    def __init__(self, rules: Dict[int, str]):
+        self.rules = rules
+        self._regex: Dict[int, str] = {}
+        self._min_length: Dict[int, int] = {}
+
+    def _alternatives(self, idx: int) -> List[List[int]]:
+        return [[int(i) for i in alt.split()] for alt in self.rules[idx].split("|")]
+
+    def regex(self, idx: int) -> str:
+        if idx not in self._regex:
+            rule = self.rules[idx]
+            if rule.startswith('"'):
+                self._regex[idx] = re.escape(rule.strip('"'))
+            else:
+                alternatives = [
+                    "".join(self.regex(i) for i in alt) for alt in self._alternatives(idx)
+                ]
+                self._regex[idx] = (
+                    alternatives[0]
+                    if len(alternatives) == 1
+                    else "(?:" + "|".join(alternatives) + ")"
+                )
+        return self._regex[idx]
+
+    def min_length(self, idx: int) -> int:
+        if idx not in self._min_length:
+            rule = self.rules[idx]
+            if rule.startswith('"'):
+                self._min_length[idx] = len(rule.strip('"'))
+            else:
+                self._min_length[idx] = min(
+                    sum(self.min_length(i) for i in alt) for alt in self._alternatives(idx)
+                )
+        return self._min_length[idx]
+
+    def add_loops(self, max_length: int):
+        """Replace rules 8 and 11 by `8: 42 | 42 8` and `11: 42 31 | 42 11 31`.
+
+        Rule 8 is a repetition, and rule 11 is expanded up to the depth a message of
+        `max_length` characters can reach.
+        """
+        r42, r31 = self.regex(42), self.regex(31)
+        depth = max(1, max_length // (self.min_length(42) + self.min_length(31)))
+        self._regex[8] = f"(?:{r42})+"
+        self._regex[11] = (
+            "(?:"
+            + "|".join(f"(?:{r42}){{{n}}}(?:{r31}){{{n}}}" for n in range(1, depth + 1))
+            + ")"
+        )
+        # other compiled rules may embed the former 8 and 11
+        for idx in [idx for idx in self._regex if idx not in (8, 11, 42, 31)]:
+            del self._regex[idx]
+
+    def count_matches(self, messages: List[str], idx: int = 0) -> int:
+        """Number of messages fully matching rule `idx`, matched in a single pass."""
+        pattern = re.compile(f"^{self.regex(idx)}$", re.MULTILINE)
+        return sum(1 for _ in pattern.finditer("\n".join(messages)))
+
+
+@part1.variant(default=True)
+def day19_part1_regex(data: str) -> int:
+    messages, rules = parse(data)
+    return Grammar(rules).count_matches(messages)
+
+
+@part2.variant(default=True)
+def day19_part2_regex(data: str) -> int:
+    messages, rules = parse(data)
+    grammar = Grammar(rules)
+    grammar.add_loops(max(map(len, messages)))
+    return grammar.count_matches(messages)
+
+
+@part1.variant
 def day19_part1(data: str) -> int:
     messages, rules = parse(data)
     matcher = build_matcher(rules[0], rules)
@@ -156,6 +238,7 @@ def day19_part1(data: str) -> int:
     return sum(matcher.match(msg) == (True, "") for msg in messages)
 
 
+@part2.variant
 def day19_part2(data: str) -> int:
     messages, rules = parse(data)
     matcher_42 = build_matcher(rules[42], rules)
@@ -184,19 +267,20 @@ def day19_part2(data: str) -> int:
 def test_with_test_data2():
     assert day19_part1(TEST_DATA2) == 3
     assert day19_part2(TEST_DATA2) == 12
+    assert day19_part1_regex(TEST_DATA2) == 3
+    assert day19_part2_regex(TEST_DATA2) == 12
 
 
 def test_day19_part1():
     assert day19_part1(TEST_DATA) == 2
 
 
-def main():
-    print(f"day 19 part 1: {day19_part1(aocd.get_data(day=19, year=2020))}")
-    print(f"day 19 part 2: {day19_part2(aocd.get_data(day=19, year=2020))}")
+PARTS = {"part1": part1, "part2": part2}
 
 
-if __name__ == "__main__":
-    main()
+def main():
+    print(f"day 19 part 1: {part1(inputs.get_data(day=19, year=2020))}")
+    print(f"day 19 part 2: {part2(inputs.get_data(day=19, year=2020))}")
 
 
 ##################
@@ -227,6 +311,7 @@ def match_rule(s: str, rule: str, rules: Dict[int, str]) -> Tuple[bool, str]:
         return True, s
 
 
+@part1.variant
 def day19_part1_v2(data: str) -> int:
     messages, rules = parse(data)
     return sum(match_rule(msg, rules[0], rules) == (True, "") for msg in messages)
@@ -234,9 +319,10 @@ def day19_part1_v2(data: str) -> int:
 
 def test_day18_part1_v2():
     assert day19_part1_v2(TEST_DATA) == 2
-    assert day19_part1_v2(aocd.get_data(day=19, year=2020)) == 192
+    assert day19_part1_v2(inputs.get_data(day=19, year=2020)) == 192
 
 
+@part2.variant
 def day19_part2_v2(data: str) -> int:
     messages, rules = parse(data)
 
@@ -261,16 +347,25 @@ def day19_part2_v2(data: str) -> int:
 
 
 @pytest.mark.benchmark(group="day19_part1")
-@pytest.mark.parametrize("func", [day19_part1, day19_part1_v2])
+@pytest.mark.parametrize("func", list(part1.variants.values()), ids=list(part1.variants))
 def test_benchmarks(benchmark, func):
-    data = aocd.get_data(day=19, year=2020)
+    data = inputs.get_data(day=19, year=2020)
     res = benchmark(func, data)
     assert res == 192
 
 
 @pytest.mark.benchmark(group="day19_part2")
-@pytest.mark.parametrize("func", [day19_part2, day19_part2_v2])
+@pytest.mark.parametrize("func", list(part2.variants.values()), ids=list(part2.variants))
 def test_benchmarks_part2(benchmark, func):
-    data = aocd.get_data(day=19, year=2020)
+    data = inputs.get_data(day=19, year=2020)
     res = benchmark(func, data)
     assert res == 296
+
+
+def test_day19_variants():
+    assert part1.check() == [2, 3]
+    assert part2.check() == [12]
+
+
+if __name__ == "__main__":
+    main()
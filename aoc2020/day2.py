@@ -2,7 +2,7 @@ import re
 from collections import Counter
 from typing import Tuple
 
-import aocd
+from aoctool import inputs
 
 
 def parse(pwd: str) -> Tuple[int, int, str, str]:
@@ -36,9 +36,15 @@ def test_check_password_part2():
     assert not check_password_part2("2-9 c: ccccccccc")
 
 
+PARTS = {
+    "part1": lambda data: sum(check_password(s) for s in data.split("\n")),
+    "part2": lambda data: sum(check_password_part2(s) for s in data.split("\n")),
+}
+
+
 if __name__ == "__main__":
-    res = sum(check_password(s) for s in aocd.get_data(day=2, year=2020).split("\n"))
+    res = sum(check_password(s) for s in inputs.get_data(day=2, year=2020).split("\n"))
     print("Day 1 part 1 solution: ", res)
 
-    res = sum(check_password_part2(s) for s in aocd.get_data(day=2, year=2020).split("\n"))
+    res = sum(check_password_part2(s) for s in inputs.get_data(day=2, year=2020).split("\n"))
     print("Day 1 part 2 solution: ", res)
@@ -1,9 +1,10 @@
-import re
-from collections import Counter, defaultdict
-from typing import Dict, List, Optional, Set, Tuple
+import dataclasses
+import functools
+import math
+from collections import defaultdict
 
-import aocd
 import numpy as np
+from aoctool import inputs
 
 TEST_DATA = """Tile 2311:
 ..##.#..#.
@@ -113,200 +114,193 @@ Tile 3079:
 ..#.......
 ..#.###..."""
 
-POW2 = 2 ** np.arange(10)
-
 MONSTER_DATA = """                  # 
 #    ##    ##    ###
  #  #  #  #  #  #   """
-
 MONSTER = np.array([[c == "#" for c in line] for line in MONSTER_DATA.splitlines()])
 
 
-class Tile:
-    @staticmethod
-    def from_data(data: str) -> "Tile":
-        lines = data.splitlines()
-        res = re.match(r"Tile (\d+):", lines[0])
-        tile_id = int(res.group(1))
-        arr = np.array([[c == "#" for c in line] for line in lines[1:]])
-        arr.flags.writeable = False
-        return Tile(tile_id, arr)
-
-    def __init__(self, tile_id: int, arr: np.ndarray):
-        self.id = tile_id
-        self.data = arr
-
-        self.north = self.data[0, :].dot(POW2)
-        self.east = self.data[:, -1].dot(POW2)
-        self.south = self.data[-1, ::-1].dot(POW2)
-        self.west = self.data[::-1, 0].dot(POW2)
-
-        self.edges = (self.north, self.east, self.south, self.west)
-        self.edges_r = (
-            self.data[0, ::-1].dot(POW2),
-            self.data[::-1, -1].dot(POW2),
-            self.data[-1, :].dot(POW2),
-            self.data[:, 0].dot(POW2),
-        )
-
-    def flip(self):
-        return Tile(self.id, self.data[::-1, :])
-
-    def rotate(self):
-        return Tile(self.id, np.rot90(self.data))
-
-    def __repr__(self):
-        return f"Tile(id={self.id})"
-
-    def __hash__(self):
-        return hash(self.data.data.tobytes())
-
-
-def parse(data: str) -> Tuple[Dict[int, Tile], Dict[int, List[Tuple[Tile, int]]]]:
-    tile_map = {}
-    edge_map = defaultdict(list)
-    for tile_data in data.split("\n\n"):
-        tile = Tile.from_data(tile_data)
-        tile_map[tile.id] = tile
-        for i, edge in enumerate(tile.edges):
-            edge_map[edge].append((tile, i, False))
-        for i, edge in enumerate(tile.edges_r):
-            edge_map[edge].append((tile, i, True))
-    return tile_map, edge_map
-
-
-def find_corners(edge_map):
-
-    cnt = Counter()
-    for tile_list in edge_map.values():
-        if len(tile_list) == 1:
-            cnt.update({tile_list[0][0].id: 1})
-
-    res = []
-    for k, v in cnt.items():
-        if v == 4:
-            res.append(k)
-    return tuple(res)
+def dihedral(array: np.ndarray) -> list[np.ndarray]:
+    """Views of the 8 rotations and reflections of the last two axes of `array`."""
+    rotations = [np.rot90(array, k, axes=(-2, -1)) for k in range(4)]
+    return rotations + [rotation[..., ::-1] for rotation in rotations]
+
+
+@dataclasses.dataclass
+class Jigsaw:
+    ids: np.ndarray
+    # oriented[t, o] is tile t in orientation o
+    oriented: np.ndarray
+    # edges of every tile in every orientation, read left to right or top to bottom
+    north: np.ndarray
+    south: np.ndarray
+    west: np.ndarray
+    east: np.ndarray
+    # (tile, orientation) pairs by west and by north edge
+    by_west: dict[int, list[tuple[int, int]]]
+    by_north: dict[int, list[tuple[int, int]]]
+
+    def border(self) -> set[int]:
+        """Edges found on a single tile."""
+        tiles = defaultdict(set)
+        for tile, codes in enumerate(self.north.tolist()):
+            for code in codes:
+                tiles[code].add(tile)
+        return {code for code, found in tiles.items() if len(found) == 1}
+
+    def corners(self) -> list[int]:
+        """Tiles with two border edges, i.e. four border edge readings."""
+        border = np.array(sorted(self.border()))
+        return np.flatnonzero(np.isin(self.north, border).sum(axis=1) == 4).tolist()
+
+
+def parse(data: str) -> Jigsaw:
+    blocks = data.strip().split("\n\n")
+    ids = np.array([int(block.split()[1].rstrip(":")) for block in blocks])
+    rows = [block.splitlines()[1:] for block in blocks]
+    pixels = np.frombuffer("".join(map("".join, rows)).encode(), dtype=np.uint8)
+    tiles = (pixels == ord("#")).reshape(len(blocks), len(rows[0]), len(rows[0][0]))
+    oriented = np.stack(dihedral(tiles), axis=1)
+    weights = 2 ** np.arange(tiles.shape[-1], dtype=np.int64)
+    north = oriented[:, :, 0, :] @ weights
+    west = oriented[:, :, :, 0] @ weights
+
+    by_west, by_north = defaultdict(list), defaultdict(list)
+    for tile, (west_codes, north_codes) in enumerate(zip(west.tolist(), north.tolist())):
+        for orientation in range(8):
+            by_west[west_codes[orientation]].append((tile, orientation))
+            by_north[north_codes[orientation]].append((tile, orientation))
+
+    return Jigsaw(
+        ids=ids,
+        oriented=oriented,
+        north=north,
+        south=oriented[:, :, -1, :] @ weights,
+        west=west,
+        east=oriented[:, :, :, -1] @ weights,
+        by_west=dict(by_west),
+        by_north=dict(by_north),
+    )
 
 
 def day20_part1(data: str) -> int:
-    tile_map, edge_map = parse(data)
-    res = find_corners(edge_map)
-    assert len(res) == 4
-    return res[0] * res[1] * res[2] * res[3]
+    jigsaw = parse(data)
+    corners = jigsaw.corners()
+    assert len(corners) == 4
+    return math.prod(jigsaw.ids[corners].tolist())
 
 
 def test_day20_part1():
     assert day20_part1(TEST_DATA) == 20899048083289
 
 
-def find_edge(edge, tiles: Set[Tile]) -> Optional[Tile]:
-    for tile in tiles:
-        if edge in tile.edges:
-            return tile
-        if edge in tile.edges_r:
-            return tile
-    return None
-
-
-def orient_tile(tile: Tile, edge: int, index: int) -> Tile:
-    if edge not in tile.edges_r:
-        tile = tile.flip()
-    while tile.edges_r[index] != edge:
-        tile = tile.rotate()
-    return tile
-
-
-def remove_monster(img: np.ndarray) -> np.ndarray:
-    img = img.copy()
-    di, dj = MONSTER.shape
-    for i in range(img.shape[0] - di):
-        for j in range(img.shape[1] - dj):
-            if (img[i : i + di, j : j + dj] & MONSTER).sum() == MONSTER.sum():
-                img[i : i + di, j : j + dj] = img[i : i + di, j : j + dj] & (~MONSTER)
-    return img
-
-
-def day20_part2(data: str, n: int) -> int:
-    tile_map, edge_map = parse(data)
-    seed_id, _, _, _ = find_corners(edge_map)
-    seed = tile_map[seed_id]
-
-    tile_set = set(tile_map.values())
-    tile_set.discard(seed)
-
-    # orient seed tile
-    while (
-        find_edge(seed.north, tile_set) is not None
-        or find_edge(seed.west, tile_set) is not None
-    ):
-        seed = seed.rotate()
-
-    # first line
-    line = [seed]
-    for _ in range(n - 1):
-        edge = line[-1].east
-        tile = find_edge(edge, tile_set)
-        tile_set.discard(tile)
-        tile = orient_tile(tile, edge, 3)
-        assert find_edge(tile.north, tile_set) is None
-        line.append(tile)
-
-    image = [line]
-
-    # all lines
-    for _ in range(n - 1):
-        edge = image[-1][0].south
-        tile = find_edge(edge, tile_set)
-        tile_set.discard(tile)
-        tile = orient_tile(tile, edge, 0)
-
-        line = [tile]
-        for i in range(1, n):
-            edge = line[-1].east
-            tile = find_edge(edge, tile_set)
-            tile_set.discard(tile)
-            tile = orient_tile(tile, edge, 3)
-            assert tile.north == image[-1][i].edges_r[2]
-            line.append(tile)
-
-        image.append(line)
-
-    assert len(tile_set) == 0
-
-    # build big image
-    img = np.empty(shape=(n * 8, n * 8), dtype=bool)
-    for i in range(n):
-        for j in range(n):
-            img[i * 8 : (i + 1) * 8, j * 8 : (j + 1) * 8] = image[i][j].data[1:-1, 1:-1]
+def assemble(jigsaw: Jigsaw, n: int | None = None) -> np.ndarray:
+    """Tile and orientation at every position of the `n` by `n` image.
 
-    # find monster
-    for _ in range(4):
-        new_img = remove_monster(img)
-        if not np.all(new_img == img):
-            return new_img.sum()
-        else:
-            img = np.rot90(img)
+    Neighbours are looked up by edge, so that the assembly is linear in the number of tiles.
+    """
+    n = math.isqrt(len(jigsaw.ids)) if n is None else n
+    border = jigsaw.border()
+    corner = jigsaw.corners()[0]
+    seed = next(
+        o
+        for o in range(8)
+        if jigsaw.north[corner, o] in border and jigsaw.west[corner, o] in border
+    )
 
-    img = np.fliplr(img)
+    placed = np.empty((n, n, 2), dtype=np.int64)
+    used = np.zeros(len(jigsaw.ids), dtype=bool)
+    for i in range(n):
+        for j in range(n):
+            if i == j == 0:
+                candidates = [(corner, seed)]
+            elif j == 0:
+                candidates = jigsaw.by_north[int(jigsaw.south[tuple(placed[i - 1, 0])])]
+            else:
+                candidates = jigsaw.by_west[int(jigsaw.east[tuple(placed[i, j - 1])])]
+            if i > 0:
+                above = jigsaw.south[tuple(placed[i - 1, j])]
+                candidates = [(t, o) for t, o in candidates if jigsaw.north[t, o] == above]
+            tile, orientation = next((t, o) for t, o in candidates if not used[t])
+            used[tile] = True
+            placed[i, j] = tile, orientation
+    return placed
+
+
+def image(jigsaw: Jigsaw, placed: np.ndarray) -> np.ndarray:
+    """The assembled image, without the tile borders."""
+    n = len(placed)
+    tiles = jigsaw.oriented[placed[..., 0], placed[..., 1], 1:-1, 1:-1]
+    size = tiles.shape[-1]
+    return tiles.transpose(0, 2, 1, 3).reshape(n * size, n * size)
+
+
+def roughness(img: np.ndarray) -> int:
+    """Number of set pixels which are not part of a sea monster, in the orientation of the
+    image where monsters are found.
+
+    Every orientation of the monster is searched at once over the whole image, by
+    combining views of the image shifted by each of its cells.
+    """
+    for monster in dihedral(MONSTER):
+        height, width = (
+            img.shape[0] - monster.shape[0] + 1,
+            img.shape[1] - monster.shape[1] + 1,
+        )
+        cells = np.argwhere(monster)
+        found = np.ones((height, width), dtype=bool)
+        for di, dj in cells:
+            found &= img[di : di + height, dj : dj + width]
+        if found.any():
+            covered = np.zeros_like(img)
+            for di, dj in cells:
+                covered[di : di + height, dj : dj + width] |= found
+            return int(img.sum() - covered.sum())
+    raise ValueError("no sea monster in any orientation")
 
-    for _ in range(4):
-        new_img = remove_monster(img)
-        if not np.all(new_img == img):
-            return new_img.sum()
-        else:
-            img = np.rot90(img)
 
-    assert False
+def day20_part2(data: str, n: int | None = None) -> int:
+    jigsaw = parse(data)
+    return roughness(image(jigsaw, assemble(jigsaw, n)))
 
 
 def test_day20_part2():
-    assert day20_part2(TEST_DATA, 3) == 273
+    assert day20_part2(TEST_DATA, n=3) == 273
+
+
+def test_assemble():
+    # a larger jigsaw cut out of a random image, with shuffled and reoriented tiles: edges
+    # are long enough to be unique
+    rng = np.random.default_rng(0)
+    n, size = 12, 32
+    full = rng.random((n * (size - 1) + 1, n * (size - 1) + 1)) < 0.5
+    blocks = []
+    for k, index in enumerate(rng.permutation(n * n)):
+        i, j = divmod(int(index), n)
+        tile = full[
+            i * (size - 1) : i * (size - 1) + size, j * (size - 1) : j * (size - 1) + size
+        ]
+        tile = dihedral(tile)[rng.integers(8)]
+        lines = ["".join("#" if c else "." for c in row) for row in tile]
+        blocks.append(f"Tile {k + 1}:\n" + "\n".join(lines))
+
+    jigsaw = parse("\n\n".join(blocks))
+    img = image(jigsaw, assemble(jigsaw))
+    expected = np.delete(
+        np.delete(full, np.s_[:: size - 1], axis=0), np.s_[:: size - 1], axis=1
+    )
+    assert any(np.array_equal(img, view) for view in dihedral(expected))
+
+
+PARTS = {
+    "part1": day20_part1,
+    "part2": functools.partial(day20_part2, n=12),
+}
 
 
 def main():
-    print(f"day 20 part 1: {day20_part1(aocd.get_data(day=20, year=2020))}")
-    print(f"day 20 part 2: {day20_part2(aocd.get_data(day=20, year=2020), 12)}")
+    print(f"day 20 part 1: {day20_part1(inputs.get_data(day=20, year=2020))}")
+    print(f"day 20 part 2: {day20_part2(inputs.get_data(day=20, year=2020))}")
 
 
 if __name__ == "__main__":
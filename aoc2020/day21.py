@@ -2,7 +2,7 @@ import copy
 from collections import defaultdict
 from typing import DefaultDict, Dict, List, Set, Tuple
 
-import aocd
+from aoctool import inputs
 
 TEST_DATA = """mxmxvkd kfcds sqjhc nhms (contains dairy, fish)
 trh fvjkl sbzzf mxmxvkd (contains dairy)
@@ -66,8 +66,14 @@ def test_day21_part2():
     assert day21_part2(foods, allergens) == "mxmxvkd,sqjhc,fvjkl"
 
 
+PARTS = {
+    "part1": lambda data: day21_part1(*parse(data)),
+    "part2": lambda data: day21_part2(*parse(data)),
+}
+
+
 def main():
-    foods, allergens = parse(aocd.get_data(day=21, year=2020))
+    foods, allergens = parse(inputs.get_data(day=21, year=2020))
     print(f"day 21 part 1: {day21_part1(copy.deepcopy(foods), copy.deepcopy(allergens))}")
     print(f"day 21 part 2: {day21_part2(foods, allergens)}")
 
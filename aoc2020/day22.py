@@ -1,7 +1,8 @@
+import functools
 from collections import deque
 from typing import Tuple
 
-import aocd
+from aoctool import inputs
 
 TEST_DATA = """Player 1:
 9
@@ -48,51 +49,76 @@ def test_day22_part1():
     assert day22_part1(TEST_DATA) == 306
 
 
-def game(p1: deque, p2: deque) -> Tuple[int, deque, deque]:
-    history = set()
+# decks are hashed as polynomials in BASE modulo MODULUS, updated as cards move
+MODULUS = (1 << 61) - 1
+BASE = 1000003
+# there are at most 255 cards, as decks are byte arrays
+POWERS = [pow(BASE, k, MODULUS) for k in range(256)]
+
+
+def _hash(deck: bytes) -> int:
+    value = 0
+    for card in deck:
+        value = (value * BASE + card) % MODULUS
+    return value
 
-    while len(p1) > 0 and len(p2) > 0:
 
-        fingerprint = (tuple(p1), tuple(p2))
+def game(p1: bytearray, p2: bytearray) -> int:
+    """Play Recursive Combat with the decks in place and return the winner."""
+    history = set()
+    h1, h2 = _hash(p1), _hash(p2)
+
+    while p1 and p2:
+        fingerprint = (len(p1), h1, h2)
         if fingerprint in history:
-            return 1, p1, p2
-        else:
-            history.add(fingerprint)
+            return 1
+        history.add(fingerprint)
 
-        c1, c2 = p1.popleft(), p2.popleft()
+        c1, c2 = p1[0], p2[0]
+        del p1[0], p2[0]
+        h1 = (h1 - c1 * POWERS[len(p1)]) % MODULUS
+        h2 = (h2 - c2 * POWERS[len(p2)]) % MODULUS
 
         if c1 <= len(p1) and c2 <= len(p2):
-            winner, _, _ = game(deque(list(p1)[:c1]), deque(list(p2)[:c2]))
+            winner = sub_game_winner(bytes(p1[:c1]), bytes(p2[:c2]))
         else:
             winner = 1 if c1 > c2 else 2
 
         if winner == 1:
-            p1.append(c1)
-            p1.append(c2)
-        elif winner == 2:
-            p2.append(c2)
-            p2.append(c1)
+            p1 += bytes((c1, c2))
+            h1 = ((h1 * BASE + c1) * BASE + c2) % MODULUS
         else:
-            assert False
+            p2 += bytes((c2, c1))
+            h2 = ((h2 * BASE + c2) * BASE + c1) % MODULUS
 
-    return 1 if len(p1) > 0 else 2, p1, p2
+    return 1 if p1 else 2
+
+
+@functools.cache
+def sub_game_winner(p1: bytes, p2: bytes) -> int:
+    # player 1 cannot lose the highest card: the sub-game ends with their win or a loop
+    if max(p1) > max(p2):
+        return 1
+    return game(bytearray(p1), bytearray(p2))
 
 
 def day22_part2(data: str) -> int:
-    p1, p2 = parse(data)
+    p1, p2 = (bytearray(deck) for deck in parse(data))
 
-    winner, p1, p2 = game(p1, p2)
+    winner = game(p1, p2)
     p = p1 if winner == 1 else p2
     return sum((i + 1) * c for i, c in enumerate(reversed(p)))
 
 
 def test_day22_part2():
     assert day22_part2(TEST_DATA) == 291
+    # loops forever without the history rule
+    assert game(bytearray([43, 19]), bytearray([2, 29, 14])) == 1
 
 
 def main():
-    print(f"day 22 part 1: {day22_part1(aocd.get_data(day=22, year=2020))}")
-    print(f"day 22 part 2: {day22_part2(aocd.get_data(day=22, year=2020))}")
+    print(f"day 22 part 1: {day22_part1(inputs.get_data(day=22, year=2020))}")
+    print(f"day 22 part 2: {day22_part2(inputs.get_data(day=22, year=2020))}")
 
 
 if __name__ == "__main__":
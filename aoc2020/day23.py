@@ -1,7 +1,8 @@
-from typing import Dict, Iterable, List
+import functools
+from typing import Dict, Iterable, List, Sequence
 
 import numpy as np
-import tqdm
+from aoctool import jit, variants
 
 
 def modn(it: Iterable[int], n: int):
@@ -62,7 +63,7 @@ def game_np(cups: List[int], n: int) -> List[int]:
     len_cups = len(cups)
 
     current_index = 0
-    for _ in tqdm.tqdm(range(n)):
+    for _ in range(n):
         removed_indices = np.arange(current_index + 1, current_index + 4) % len_cups
         removed = cups[removed_indices]
 
@@ -97,7 +98,7 @@ def game_map(cup_list: List[int], n: int) -> Dict[int, int]:
         cups[cup_list[i]] = cup_list[(i + 1) % len(cup_list)]
 
     current = cup_list[0]
-    for _ in tqdm.tqdm(range(n)):
+    for _ in range(n):
         # remove 3 cups
         r1 = cups[current]
         r2 = cups[r1]
@@ -120,23 +121,77 @@ def game_map(cup_list: List[int], n: int) -> Dict[int, int]:
     return cups
 
 
-def day23_part1(data: str, n: int) -> str:
-    cups = [int(c) for c in data]
+def successors(cups: List[int]) -> Dict[int, int]:
+    return {cup: cups[(i + 1) % len(cups)] for i, cup in enumerate(cups)}
 
-    if False:
-        cups = game_np(cups, n)
 
-        one_idx = cups.index(1)
-        final = cups[one_idx + 1 :] + cups[:one_idx]
-        return "".join(str(c) for c in final)
+def ring(cups: Sequence[int], n_cups: int | None = None) -> np.ndarray:
+    """Successor of every cup, indexed by label (entry 0 is unused), in a circle of the
+    given cups followed by the next labels up to `n_cups`."""
+    n_cups = max(len(cups), n_cups or 0)
+    successors = np.arange(1, n_cups + 2, dtype=np.int32)
+    successors[cups[:-1]] = cups[1:]
+    if n_cups > len(cups):
+        successors[cups[-1]] = len(cups) + 1
+        successors[n_cups] = cups[0]
     else:
-        cups = game_map(cups, n)
-        lst = []
-        current = 1
-        while cups[current] != 1:
-            current = cups[current]
-            lst.append(current)
-        return "".join(str(c) for c in lst)
+        successors[cups[-1]] = cups[0]
+    return successors
+
+
+@jit.njit
+def play(successors: np.ndarray, current: int, n: int) -> int:
+    """Play `n` moves in place, returning the current cup."""
+    n_cups = len(successors) - 1
+    for _ in range(n):
+        r1 = successors[current]
+        r2 = successors[r1]
+        r3 = successors[r2]
+        successors[current] = successors[r3]
+
+        dest = current - 1 if current > 1 else n_cups
+        while dest == r1 or dest == r2 or dest == r3:
+            dest = dest - 1 if dest > 1 else n_cups
+
+        successors[r3] = successors[dest]
+        successors[dest] = r1
+        current = successors[current]
+    return current
+
+
+def labels_after_one(cups: Dict[int, int]) -> str:
+    lst = []
+    current = 1
+    while cups[current] != 1:
+        current = cups[current]
+        lst.append(current)
+    return "".join(str(c) for c in lst)
+
+
+part1 = variants.VariantGroup("day23_part1", samples=[("389125467", 10), ("389125467", 100)])
+
+
+@part1.variant(default=True)
+def day23_part1_ring(data: str, n: int) -> str:
+    cups = [int(c) for c in data]
+    successors = ring(cups)
+    play(successors, cups[0], n)
+    return labels_after_one(successors)
+
+
+@part1.variant
+def day23_part1(data: str, n: int) -> str:
+    return labels_after_one(game_map([int(c) for c in data], n))
+
+
+@part1.variant
+def day23_part1_list(data: str, n: int) -> str:
+    return labels_after_one(successors(game([int(c) for c in data], n)))
+
+
+@part1.variant
+def day23_part1_np(data: str, n: int) -> str:
+    return labels_after_one(successors(game_np([int(c) for c in data], n)))
 
 
 def test_day23_part1():
@@ -144,28 +199,65 @@ def test_day23_part1():
     assert day23_part1("389125467", 100) == "67384529"
 
 
-def day23_part2(data: str, n: int) -> int:
+def all_cups(data: str, n_cups: int) -> List[int]:
     cups = [int(c) for c in data]
-    cups += list(range(len(cups) + 1, 1000001))
+    return cups + list(range(len(cups) + 1, n_cups + 1))
 
-    if False:
-        cups = game_np(cups, n)
 
-        one_idx = cups.index(1)
-        return cups[(one_idx + 1) % len(cups)] * cups[(one_idx + 2) % len(cups)]
-    else:
-        cups = game_map(cups, n)
-        return cups[1] * cups[cups[1]]
+part2 = variants.VariantGroup("day23_part2", samples=[("389125467", 100, 1000)])
+
+
+@part2.variant(default=True)
+def day23_part2_ring(data: str, n: int, n_cups: int = 1000000) -> int:
+    cups = [int(c) for c in data]
+    successors = ring(cups, n_cups)
+    play(successors, cups[0], n)
+    first = int(successors[1])
+    return first * int(successors[first])
+
+
+@part2.variant
+def day23_part2(data: str, n: int, n_cups: int = 1000000) -> int:
+    cups = game_map(all_cups(data, n_cups), n)
+    return cups[1] * cups[cups[1]]
+
+
+# both rebuild the whole circle at each move, which is hopeless for a million cups
+@part2.variant(selectable=False)
+def day23_part2_list(data: str, n: int, n_cups: int = 1000000) -> int:
+    cups = successors(game(all_cups(data, n_cups), n))
+    return cups[1] * cups[cups[1]]
+
+
+@part2.variant(selectable=False)
+def day23_part2_np(data: str, n: int, n_cups: int = 1000000) -> int:
+    cups = successors(game_np(all_cups(data, n_cups), n))
+    return cups[1] * cups[cups[1]]
 
 
 def test_day23_part2():
-    # assert day23_part2("389125467", 10000000) == 149245887792
+    assert day23_part2_ring("389125467", 10000000) == 149245887792
     day23_part2("389125467", 1000)
 
 
+def warmup():
+    day23_part2_ring("389125467", 10, 20)
+
+
+def test_day23_variants():
+    part1.check()
+    part2.check()
+
+
+PARTS = {
+    "part1": functools.partial(part1, n=100),
+    "part2": functools.partial(part2, n=10000000),
+}
+
+
 def main():
-    print(f"day 23 part 1: {day23_part1('916438275', 100)}")
-    print(f"day 23 part 2: {day23_part2('916438275', 10000000)}")
+    print(f"day 23 part 1: {part1('916438275', 100)}")
+    print(f"day 23 part 2: {part2('916438275', 10000000)}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,5 @@
-from collections import defaultdict
-from typing import Dict, Tuple
-
-import aocd
 import numpy as np
+from aoctool import inputs, jit
 
 TEST_DATA = """sesenwnenenewseeswwswswwnenewsewsw
 neeenesenwnwwswnenewnwwsewnenwseswesw
@@ -25,95 +22,138 @@ eneswnwswnwsenenwnwnwwseeswneewsenese
 neswnwewnwnwseenwseesewsenwsweewe
 wseweeenwnesenwwwswnew"""
 
-COORD_TO_TUPLE = {
-    "e": (1, 0),
-    "w": (-1, 0),
-    "A": (0, 1),
-    "B": (-1, 1),
-    "C": (0, -1),
-    "D": (1, -1),
-}
-
-
-def calc_coords(path: str) -> Tuple[int, int]:
-    # e, se, sw, w, nw, ne
-    # e, A,  B,  w, C,  D
-
-    path = path.replace("se", "A").replace("sw", "B").replace("nw", "C").replace("ne", "D")
+# axial coordinates (q, r): e, se, sw, w, nw, ne are (1, 0), (0, 1), (-1, 1), (-1, 0),
+# (0, -1), (1, -1), and packed into int64 keys as q * 2 ** 32 + r
+PACKING = 1 << 32
 
-    x, y = 0, 0
-    for c in path:
-        offset = COORD_TO_TUPLE[c]
-        x += offset[0]
-        y += offset[1]
 
-    return x, y
+def decode(data: str) -> tuple[np.ndarray, np.ndarray]:
+    """Tile reached by every path, as arrays of q and r.
 
+    Every step ends with an "e" or a "w", which moves along q, and a preceding "n" or "s"
+    moves along r, and cancels the move along q for "se" and "nw".
+    """
+    text = np.frombuffer(data.strip().encode() + b"\n", dtype=np.uint8)
+    ends = np.flatnonzero((text == ord("e")) | (text == ord("w")))
+    prefix = text[ends - 1]
+    north, south = prefix == ord("n"), prefix == ord("s")
+    east = text[ends] == ord("e")
 
-def test_calc_coords():
-    assert calc_coords("nwwswee") == (0, 0)
+    dq = np.where(east, 1 - south.astype(np.int64), north.astype(np.int64) - 1)
+    dr = south.astype(np.int64) - north
+    paths = np.cumsum(text == ord("\n"))[ends]
+    n_paths = int(np.count_nonzero(text == ord("\n")))
+    q = np.bincount(paths, weights=dq, minlength=n_paths).astype(np.int64)
+    r = np.bincount(paths, weights=dr, minlength=n_paths).astype(np.int64)
+    return q, r
 
 
-def load_tiles(data: str) -> Dict[Tuple[int, int], bool]:
-    tiles = defaultdict(lambda: False)
+def test_decode():
+    q, r = decode("nwwswee\nesew\nse\n\nneww")
+    assert q.tolist() == [0, 0, 0, 0, -1] and r.tolist() == [0, 1, 1, 0, -1]
 
-    for path in data.splitlines():
-        coord = calc_coords(path)
-        tiles[coord] = not tiles[coord]
 
-    return tiles
+def black_tiles(data: str) -> np.ndarray:
+    """Packed keys of the tiles flipped an odd number of times, sorted."""
+    q, r = decode(data)
+    keys, flips = np.unique(q * PACKING + r, return_counts=True)
+    return keys[flips % 2 == 1]
 
 
 def day24_part1(data: str) -> int:
-    tiles = load_tiles(data)
-    return sum(tiles.values())
+    return len(black_tiles(data))
 
 
 def test_day24_part1():
     assert day24_part1(TEST_DATA) == 10
 
 
-def day24_part2(data: str) -> int:
-    tiles = load_tiles(data)
-    x_coords = [tile[0] for tile, flipped in tiles.items() if flipped]
-    y_coords = [tile[1] for tile, flipped in tiles.items() if flipped]
-    span_x = abs(max(x_coords, key=lambda x: abs(x)))
-    span_y = abs(max(y_coords, key=lambda x: abs(x)))
-    span = max(span_x, span_y) + 2 * 100 + 6
-    hspan = round(span / 2)
-    floor = np.zeros(shape=(span, span), dtype=bool)
-    for tile, flipped in tiles.items():
-        floor[hspan + tile[0], hspan + tile[1]] = flipped
-
-    for _ in range(100):
-        padded_floor = np.pad(floor, 1)
-        neighbors = np.stack(
-            [
-                padded_floor[2:, 1:-1],
-                padded_floor[:-2, 1:-1],
-                padded_floor[1:-1, 2:],
-                padded_floor[1:-1, :-2],
-                padded_floor[:-2, 2:],
-                padded_floor[2:, :-2],
-            ],
-            axis=2,
-        ).sum(axis=2)
-
-        new_floor = floor.copy()
-        new_floor[floor & ((neighbors == 0) | (neighbors > 2))] = False
-        new_floor[~floor & (neighbors == 2)] = True
-        floor = new_floor
-
-    return floor.sum()
+@jit.njit
+def flip_day(tiles: np.ndarray) -> np.ndarray:
+    """Next day of the floor whose black tiles are within `tiles`, over `tiles` with a
+    margin of one tile."""
+    height, width = tiles.shape
+    # a second margin of white tiles spares the bound checks
+    padded = np.zeros((height + 4, width + 4), dtype=np.uint8)
+    padded[2:-2, 2:-2] = tiles
+    out = np.zeros((height + 2, width + 2), dtype=np.uint8)
+    for i in range(height + 2):
+        above, row, below, line = padded[i], padded[i + 1], padded[i + 2], out[i]
+        for j in range(1, width + 3):
+            count = row[j - 1] + row[j + 1] + above[j] + above[j + 1] + below[j - 1] + below[j]
+            line[j - 1] = (count == 2) | ((count == 1) & (row[j] == 1))
+    return out
+
+
+class Floor:
+    """Black tiles of the lobby, in an array which spans just their bounding box."""
+
+    def __init__(self, keys: np.ndarray):
+        q, r = keys // PACKING, keys % PACKING
+        # keys with a negative r borrow from q
+        q, r = q + (r >= PACKING // 2), np.where(r >= PACKING // 2, r - PACKING, r)
+        self.origin = (0, 0)
+        self.tiles = np.zeros((0, 0), dtype=np.uint8)
+        if len(keys) > 0:
+            self.origin = (int(q.min()), int(r.min()))
+            self.tiles = np.zeros(
+                (q.max() - q.min() + 1, r.max() - r.min() + 1), dtype=np.uint8
+            )
+            self.tiles[q - q.min(), r - r.min()] = 1
+
+    def run(self, days: int):
+        for _ in range(days):
+            if self.tiles.size == 0:
+                break
+            out = flip_day(self.tiles)
+            rows, columns = np.flatnonzero(out.any(axis=1)), np.flatnonzero(out.any(axis=0))
+            if len(rows) == 0:
+                self.tiles = np.zeros((0, 0), dtype=np.uint8)
+                break
+            self.tiles = out[rows[0] : rows[-1] + 1, columns[0] : columns[-1] + 1]
+            self.origin = (
+                self.origin[0] - 1 + int(rows[0]),
+                self.origin[1] - 1 + int(columns[0]),
+            )
+
+    def keys(self) -> np.ndarray:
+        q, r = np.nonzero(self.tiles)
+        return (q + self.origin[0]) * PACKING + (r + self.origin[1])
+
+    def count(self) -> int:
+        return int(np.count_nonzero(self.tiles))
+
+
+def day24_part2(data: str, days: int = 100) -> int:
+    floor = Floor(black_tiles(data))
+    floor.run(days)
+    return floor.count()
 
 
 def test_day24_part2():
     assert day24_part2(TEST_DATA) == 2208
+    assert [day24_part2(TEST_DATA, days) for days in (1, 2, 10, 50)] == [15, 12, 37, 566]
+
+
+def test_floor():
+    keys = black_tiles(TEST_DATA)
+    floor = Floor(keys)
+    assert np.array_equal(np.sort(floor.keys()), keys)
+    floor.run(1)
+    assert floor.count() == 15 and floor.tiles.any(axis=1)[[0, -1]].all()
+    # a lone black tile turns white, and the floor stays empty
+    floor = Floor(black_tiles("e"))
+    floor.run(3)
+    assert floor.count() == 0
+
+
+def warmup():
+    day24_part2(TEST_DATA, 1)
 
 
 def main():
-    print(f"day 24 part 1: {day24_part1(aocd.get_data(day=24, year=2020))}")
-    print(f"day 24 part 2: {day24_part2(aocd.get_data(day=24, year=2020))}")
+    print(f"day 24 part 1: {day24_part1(inputs.get_data(day=24, year=2020))}")
+    print(f"day 24 part 2: {day24_part2(inputs.get_data(day=24, year=2020))}")
 
 
 if __name__ == "__main__":
@@ -1,21 +1,17 @@
+from aoctool import modular
+
 CARD_PUB = 13135480
 DOOR_PUB = 8821721
 
+MODULUS = 20201227
+
 
-def find_loops(pub: int, sn: int = 7) -> int:
-    cnt = 0
-    val = 1
-    while val != pub:
-        val = (val * sn) % 20201227
-        cnt += 1
-    return cnt
+def find_loops(pub: int, sn: int = 7, modulus: int = MODULUS) -> int:
+    return modular.discrete_log(pub, sn, modulus)
 
 
-def transform(loops: int, sn: int = 7) -> int:
-    val = 1
-    for _ in range(loops):
-        val = (val * sn) % 20201227
-    return val
+def transform(loops: int, sn: int = 7, modulus: int = MODULUS) -> int:
+    return pow(sn, loops, modulus)
 
 
 def test_find_loops_transforms():
@@ -26,6 +22,12 @@ def test_find_loops_transforms():
         assert find_loops(transform(i)) == i
 
 
+def test_large_modulus():
+    modulus = 2**61 - 1
+    pub = transform(987654321987654321, 37, modulus)
+    assert transform(find_loops(pub, 37, modulus), 37, modulus) == pub
+
+
 def test_encryption_key():
     n_card = find_loops(CARD_PUB)
     n_door = find_loops(DOOR_PUB)
@@ -44,7 +46,7 @@ def day25_part1() -> int:
 
 def main():
     print(f"day 25 part 1: {day25_part1()}")
-    # print(f"day 14 part 2: {day14_part2(aocd.get_data(day=14, year=2020))}")
+    # print(f"day 14 part 2: {day14_part2(inputs.get_data(day=14, year=2020))}")
 
 
 if __name__ == "__main__":
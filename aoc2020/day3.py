@@ -1,7 +1,7 @@
 from typing import List, Tuple
 
-import aocd
 import numpy as np
+from aoctool import inputs
 
 DEMO_DATA = """..##.......
 #...#...#..
@@ -59,7 +59,7 @@ def test_solve_day3_part2():
 
 
 def main():
-    data = aocd.get_data(day=3, year=2020)
+    data = inputs.get_data(day=3, year=2020)
     print("Day 3 part 1 results: " + str(solve_day3(parse(data))))
     print("Day 3 part 2 results: " + str(solve_day3_part2(parse(data))))
 
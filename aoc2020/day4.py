@@ -1,7 +1,7 @@
 import re
 from typing import Dict, List
 
-import aocd
+from aoctool import inputs
 
 
 def parse(data: str) -> List[Dict[str, str]]:
@@ -38,7 +38,7 @@ iyr:2011 ecl:brn hgt:59in"""
 
 
 def day4_part1() -> int:
-    data = parse(aocd.get_data(day=4, year=2020))
+    data = parse(inputs.get_data(day=4, year=2020))
     req_fields = {"byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"}
 
     count = 0
@@ -125,9 +125,12 @@ iyr:2010 hgt:158cm hcl:#b6652a ecl:blu byr:1944 eyr:2021 pid:093154719
     )
 
 
+PARTS = {"part2": day4_part2_count_valid}
+
+
 def main():
     print(f"day 4 part 1: {day4_part1()}")
-    print(f"day 4 part 2: {day4_part2_count_valid(aocd.get_data(day=4, year=2020))}")
+    print(f"day 4 part 2: {day4_part2_count_valid(inputs.get_data(day=4, year=2020))}")
 
 
 if __name__ == "__main__":
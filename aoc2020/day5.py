@@ -1,5 +1,5 @@
-import aocd
 import numpy as np
+from aoctool import inputs
 
 
 def seat_id(seat: str) -> int:
@@ -14,12 +14,12 @@ def test_seat_id():
 
 
 def day5_part1() -> int:
-    return max(seat_id(seat) for seat in aocd.get_data(day=5, year=2020).split("\n"))
+    return max(seat_id(seat) for seat in inputs.get_data(day=5, year=2020).split("\n"))
 
 
 def day5_part2() -> int:
     a = np.array(
-        list(sorted(seat_id(seat) for seat in aocd.get_data(day=5, year=2020).split("\n")))
+        list(sorted(seat_id(seat) for seat in inputs.get_data(day=5, year=2020).split("\n")))
     )
     (b,) = np.nonzero(np.diff(a) == 2)
     return a[b[0]] + 1
@@ -1,4 +1,4 @@
-import aocd
+from aoctool import inputs
 
 TEST_DATA = """abc
 
@@ -49,8 +49,8 @@ def test_day6_part2():
 
 
 def main():
-    print("day 6 part 1: " + str(day6_part1(aocd.get_data(day=6, year=2020))))
-    print("day 6 part 2: " + str(day6_part2(aocd.get_data(day=6, year=2020))))
+    print("day 6 part 1: " + str(day6_part1(inputs.get_data(day=6, year=2020))))
+    print("day 6 part 2: " + str(day6_part2(inputs.get_data(day=6, year=2020))))
 
 
 if __name__ == "__main__":
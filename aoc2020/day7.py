@@ -2,7 +2,7 @@ import re
 from dataclasses import dataclass
 from typing import Dict
 
-import aocd
+from aoctool import inputs
 
 TEST_DATA = """light red bags contain 1 bright white bag, 2 muted yellow bags.
 dark orange bags contain 3 bright white bags, 4 muted yellow bags.
@@ -98,8 +98,8 @@ def test_day7_part2():
 
 
 def main():
-    print(f"Day 7 part 1: {day7_part1(aocd.get_data(day=7, year=2020))}")
-    print(f"Day 7 part 2: {day7_part2(aocd.get_data(day=7, year=2020))}")
+    print(f"Day 7 part 1: {day7_part1(inputs.get_data(day=7, year=2020))}")
+    print(f"Day 7 part 2: {day7_part2(inputs.get_data(day=7, year=2020))}")
 
 
 if __name__ == "__main__":
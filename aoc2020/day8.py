@@ -1,6 +1,5 @@
-from typing import List, Tuple
-
-import aocd
+import numpy as np
+from aoctool import inputs, vm
 
 TEST_PROG = """nop +0
 acc +1
@@ -23,45 +22,15 @@ nop -4
 acc +6"""
 
 
-ProgType = List[Tuple[str, int]]
-
-
-def parse_program(data: str) -> ProgType:
-    def parse_line(line: str) -> Tuple[str, int]:
-        parts = line.split()
-        return parts[0], int(parts[1])
-
-    return [parse_line(ln) for ln in data.split("\n")]
-
-
-def run(prog: ProgType) -> Tuple[int, bool]:
-    pc = 0
-    executed = [False] * len(prog)
-    accum = 0
-
-    while True:
-        if executed[pc]:
-            return accum, False
-        executed[pc] = True
+def parse_program(data: str) -> vm.Program:
+    return vm.parse(data)
 
-        op, param = prog[pc]
 
-        if op == "acc":
-            accum += param
-            pc += 1
-        elif op == "jmp":
-            pc += param
-        elif op == "nop":
-            pc += 1
-        else:
-            raise ValueError(f"unknown instruction: {op, param}")
-
-        if pc == len(prog):
-            break
-        elif pc >= len(prog):
-            raise RuntimeError(f"jmp past EOF attempted: pc={pc} len={len(prog)}")
-
-    return accum, True
+def run(prog: vm.Program) -> tuple[int, bool]:
+    result = vm.run(prog)
+    if result.status == vm.OUT_OF_BOUNDS:
+        raise RuntimeError(f"jmp past EOF attempted: pc={result.pc} len={len(prog)}")
+    return result["acc"], result.status == vm.HALTED
 
 
 def test_run():
@@ -69,14 +38,15 @@ def test_run():
     assert run(parse_program(TEST_PROG_CORRECTED)) == (8, True)
 
 
-def correct_and_run(prog: ProgType) -> int:
-    for i in range(len(prog)):
-        if prog[i][0] in ("jmp", "nop"):
-            fixed_prog = prog.copy()
-            fixed_prog[i] = ("jmp" if prog[i][0] == "nop" else "nop", prog[i][1])
-            accum, completed = run(fixed_prog)
-            if completed:
-                return accum
+def correct_and_run(prog: vm.Program) -> int:
+    # only instructions reached by the looping program can be the corrupted one
+    executed = vm.run(prog).executed
+    for i in np.flatnonzero(executed & np.isin(prog.ops, (vm.JMP, vm.NOP))):
+        fixed_prog = prog.copy()
+        fixed_prog.ops[i] = vm.JMP if prog.ops[i] == vm.NOP else vm.NOP
+        result = vm.run(fixed_prog)
+        if result.status == vm.HALTED:
+            return result["acc"]
     raise RuntimeError("could not fix program")
 
 
@@ -84,9 +54,19 @@ def test_correct_and_run():
     assert correct_and_run(parse_program(TEST_PROG)) == 8
 
 
+def warmup():
+    vm.warmup()
+
+
+PARTS = {
+    "part1": lambda data: run(parse_program(data))[0],
+    "part2": lambda data: correct_and_run(parse_program(data)),
+}
+
+
 def main():
-    print(f"day 8 part 1: {run(parse_program(aocd.get_data(day=8, year=2020)))[0]}")
-    print(f"day 8 part 2: {correct_and_run(parse_program(aocd.get_data(day=8, year=2020)))}")
+    print(f"day 8 part 1: {run(parse_program(inputs.get_data(day=8, year=2020)))[0]}")
+    print(f"day 8 part 2: {correct_and_run(parse_program(inputs.get_data(day=8, year=2020)))}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import itertools
 from typing import List
 
-import aocd
+from aoctool import inputs
 
 TEST_DATA = [
     35,
@@ -59,8 +59,17 @@ def test_find_weakness():
     assert find_weakness(TEST_DATA, 127) == 62
 
 
+PARTS = {
+    "part1": lambda data: find_fault([int(item) for item in data.split("\n")], 25),
+    "part2": lambda data: find_weakness(
+        [int(item) for item in data.split("\n")],
+        find_fault([int(item) for item in data.split("\n")], 25),
+    ),
+}
+
+
 def main():
-    data = [int(item) for item in aocd.get_data(day=9, year=2020).split("\n")]
+    data = [int(item) for item in inputs.get_data(day=9, year=2020).split("\n")]
     part1 = find_fault(data, 25)
     print(f"day 9 part 1: {part1}")
     print(f"day 9 part 2: {find_weakness(data, part1)}")
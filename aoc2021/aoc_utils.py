@@ -1,2 +1,5 @@
+from aoctool import parsing
+
+
 def data_to_int(data: str) -> [int]:
-    return [int(s) for s in data.splitlines()]
+    return parsing.ints(data).tolist()
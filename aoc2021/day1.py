@@ -1,4 +1,4 @@
-import aocd
+from aoctool import inputs
 
 from aoc_utils import data_to_int
 
@@ -46,8 +46,8 @@ def test_day1_part2():
 
 
 def main() -> None:
-    print(f"Day 1 solution: {solve_day1(aocd.get_data(day=1, year=2021))}")
-    print(f"Day 1 part 2 solution: {solve_day1_part2(aocd.get_data(day=1, year=2021))}")
+    print(f"Day 1 solution: {solve_day1(inputs.get_data(day=1, year=2021))}")
+    print(f"Day 1 part 2 solution: {solve_day1_part2(inputs.get_data(day=1, year=2021))}")
 
 
 if __name__ == "__main__":
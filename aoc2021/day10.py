@@ -2,12 +2,9 @@ import sys
 from pathlib import Path
 from typing import Callable
 
-import aocd
-from rich.console import Console
-from rich.traceback import install
+from aoctool import inputs, lazy
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """[({(<(())[]>[[{[]{<()<>>
@@ -111,12 +108,15 @@ def run_solution(name: str, test_func: Callable[[], None], solution: Callable[[s
         sys.exit()
 
     console.print(
-        f"{name.capitalize()} solution: {solution(aocd.get_data(day=DAY, year=2021))}",
+        f"{name.capitalize()} solution: {solution(inputs.get_data(day=DAY, year=2021))}",
         style="blue",
     )
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
@@ -1,16 +1,11 @@
-import itertools
 import sys
 from pathlib import Path
 from typing import Callable
 
-import aocd
 import numpy as np
-from rich.console import Console
-from rich.traceback import install
-from scipy.signal import convolve2d
+from aoctool import automaton, grid, inputs, lazy
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """5483143223
@@ -26,48 +21,38 @@ TEST_DATA: str = """5483143223
 TEST_RESULT_PART1: int | None = 1656
 TEST_RESULT_PART2: int | None = 195
 
-KERNEL = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=int)
 
+class Flashes(automaton.Rule):
+    """Energy levels of the octopuses, counting their flashes."""
 
-def part1(data: str) -> int:
-    cavern = np.array([[int(s) for s in line] for line in data.splitlines()], dtype=int)
-
-    flash_count = 0
-
-    for _ in range(100):
-        cavern += 1
-        flashing_this_step = np.zeros(shape=cavern.shape, dtype=bool)
+    pure = False
 
-        while (flashing := (cavern > 9) & (~flashing_this_step)).sum() > 0:
-            energy = convolve2d(flashing, KERNEL, mode="same")
-            flashing_this_step |= flashing
-            cavern[flashing] = 0
-            cavern[~flashing_this_step] += energy[~flashing_this_step]
+    def __init__(self):
+        self.count = 0
 
-        flash_count += flashing_this_step.sum()
+    def __call__(self, padded: np.ndarray, out: np.ndarray):
+        out[...] = automaton.interior(padded) + 1
+        flashed = np.zeros(out.shape, dtype=bool)
 
-    return flash_count
+        while (flashing := (out > 9) & ~flashed).any():
+            energy = grid.count_neighbours(flashing)
+            flashed |= flashing
+            out[~flashed] += energy[~flashed]
 
+        out[flashed] = 0
+        self.count += int(flashed.sum())
 
-def part2(data: str) -> int:
-    cavern = np.array([[int(s) for s in line] for line in data.splitlines()], dtype=int)
-
-    flash_count = 0
 
-    for step in itertools.count():
-        if np.all(cavern == 0):
-            return step
-        cavern += 1
-
-        flashing_this_step = np.zeros(shape=cavern.shape, dtype=bool)
+def part1(data: str) -> int:
+    flashes = Flashes()
+    cavern = automaton.Automaton(grid.parse(data, dtype=int), flashes, boundary="fixed")
+    cavern.run(100)
+    return flashes.count
 
-        while (flashing := (cavern > 9) & (~flashing_this_step)).sum() > 0:
-            energy = convolve2d(flashing, KERNEL, mode="same")
-            flashing_this_step |= flashing
-            cavern[flashing] = 0
-            cavern[~flashing_this_step] += energy[~flashing_this_step]
 
-        flash_count += flashing_this_step.sum()
+def part2(data: str) -> int:
+    cavern = automaton.Automaton(grid.parse(data, dtype=int), Flashes(), boundary="fixed")
+    return cavern.run(until=lambda octopuses: not octopuses.cells.any())
 
 
 def run_test_part1():
@@ -98,12 +83,15 @@ def run_solution(name: str, test_func: Callable[[], None], solution: Callable[[s
         sys.exit()
 
     console.print(
-        f"{name.capitalize()} solution: {solution(aocd.get_data(day=DAY, year=2021))}",
+        f"{name.capitalize()} solution: {solution(inputs.get_data(day=DAY, year=2021))}",
         style="blue",
     )
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
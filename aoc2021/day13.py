@@ -2,14 +2,11 @@ import sys
 from pathlib import Path
 from typing import Callable
 
-import aocd
 import numpy as np
-from matplotlib import pyplot as plt
-from rich.console import Console
-from rich.traceback import install
+from aoctool import inputs, lazy
 
-install(show_locals=True)
-console = Console()
+plt = lazy.module("matplotlib.pyplot")
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """6,10
@@ -116,12 +113,15 @@ def run_solution(
         sys.exit()
 
     console.print(
-        f"{name.capitalize()} solution: {solution(aocd.get_data(day=DAY, year=2021))}",
+        f"{name.capitalize()} solution: {solution(inputs.get_data(day=DAY, year=2021))}",
         style="blue",
     )
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", None, part2)
@@ -1,15 +1,13 @@
+import functools
 import itertools
 import sys
 from collections import Counter
 from pathlib import Path
 from typing import Callable
 
-import aocd
-from rich.console import Console
-from rich.traceback import install
+from aoctool import inputs, lazy
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """NNCB
@@ -93,11 +91,20 @@ def run_solution(
     if not proceed:
         sys.exit()
 
-    result = solution(aocd.get_data(day=DAY, year=2021), *args, **kwargs)
+    result = solution(inputs.get_data(day=DAY, year=2021), *args, **kwargs)
     console.print(f"{name.capitalize()} solution: {result}", style="blue")
 
 
+PARTS = {
+    "part1": functools.partial(part1, iter_count=10),
+    "part2": functools.partial(part1, iter_count=40),
+}
+
+
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1, 10)
     run_solution("part 2", run_test_part2, part1, 40)
@@ -2,15 +2,10 @@ import sys
 from pathlib import Path
 from typing import Callable
 
-import aocd
 import numpy as np
-from rich.console import Console
-from rich.traceback import install
-from scipy.signal import convolve2d
-from skimage.graph import route_through_array
+from aoctool import graph, grid, inputs, lazy
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 # noinspection SpellCheckingInspection
@@ -28,49 +23,24 @@ TEST_RESULT_PART1: int | None = 40
 TEST_RESULT_PART2: int | None = 315
 
 
-def part1(data: str) -> int:
-    cavern = np.array([[int(s) for s in line] for line in data.splitlines()], dtype=int)
-
-    energy = -np.ones(cavern.shape, dtype=int)
-    energy[-1, -1] = cavern[-1, -1]
-    kernel = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]], dtype=int)
-
-    while np.any(to_fill := energy == -1):
-        indices = (convolve2d(~to_fill, kernel, mode="same") > 0) & to_fill
-        energy_padded = np.pad(energy, 1, mode="edge")
+def lowest_total_risk(cavern: np.ndarray) -> int:
+    adjacency = graph.grid_adjacency(cavern.shape)
+    return int(graph.array_dial(adjacency, cavern.ravel(), [0], goal=cavern.size - 1)[-1])
 
-        for i, j in zip(*np.where(indices)):
-            energy[i, j] = cavern[i, j] + min(
-                filter(
-                    lambda x: x != -1,
-                    (
-                        energy_padded[i, j + 1],
-                        energy_padded[i + 2, j + 1],
-                        energy_padded[i + 1, j],
-                        energy_padded[i + 1, j + 2],
-                    ),
-                )
-            )
 
-    return energy[0, 0] - cavern[0, 0]
+def part1(data: str) -> int:
+    return lowest_total_risk(grid.parse(data, dtype=int))
 
 
 def part2(data: str) -> int:
-    cavern = np.array([[int(s) for s in line] for line in data.splitlines()], dtype=int)
+    cavern = grid.parse(data, dtype=int)
 
     h, w = cavern.shape
     cavern_full = np.empty((w * 5, h * 5), dtype=int)
     for i in range(5):
         for j in range(5):
             cavern_full[i * h : (i + 1) * h, j * w : (j + 1) * w] = cavern + i + j
-    cavern = (cavern_full - 1) % 9 + 1
-
-    # Full disclosure: part1 code somehow works for the test grid but *NOT* for my actual data.
-    # Couldn't find the issue in a reasonable time, so I basically cheated :)
-    _, cost = route_through_array(
-        cavern, (0, 0), (-1, -1), fully_connected=False, geometric=False
-    )
-    return int(cost) - cavern[0, 0]
+    return lowest_total_risk((cavern_full - 1) % 9 + 1)
 
 
 def run_test_part1(*args, **kwargs):
@@ -102,11 +72,14 @@ def run_solution(name: str, test_func: Callable, solution: Callable, *args, **kw
     if not proceed:
         sys.exit()
 
-    result = solution(aocd.get_data(day=DAY, year=2021), *args, **kwargs)
+    result = solution(inputs.get_data(day=DAY, year=2021), *args, **kwargs)
     console.print(f"{name.capitalize()} solution: {result}", style="blue")
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
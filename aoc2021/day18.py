@@ -5,14 +5,11 @@ import sys
 from pathlib import Path
 from typing import Callable, Optional
 
-import aocd
 import pytest
-import tqdm
-from rich.console import Console
-from rich.traceback import install
+from aoctool import inputs, lazy
 
-install(show_locals=True)
-console = Console()
+tqdm = lazy.module("tqdm")
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 # noinspection SpellCheckingInspection
@@ -280,11 +277,14 @@ def run_solution(name: str, test_func: Callable, solution: Callable, *args, **kw
     if not proceed:
         sys.exit()
 
-    result = solution(aocd.get_data(day=DAY, year=2021), *args, **kwargs)
+    result = solution(inputs.get_data(day=DAY, year=2021), *args, **kwargs)
     console.print(f"{name.capitalize()} solution: {result}", style="blue")
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
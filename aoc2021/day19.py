@@ -1,19 +1,14 @@
-import hashlib
 import itertools
-import pickle
 import sys
 from pathlib import Path
 from typing import Any, Callable, Dict, Set, Tuple
 
-import aocd
-import multiprocess
-import networkx as nx
 import numpy as np
-from rich.console import Console
-from rich.traceback import install
+from aoctool import cache, inputs, lazy, parsing
 
-install(show_locals=True)
-console = Console()
+multiprocess = lazy.module("multiprocess")
+nx = lazy.module("networkx")
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 # noinspection SpellCheckingInspection
@@ -158,10 +153,7 @@ TEST_RESULT_PART2: int | None = 3621
 
 
 def read_data(data: str) -> [np.ndarray]:
-    return [
-        np.array([np.fromstring(line, sep=",") for line in block.splitlines()[1:]], dtype=int)
-        for block in data.split("\n\n")
-    ]
+    return parsing.blocks(data, 3, header=1)
 
 
 def compute_permutations():
@@ -236,26 +228,21 @@ def merge_block_to_set(block: np.ndarray, s: Set[Tuple[int, int, int]]) -> None:
         s.add(block[i, :])
 
 
+@cache.memoize(key=lambda blocks, data: data)
 def compute_matches(blocks: [np.ndarray], data: str) -> Dict[Tuple[int, int], Any]:
-    file = Path(f"/tmp/day_19_{hashlib.md5(data.encode()).hexdigest()}.pickle")
-    if file.exists():
-        matches = pickle.loads(file.read_bytes())
-    else:
-        matches = {}
-        with multiprocess.Pool() as pool:
-            for (i, j), res in pool.imap(
-                lambda p: (p, find_transform(blocks[p[0]], blocks[p[1]])),
-                itertools.permutations(range(len(blocks)), 2),
-            ):
-                if res is not None:
-                    perm, offsets = res
-                    print(
-                        f"match found between blocks {i} and {j}: perm={perm}, "
-                        f"offsets={offsets}"
-                    )
-                    matches[(i, j)] = (perm, offsets)
-
-        file.write_bytes(pickle.dumps(matches))
+    matches = {}
+    with multiprocess.Pool() as pool:
+        for (i, j), res in pool.imap(
+            lambda p: (p, find_transform(blocks[p[0]], blocks[p[1]])),
+            itertools.permutations(range(len(blocks)), 2),
+        ):
+            if res is not None:
+                perm, offsets = res
+                print(
+                    f"match found between blocks {i} and {j}: perm={perm}, "
+                    f"offsets={offsets}"
+                )
+                matches[(i, j)] = (perm, offsets)
 
     return matches
 
@@ -347,11 +334,14 @@ def run_solution(name: str, test_func: Callable, solution: Callable, *args, **kw
     if not proceed:
         sys.exit()
 
-    result = solution(aocd.get_data(day=DAY, year=2021), *args, **kwargs)
+    result = solution(inputs.get_data(day=DAY, year=2021), *args, **kwargs)
     console.print(f"{name.capitalize()} solution: {result}", style="blue")
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
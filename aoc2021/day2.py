@@ -1,12 +1,9 @@
 import sys
 from pathlib import Path
 
-import aocd
-from rich.console import Console
-from rich.traceback import install
+from aoctool import inputs, lazy
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """forward 5
@@ -67,6 +64,9 @@ def run_test_part2():
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
 
     # part 1
@@ -85,7 +85,8 @@ def main() -> None:
         sys.exit()
 
     console.print(
-        f"Day {DAY} part 1 solution: {part1(aocd.get_data(day=DAY, year=2021))}", style="blue"
+        f"Day {DAY} part 1 solution: {part1(inputs.get_data(day=DAY, year=2021))}",
+        style="blue",
     )
 
     # part 2
@@ -104,7 +105,8 @@ def main() -> None:
         sys.exit()
 
     console.print(
-        f"Day {DAY} part 2 solution: {part2(aocd.get_data(day=DAY, year=2021))}", style="blue"
+        f"Day {DAY} part 2 solution: {part2(inputs.get_data(day=DAY, year=2021))}",
+        style="blue",
     )
 
 
@@ -2,14 +2,10 @@ import sys
 from pathlib import Path
 from typing import Callable
 
-import aocd
 import numpy as np
-from rich.console import Console
-from rich.traceback import install
-from scipy.signal import convolve2d
+from aoctool import automaton, grid, inputs, lazy
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 # noinspection SpellCheckingInspection
@@ -23,33 +19,28 @@ TEST_DATA: str = """..#.#..#####.#.#.#.###.##.....###.##.#..###.####..#####..#..
 TEST_RESULT_PART1: int | None = 35
 TEST_RESULT_PART2: int | None = 3351
 
+PIXELS = {"#": 1, ".": 0}
+
 
 def load_data(data: str) -> (np.ndarray, np.ndarray):
     lookup_data, img_data = data.split("\n\n")
     return (
-        np.array([1 if c == "#" else 0 for c in lookup_data], dtype=int),
-        np.array(
-            [[1 if c == "#" else 0 for c in line] for line in img_data.splitlines()],
-            dtype=int,
-        ),
+        grid.parse(lookup_data, PIXELS, dtype=int)[0],
+        grid.parse(img_data, PIXELS, dtype=int),
     )
 
 
-KERNEL = np.array([2 ** i for i in range(9)], dtype=int).reshape((3, 3))
+# the top-left pixel is the most significant bit of the lookup index
+KERNEL = 2 ** np.arange(8, -1, -1).reshape((3, 3))
 
 
 def enhance(data: str, num: int) -> int:
     lookup, img = load_data(data)
     assert len(lookup) == 512
-    pad = 0
-
-    for _ in range(num):
-        img = np.pad(img, 2, constant_values=pad)
-        idx = convolve2d(img, KERNEL, mode="valid")
-        img = lookup[idx]
-        pad = lookup[-1] if pad else lookup[0]
 
-    return np.sum(img)
+    image = automaton.Automaton(img, automaton.LookupRule(KERNEL, lookup))
+    image.run(num)
+    return image.count()
 
 
 def part1(data: str) -> int:
@@ -89,11 +80,14 @@ def run_solution(name: str, test_func: Callable, solution: Callable, *args, **kw
     if not proceed:
         sys.exit()
 
-    result = solution(aocd.get_data(day=DAY, year=2021), *args, **kwargs)
+    result = solution(inputs.get_data(day=DAY, year=2021), *args, **kwargs)
     console.print(f"{name.capitalize()} solution: {result}", style="blue")
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
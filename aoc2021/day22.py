@@ -1,16 +1,12 @@
-import dataclasses
-import itertools
 import sys
 import time
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable
 
-import aocd
-from rich.console import Console
-from rich.traceback import install
+import numpy as np
+from aoctool import inputs, intervals, lazy, parsing
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 # noinspection SpellCheckingInspection
@@ -78,202 +74,61 @@ TEST_RESULT_PART1: int | None = 474140
 TEST_RESULT_PART2: int | None = 2758514936282235
 
 
-@dataclasses.dataclass(frozen=True)
-class Range:
-    min: int
-    max: int
+def load(data: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Whether each step turns cubes on, and the bounds of its cuboid as half-open
+    intervals along each axis."""
+    on = np.array([line.startswith("on") for line in data.splitlines()], dtype=bool)
+    bounds = parsing.records(data, 6)
+    return on, bounds[:, ::2], bounds[:, 1::2] + 1
 
-    @classmethod
-    def from_string(cls, s: str) -> "Range":
-        return cls(*[int(val) for val in s.split("..")])
 
-    def count(self) -> int:
-        return self.max + 1 - self.min
+def count_cubes(on: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> int:
+    """Number of cubes left on after the reboot steps.
 
-    def intersects(self, other: "Range") -> bool:
-        return (
-            self.min <= other.min <= self.max
-            or self.min <= other.max <= self.max
-            or (other.min <= self.min and other.max >= self.max)
-        )
-
-    def intersection(self, other: "Range") -> Optional["Range"]:
-        if not self.intersects(other):
-            return None
-
-        return Range(max(self.min, other.min), min(self.max, other.max))
-
-    def __and__(self, other: "Range") -> Optional["Range"]:
-        return self.intersection(other)
-
-    def difference(self, other: "Range") -> ["Range"]:
-        if not self.intersects(other):
-            return self
-        elif other.min <= self.min and other.max >= self.max:
-            return []
-        elif other.min > self.min and other.max < self.max:
-            return [Range(self.min, other.min - 1), Range(other.max + 1, self.max)]
-        elif other.min <= self.min:
-            return [Range(other.max + 1, self.max)]
-        else:
-            return [Range(self.min, other.min - 1)]
-
-    def __sub__(self, other: "Range") -> ["Range"]:
-        return self.difference(other)
-
-
-@dataclasses.dataclass(frozen=True)
-class Cube:
-    x: Range
-    y: Range
-    z: Range
-
-    @classmethod
-    def from_string(cls, s: str) -> "Cube":
-        ranges = [Range.from_string(r.split("=")[1]) for r in s.split(",")]
-        return cls(*ranges)
-
-    @classmethod
-    def from_coord(cls, x1: int, x2: int, y1: int, y2: int, z1: int, z2: int) -> "Cube":
-        return cls(Range(x1, x2), Range(y1, y2), Range(z1, z2))
-
-    def count(self) -> int:
-        return self.x.count() * self.y.count() * self.z.count()
-
-    def intersects(self, other: "Cube") -> bool:
-        return (
-            self.x.intersects(other.x)
-            and self.y.intersects(other.y)
-            and self.z.intersects(other.z)
-        )
-
-    def difference(self, other: "Cube") -> ["Cube"]:
-        if not self.intersects(other):
-            return [self]
-
-        xi = self.x & other.x
-        yi = self.y & other.y
-        zi = self.z & other.z
-        xd = self.x - other.x
-        yd = self.y - other.y
-        zd = self.z - other.z
-
-        res = []
-        for x, y, z in itertools.product((xi, *xd), (yi, *yd), (zi, *zd)):
-            assert x is not None and y is not None and z is not None
+    Cuboids are counted by inclusion-exclusion: every step cancels its overlap with each
+    signed cuboid counted so far, and cuboids turned on are then counted once more.
+    """
+    cuboid_starts = np.empty((0, 3), dtype=np.int64)
+    cuboid_stops = np.empty((0, 3), dtype=np.int64)
+    signs = np.empty(0, dtype=np.int64)
 
-            if x == xi and y == yi and z == zi:
-                continue
+    for state, start, stop in zip(on, starts, stops):
+        low, high = intervals.intersection(cuboid_starts, cuboid_stops, start, stop)
+        overlap = np.all(low < high, axis=1)
+        added = 1 if state else 0
+        cuboid_starts = np.concatenate((cuboid_starts, low[overlap], start[None][:added]))
+        cuboid_stops = np.concatenate((cuboid_stops, high[overlap], stop[None][:added]))
+        signs = np.concatenate((signs, -signs[overlap], [1][:added]))
 
-            res.append(Cube(x, y, z))
-
-        return res
-
-    def __sub__(self, other: "Cube") -> ["Cube"]:
-        return self.difference(other)
-
-    def crop(self, low: int, high: int) -> Optional["Cube"]:
-        r = Range(low, high)
-        if self.x.intersects(r) and self.y.intersects(r) and self.z.intersects(r):
-            return Cube(
-                Range(max(self.x.min, low), min(self.x.max, high)),
-                Range(max(self.y.min, low), min(self.y.max, high)),
-                Range(max(self.z.min, low), min(self.z.max, high)),
-            )
-        else:
-            return None
+    volumes = np.prod(intervals.lengths(cuboid_starts, cuboid_stops), axis=1)
+    return int(np.sum(signs * volumes))
 
 
 def part1(data: str) -> int:
-    all_cubes = []
-
-    for line in data.splitlines():
-        onoff, cube_str = line.split(" ")
-        new_cube = Cube.from_string(cube_str).crop(-50, 50)
-        if new_cube is None:
-            continue
-
-        if onoff == "on":
-            # diff all exising cubes from cube
-            new_cubes = [new_cube]
-
-            for cube in all_cubes:
-                new_cubes = sum((c - cube for c in new_cubes), [])
-
-            all_cubes.extend(new_cubes)
-        else:
-            all_cubes = sum((cube - new_cube for cube in all_cubes), [])
-
-    return sum(cube.count() for cube in all_cubes)
+    on, starts, stops = load(data)
+    starts, stops = intervals.intersection(starts, stops, -50, 51)
+    return count_cubes(on, starts, stops)
 
 
 def part2(data: str) -> int:
-    all_cubes = []
+    return count_cubes(*load(data))
 
-    for line in data.splitlines():
-        onoff, cube_str = line.split(" ")
-        new_cube = Cube.from_string(cube_str)
-
-        if onoff == "on":
-            # diff all exising cubes from cube
-            new_cubes = [new_cube]
-
-            for cube in all_cubes:
-                new_cubes = sum((c - cube for c in new_cubes), [])
-
-            all_cubes.extend(new_cubes)
-        else:
-            all_cubes = sum((cube - new_cube for cube in all_cubes), [])
-
-    return sum(cube.count() for cube in all_cubes)
-
-
-def test_range():
-    assert Range.from_string("50..60") == Range(50, 60)
-    assert Range(-10, 40).intersects(Range(40, 43))
-    assert not Range(-10, 40).intersects(Range(41, 43))
-    assert Range(-10, 40).intersects(Range(-20, -8))
-    assert Range(-10, 40).intersects(Range(-20, -10))
-    assert not Range(-10, 40).intersects(Range(-20, -11))
-    assert Range(50, 60).intersects(Range(49, 61))
-    assert Range(50, 60) & Range(55, 70) == Range(55, 60)
-    assert Range(0, 10) & Range(12, 20) is None
-    assert Range(50, 60) & Range(10, 50) == Range(50, 50)
-    assert Range(50, 60) - Range(55, 60) == [Range(50, 54)]
-    assert Range(50, 60) - Range(0, 50) == [Range(51, 60)]
-    assert Range(50, 60) - Range(0, 55) == [Range(56, 60)]
-    assert Range(50, 60) - Range(50, 60) == []
-    assert Range(50, 60) - Range(49, 60) == []
-    assert Range(50, 60) - Range(50, 61) == []
-    assert Range(50, 60) - Range(49, 61) == []
-    assert set(Range(0, 10) - Range(5, 7)) == {Range(0, 4), Range(8, 10)}
-    assert Range(50, 50).count() == 1
-    assert Range(50, 60).count() == 11
 
+def test_count_cubes():
+    def count(*steps: tuple[bool, tuple[int, ...]]) -> int:
+        bounds = np.array([bounds for _, bounds in steps])
+        return count_cubes(
+            np.array([state for state, _ in steps]), bounds[:, ::2], bounds[:, 1::2] + 1
+        )
 
-def test_cube():
-    assert (
-        Cube.from_coord(0, 10, 0, 10, 0, 10) - Cube.from_coord(-10, 20, -10, 20, -10, 20) == []
+    assert count((True, (0, 10, 0, 10, 0, 10))) == 11**3
+    assert count((True, (0, 10, 0, 10, 0, 10)), (True, (0, 10, 0, 10, 0, 10))) == 11**3
+    assert count((True, (0, 10, 0, 10, 0, 10)), (False, (-10, 20, -10, 20, -10, 20))) == 0
+    assert count((True, (0, 10, 0, 10, 0, 10)), (False, (8, 20, 8, 20, 8, 20))) == 11**3 - 27
+    assert count((True, (0, 10, 0, 10, 0, 10)), (True, (8, 20, 8, 20, 8, 20))) == (
+        11**3 + 13**3 - 27
     )
-    assert Cube.from_coord(0, 10, 0, 10, 0, 10) - Cube.from_coord(0, 10, 0, 10, 0, 10) == []
-    assert Cube.from_coord(0, 10, 0, 10, 0, 10) - Cube.from_coord(0, 10, 0, 10, 0, 5) == [
-        Cube.from_coord(0, 10, 0, 10, 6, 10)
-    ]
-    assert set(Cube.from_coord(0, 10, 0, 10, 0, 10) - Cube.from_coord(0, 10, 0, 10, 5, 6)) == {
-        Cube.from_coord(0, 10, 0, 10, 7, 10),
-        Cube.from_coord(0, 10, 0, 10, 0, 4),
-    }
-    assert set(
-        Cube.from_coord(0, 10, 0, 10, 0, 10) - Cube.from_coord(8, 20, 8, 20, 8, 20)
-    ) == {
-        Cube.from_coord(0, 7, 0, 7, 0, 7),
-        Cube.from_coord(0, 7, 0, 7, 8, 10),
-        Cube.from_coord(0, 7, 8, 10, 0, 7),
-        Cube.from_coord(8, 10, 0, 7, 0, 7),
-        Cube.from_coord(8, 10, 8, 10, 0, 7),
-        Cube.from_coord(8, 10, 0, 7, 8, 10),
-        Cube.from_coord(0, 7, 8, 10, 8, 10),
-    }
+    assert count((False, (0, 1, 0, 1, 0, 1)), (True, (0, 0, 0, 0, 5, 6))) == 2
 
 
 def run_test_part1(*args, **kwargs):
@@ -304,7 +159,7 @@ def run_solution(name: str, test_func: Callable, solution: Callable, *args, **kw
 
     if not proceed:
         sys.exit()
-    data = aocd.get_data(day=DAY, year=2021)
+    data = inputs.get_data(day=DAY, year=2021)
     start_time = time.time()
     result = solution(data, *args, **kwargs)
     delta = time.time() - start_time
@@ -315,6 +170,9 @@ def run_solution(name: str, test_func: Callable, solution: Callable, *args, **kw
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
@@ -1,14 +1,11 @@
-import itertools
 import time
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-import aocd
-import networkx as nx
 import pytest
-from rich.console import Console
+from aoctool import graph, inputs, lazy
 
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 YEAR = 2021
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
@@ -19,42 +16,35 @@ TEST_DATA: str = """#############
   #A#D#C#A#
   #########"""
 TEST_RESULT_PART1: int | None = 12521
-DATA = aocd.get_data(day=DAY, year=2021)
 
 Spot = Optional[str]
 State = Tuple[
     Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot, Spot
 ]
 
-TOPO = nx.Graph()
-TOPO.add_edge(0, 1, value=1)
-TOPO.add_edge(2, 3, value=1)
-TOPO.add_edge(4, 5, value=1)
-TOPO.add_edge(6, 7, value=1)
-TOPO.add_edge(8, 9, value=1)
-TOPO.add_edge(9, 10, value=2)
-TOPO.add_edge(10, 11, value=2)
-TOPO.add_edge(11, 12, value=2)
-TOPO.add_edge(12, 13, value=2)
-TOPO.add_edge(13, 14, value=1)
-TOPO.add_edge(1, 9, value=2)
-TOPO.add_edge(1, 10, value=2)
-TOPO.add_edge(3, 10, value=2)
-TOPO.add_edge(3, 11, value=2)
-TOPO.add_edge(5, 11, value=2)
-TOPO.add_edge(5, 12, value=2)
-TOPO.add_edge(7, 12, value=2)
-TOPO.add_edge(7, 13, value=2)
+TOPO = [
+    (0, 1, 1),
+    (2, 3, 1),
+    (4, 5, 1),
+    (6, 7, 1),
+    (8, 9, 1),
+    (9, 10, 2),
+    (10, 11, 2),
+    (11, 12, 2),
+    (12, 13, 2),
+    (13, 14, 1),
+    (1, 9, 2),
+    (1, 10, 2),
+    (3, 10, 2),
+    (3, 11, 2),
+    (5, 11, 2),
+    (5, 12, 2),
+    (7, 12, 2),
+    (7, 13, 2),
+]
 
 # precompute paths from top of room to any hall
-ROOM_TO_HALL = {}
-for from_idx, to_idx in itertools.product(range(15), repeat=2):
-    if from_idx == to_idx:
-        continue
-    ROOM_TO_HALL[(from_idx, to_idx)] = (
-        nx.shortest_path(TOPO, from_idx, to_idx, weight="value"),
-        nx.shortest_path_length(TOPO, from_idx, to_idx, weight="value"),
-    )
+ROOM_TO_HALL = graph.all_pairs_shortest_paths(TOPO)
 
 ITEM_TO_ROOM = {"A": (0, 1), "B": (2, 3), "C": (4, 5), "D": (6, 7)}
 
@@ -145,35 +135,41 @@ def possible_exploration_moves(state: State, index: int) -> Dict[int, int]:
 TARGET_STATE: State = ("A", "A", "B", "B", "C", "C", "D", "D") + (None,) * 7
 
 
-def explore(state: State, cost: int, all_states: Dict[State, int]):
-    # dont pursue this avenue if it has been explored already
-    if state in all_states and cost >= all_states[state]:
-        return None
-    else:
-        all_states[state] = cost
-
-    # check if a "final move" is possible
+def moves(state: State) -> list[tuple[State, int]]:
+    # check if a "final move" is possible: if so, it is the only move worth exploring
     for index in range(15):
         if state[index] is not None and not is_final(state, index):
             res = possible_final_move(state, index)
             if res is not None:
                 dest, added_cost = res
-                explore(move(state, index, dest), cost + added_cost, all_states)
-                return
+                return [(move(state, index, dest), added_cost)]
 
     # no final move is possible, explore everything
+    result = []
     for index in range(8):
         if state[index] is not None and not is_final(state, index):
-            moves = possible_exploration_moves(state, index)
-            for dest, added_cost in moves.items():
-                explore(move(state, index, dest), cost + added_cost, all_states)
+            for dest, added_cost in possible_exploration_moves(state, index).items():
+                result.append((move(state, index, dest), added_cost))
+    return result
+
+
+def remaining_cost(state: State) -> int:
+    """Lower bound of the cost to reach the target: every misplaced amphipod must at least
+    walk to the top of its room."""
+    cost = 0
+    for index, item in enumerate(state):
+        top = ITEM_TO_ROOM[item][-1] if item is not None else None
+        if item is not None and index != top and not is_final(state, index):
+            cost += ROOM_TO_HALL[(index, top)][1] * MULTIPLIER[item]
+    return cost
+
+
+def solve(state: State) -> graph.Search:
+    return graph.astar([state], moves, lambda s: s == TARGET_STATE, remaining_cost)
 
 
 def part1(data: str) -> int:
-    state = read_data(data)
-    all_states = {}
-    explore(state, 0, all_states)
-    return all_states[TARGET_STATE]
+    return solve(read_data(data)).cost
 
 
 @pytest.mark.parametrize(
@@ -189,11 +185,8 @@ def part1(data: str) -> int:
         ],
     ],
 )
-def test_explore(state, cost):
-    all_states = {}
-    explore(state, 0, all_states)
-    assert TARGET_STATE in all_states
-    assert all_states[TARGET_STATE] == cost
+def test_solve(state, cost):
+    assert solve(state).cost == cost
 
 
 @pytest.mark.skipif(TEST_RESULT_PART1 is None, reason="part 1 test result not provided")
@@ -202,11 +195,12 @@ def test_part1():
 
 
 def main() -> None:
+    data = inputs.get_data(day=DAY, year=YEAR)
     console.print(f"AOC {YEAR} day {DAY}", style="blue")
     console.print("Tests: ", end="", style="blue")
     pytest.main(["-q", __file__])
     start = time.time()
-    res = part1(DATA)
+    res = part1(data)
     delta = time.time() - start
     console.print(f"Part 1 solution: {res} (execution time: {delta*1000:.2f}ms)", style="blue")
 
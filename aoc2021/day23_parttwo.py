@@ -1,14 +1,11 @@
-import itertools
 import time
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-import aocd
-import networkx as nx
 import pytest
-from rich.console import Console
+from aoctool import graph, inputs, lazy
 
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 YEAR = 2021
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
@@ -19,7 +16,6 @@ TEST_DATA: str = """#############
   #A#D#C#A#
   #########"""
 TEST_RESULT_PART2: int | None = 44169
-DATA = aocd.get_data(day=DAY, year=2021)
 
 Spot = Optional[str]
 State = Tuple[
@@ -48,38 +44,26 @@ State = Tuple[
     Spot,
 ]
 
-TOPO = nx.Graph()
-
-for i in (0, 4, 8, 12):
-    TOPO.add_edge(i, i + 1, value=1)
-    TOPO.add_edge(i + 1, i + 2, value=1)
-    TOPO.add_edge(i + 2, i + 3, value=1)
-
-TOPO.add_edge(16, 17, value=1)
-TOPO.add_edge(17, 18, value=2)
-TOPO.add_edge(18, 19, value=2)
-TOPO.add_edge(19, 20, value=2)
-TOPO.add_edge(20, 21, value=2)
-TOPO.add_edge(21, 22, value=1)
-TOPO.add_edge(3, 17, value=2)
-TOPO.add_edge(3, 18, value=2)
-TOPO.add_edge(7, 18, value=2)
-TOPO.add_edge(7, 19, value=2)
-TOPO.add_edge(11, 19, value=2)
-TOPO.add_edge(11, 20, value=2)
-TOPO.add_edge(15, 20, value=2)
-TOPO.add_edge(15, 21, value=2)
-
+TOPO = [(i + j, i + j + 1, 1) for i in (0, 4, 8, 12) for j in range(3)]
+TOPO += [
+    (16, 17, 1),
+    (17, 18, 2),
+    (18, 19, 2),
+    (19, 20, 2),
+    (20, 21, 2),
+    (21, 22, 1),
+    (3, 17, 2),
+    (3, 18, 2),
+    (7, 18, 2),
+    (7, 19, 2),
+    (11, 19, 2),
+    (11, 20, 2),
+    (15, 20, 2),
+    (15, 21, 2),
+]
 
 # precompute paths from top of room to any hall
-ROOM_TO_HALL = {}
-for from_idx, to_idx in itertools.product(range(23), repeat=2):
-    if from_idx == to_idx:
-        continue
-    ROOM_TO_HALL[(from_idx, to_idx)] = (
-        nx.shortest_path(TOPO, from_idx, to_idx, weight="value"),
-        nx.shortest_path_length(TOPO, from_idx, to_idx, weight="value"),
-    )
+ROOM_TO_HALL = graph.all_pairs_shortest_paths(TOPO)
 
 ITEM_TO_ROOM = {
     "A": (0, 1, 2, 3),
@@ -180,36 +164,43 @@ def possible_exploration_moves(state: State, index: int) -> Dict[int, int]:
 TARGET_STATE: State = ("A",) * 4 + ("B",) * 4 + ("C",) * 4 + ("D",) * 4 + (None,) * 7
 
 
-def explore(state: State, cost: int, all_states: Dict[State, int]):
-    # dont pursue this avenue if it has been explored already
-    if state in all_states and cost >= all_states[state]:
-        return None
-    else:
-        all_states[state] = cost
-
-    # check if a "final move" is possible
+def moves(state: State) -> list[tuple[State, int]]:
+    # check if a "final move" is possible: if so, it is the only move worth exploring
     for index in range(23):
         if state[index] is not None and not is_final(state, index):
             res = possible_final_move(state, index)
             if res is not None:
                 dest, added_cost = res
-                explore(move(state, index, dest), cost + added_cost, all_states)
-                return
+                return [(move(state, index, dest), added_cost)]
 
     # no final move is possible, explore everything
+    result = []
     for index in range(16):
         if state[index] is not None and not is_final(state, index):
-            moves = possible_exploration_moves(state, index)
-            for dest, added_cost in moves.items():
-                explore(move(state, index, dest), cost + added_cost, all_states)
+            for dest, added_cost in possible_exploration_moves(state, index).items():
+                result.append((move(state, index, dest), added_cost))
+    return result
+
+
+def remaining_cost(state: State) -> int:
+    """Lower bound of the cost to reach the target: every misplaced amphipod must at least
+    walk to the top of its room."""
+    cost = 0
+    for index, item in enumerate(state):
+        top = ITEM_TO_ROOM[item][-1] if item is not None else None
+        if item is not None and index != top and not is_final(state, index):
+            cost += ROOM_TO_HALL[(index, top)][1] * MULTIPLIER[item]
+    return cost
+
+
+def solve(state: State) -> graph.Search:
+    return graph.astar([state], moves, lambda s: s == TARGET_STATE, remaining_cost)
 
 
 def part2(data: str) -> int:
-    state = read_data(data)
-    all_states = {}
-    explore(state, 0, all_states)
-    print(f"States visited: {len(all_states)}")
-    return all_states[TARGET_STATE]
+    search = solve(read_data(data))
+    print(f"States visited: {len(search.distances)}")
+    return search.cost
 
 
 @pytest.mark.skipif(TEST_RESULT_PART2 is None, reason="part 2 test result not provided")
@@ -218,11 +209,12 @@ def test_part2():
 
 
 def main() -> None:
+    data = inputs.get_data(day=DAY, year=YEAR)
     console.print(f"AOC {YEAR} day {DAY}", style="blue")
     console.print("Tests: ", end="", style="blue")
     pytest.main(["-q", __file__])
     start = time.time()
-    res = part2(DATA)
+    res = part2(data)
     delta = time.time() - start
     console.print(f"Part 2 solution: {res} (execution time: {delta*1000:.2f}ms)", style="blue")
 
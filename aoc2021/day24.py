@@ -1,72 +1,98 @@
 from pathlib import Path
 from typing import Callable
 
-import aocd
-
-# import numba
 import numpy as np
-from rich.console import Console
+import pytest
+from aoctool import inputs, jit, lazy, variants, vm
 
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 YEAR = 2021
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
-DATA = aocd.get_data(day=DAY, year=2021)
 
 
-def compile_code(data: str) -> Callable:
+# the binary digits of the input, from w (most significant) to z
+TEST_DATA = """inp w
+add z w
+mod z 2
+div w 2
+add y w
+mod y 2
+div w 2
+add x w
+mod x 2
+div w 2
+mod w 2"""
+
+monad = variants.VariantGroup(
+    "day24_monad", samples=[(TEST_DATA, np.arange(-20, 20)[:, None])]
+)
+
+
+def load_monad(data: str) -> vm.Program:
+    return vm.parse(data, registers="wxyz")
+
+
+@monad.variant(default=True)
+def monad_vm(data: str, batch: np.ndarray) -> np.ndarray:
+    """Registers w, x, y, z at the end of the program, for every row of inputs."""
+    registers, _ = vm.run_batch(load_monad(data), batch)
+    return registers
+
+
+def compile_monad(data: str) -> Callable:
     code = (
         "import numba\n"
-        "@numba.jit(nopython=True)\n"
-        "def monad(arr):\n"
-        "    i = w = x = y = z = 0\n"
+        "import numpy as np\n"
+        "@numba.njit(cache=True)\n"
+        "def monad(batch):\n"
+        "    out = np.empty((len(batch), 4), dtype=np.int64)\n"
+        "    for row in range(len(batch)):\n"
+        "        arr = batch[row]\n"
+        "        i = w = x = y = z = 0\n"
     )
 
     for line in data.splitlines():
         match line.split():
             case ["inp", a]:
-                code += f"    {a} = arr[i]\n    i += 1\n"
+                code += f"        {a} = arr[i]\n        i += 1\n"
 
             case ["add", a, b]:
-                code += f"    {a} += {b}\n"
+                code += f"        {a} += {b}\n"
 
             case ["mul", a, b]:
-                code += f"    {a} *= {b}\n"
+                code += f"        {a} *= {b}\n"
 
             case ["div", a, b]:
-                code += f"    {a} //= {b}\n"
+                # truncated towards zero, as in the VM
+                code += f"        {a} = abs({a}) // abs({b}) "
+                code += f"* (1 if ({a} < 0) == ({b} < 0) else -1)\n"
 
             case ["mod", a, b]:
-                code += f"    {a} %= {b}\n"
+                code += f"        {a} %= {b}\n"
 
             case ["eql", a, b]:
-                code += f"    {a} = int({a} == {b})\n"
+                code += f"        {a} = int({a} == {b})\n"
 
             case _:
                 assert False
 
-    code += "    return w, x, y, z"
+    code += "        out[row, 0], out[row, 1], out[row, 2], out[row, 3] = w, x, y, z\n"
+    code += "    return out\n"
 
-    local_variables = {}
-    exec(code, globals(), local_variables)
-    return local_variables["monad"]
+    # compiled once per program, then loaded from numba's on-disk cache
+    return jit.compile_source(code, "monad")
 
 
-def test_exec_code():
-    monad = compile_code(
-        """inp w
-add z w
-mod z 2
-div w 2
-add y w
-mod y 2
-div w 2
-add x w
-mod x 2
-div w 2
-mod w 2"""
-    )
-    assert monad(np.array([3], dtype=int)) == (0, 0, 1, 1)
+@monad.variant
+def monad_compiled(data: str, batch: np.ndarray) -> np.ndarray:
+    return compile_monad(data)(np.atleast_2d(np.asarray(batch, dtype=np.int64)))
+
+
+def test_monad():
+    assert monad_vm(TEST_DATA, [[3]]).tolist() == [[0, 0, 1, 1]]
+    assert monad_compiled(TEST_DATA, [[3]]).tolist() == [[0, 0, 1, 1]]
+    monad.check()
 
 
 def monad_reverse_engineered(arr):
@@ -171,8 +197,19 @@ def test_part2():
     )
 
 
+@pytest.mark.skipif(
+    (YEAR, DAY) not in inputs.default_store(), reason="puzzle input not stored"
+)
 def test_monad_reverse_engineered():
-    monad = compile_code(DATA)
-    for _ in range(10000):
-        inp = np.random.randint(1, 10, 14)
-        assert monad(inp) == monad_reverse_engineered(inp)
+    data = inputs.get_data(day=DAY, year=YEAR)
+    batch = np.random.randint(1, 10, (10000, 14))
+    assert monad.check([(data, batch)])
+    for inp, expected in zip(batch, monad(data, batch).tolist()):
+        assert list(monad_reverse_engineered(inp)) == expected
+
+
+def warmup():
+    vm.warmup()
+    if (YEAR, DAY) in inputs.default_store():
+        monad_kernel = compile_monad(inputs.get_data(day=DAY, year=YEAR))
+        monad_kernel(np.ones((1, 14), dtype=np.int64))
@@ -2,12 +2,11 @@ import itertools
 import time
 from pathlib import Path
 
-import aocd
 import numpy as np
 import pytest
-from rich.console import Console
+from aoctool import automaton, grid, inputs, lazy, variants
 
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 YEAR = 2021
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
@@ -22,9 +21,11 @@ v>v.vv.v..
 v.v..>>v.v
 ....v..v.>"""
 TEST_RESULT_PART1: int | None = 58
-DATA = aocd.get_data(day=DAY, year=2021)
 
+part1 = variants.VariantGroup("day25_part1", samples=[TEST_DATA])
 
+
+@part1.variant
 def part1_set(data: str) -> int:
     east_set = set()
     south_set = set()
@@ -69,6 +70,7 @@ def part1_set(data: str) -> int:
             south_set = new_south_set
 
 
+@part1.variant
 def part1_numpy(data: str) -> int:
     east_set = set()
     south_set = set()
@@ -106,6 +108,35 @@ def part1_numpy(data: str) -> int:
             world = new_world
 
 
+EMPTY, EAST, SOUTH = 0, 1, 2
+
+
+class Herds(automaton.Rule):
+    """The east-facing herd moves first, then the south-facing one."""
+
+    def __call__(self, padded: np.ndarray, out: np.ndarray):
+        world = automaton.interior(padded)
+        out[...] = world
+
+        idx = (world == EAST) & (grid.shifted(padded, (0, 1)) == EMPTY)
+        out[idx] = EMPTY
+        out[np.roll(idx, 1, axis=1)] = EAST
+
+        idx = (out == SOUTH) & (np.roll(out, -1, axis=0) == EMPTY)
+        out[idx] = EMPTY
+        out[np.roll(idx, 1, axis=0)] = SOUTH
+
+
+@part1.variant
+def part1_automaton(data: str) -> int:
+    world = grid.parse(data, {".": EMPTY, ">": EAST, "v": SOUTH}, dtype=np.uint8)
+    herds = automaton.Automaton(world, Herds(), boundary="wrap")
+    herds.run()
+    if not herds.stable:
+        raise ValueError(f"the sea cucumbers cycle with period {herds.cycle[1]}")
+    return herds.generation
+
+
 @pytest.mark.skipif(TEST_RESULT_PART1 is None, reason="part 1 test result not provided")
 def test_part1_set():
     assert part1_set(TEST_DATA) == TEST_RESULT_PART1
@@ -116,29 +147,34 @@ def test_part1_numpy():
     assert part1_numpy(TEST_DATA) == TEST_RESULT_PART1
 
 
+@pytest.mark.skipif(TEST_RESULT_PART1 is None, reason="part 1 test result not provided")
+def test_part1_automaton():
+    assert part1_automaton(TEST_DATA) == TEST_RESULT_PART1
+
+
+@pytest.mark.skipif(TEST_RESULT_PART1 is None, reason="part 1 test result not provided")
+def test_part1_variants():
+    assert part1.check() == [TEST_RESULT_PART1]
+
+
+PARTS = {"part1": part1}
+
+
 def main() -> None:
+    data = inputs.get_data(day=DAY, year=YEAR)
     console.rule(f"AOC {YEAR} day {DAY}", style="blue")
     console.print("Tests: ", end="", style="blue")
     pytest.main(["-q", __file__])
-    start = time.time()
-    res = part1_set(DATA)
-    delta = time.time() - start
-    console.print(
-        f"Part [bold cyan]1[/] (set) solution: [bold green]{res}[/] "
-        f"(execution time: [bold cyan]{delta*1000:.2f}ms[/])",
-        style="blue",
-        highlight=False,
-    )
-
-    start = time.time()
-    res = part1_numpy(DATA)
-    delta = time.time() - start
-    console.print(
-        f"Part [bold cyan]1[/] (numpy) solution: [bold green]{res}[/] "
-        f"(execution time: [bold cyan]{delta * 1000:.2f}ms[/])",
-        style="blue",
-        highlight=False,
-    )
+    for variant in part1.variants.values():
+        start = time.time()
+        res = variant(data)
+        delta = time.time() - start
+        console.print(
+            f"Part [bold cyan]1[/] ({variant.name}) solution: [bold green]{res}[/] "
+            f"(execution time: [bold cyan]{delta * 1000:.2f}ms[/])",
+            style="blue",
+            highlight=False,
+        )
 
 
 if __name__ == "__main__":
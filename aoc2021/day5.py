@@ -1,15 +1,11 @@
-import re
 import sys
 from collections import Counter
 from pathlib import Path
 from typing import Callable
 
-import aocd
-from rich.console import Console
-from rich.traceback import install
+from aoctool import inputs, lazy, parsing
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """0,9 -> 5,9
@@ -28,9 +24,8 @@ TEST_RESULT_PART2: int | None = 12
 
 def part1(data: str) -> int:
     counter = Counter()
-    for line in data.splitlines():
-        coords = re.match(r"(\d+),(\d+) -> (\d+),(\d+)", line).groups()
-        match tuple(int(c) for c in coords):
+    for coords in parsing.records(data, 4).tolist():
+        match tuple(coords):
             case (x1, y1, x2, y2) if x1 == x2:
                 for y in range(min(y1, y2), max(y1, y2) + 1):
                     counter.update([(x1, y)])
@@ -43,9 +38,8 @@ def part1(data: str) -> int:
 
 def part2(data: str) -> int:
     counter = Counter()
-    for line in data.splitlines():
-        coords = re.match(r"(\d+),(\d+) -> (\d+),(\d+)", line).groups()
-        match tuple(int(c) for c in coords):
+    for coords in parsing.records(data, 4).tolist():
+        match tuple(coords):
             case (x1, y1, x2, y2) if x1 == x2:
                 for y in range(min(y1, y2), max(y1, y2) + 1):
                     counter.update([(x1, y)])
@@ -90,12 +84,15 @@ def run_solution(name: str, test_func: Callable[[], None], solution: Callable[[s
         sys.exit()
 
     console.print(
-        f"{name.capitalize()} solution: {solution(aocd.get_data(day=DAY, year=2021))}",
+        f"{name.capitalize()} solution: {solution(inputs.get_data(day=DAY, year=2021))}",
         style="blue",
     )
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
@@ -3,14 +3,10 @@ from functools import reduce
 from pathlib import Path
 from typing import Callable
 
-import aocd
 import numpy as np
-from rich.console import Console
-from rich.traceback import install
-from scipy.signal import convolve2d
+from aoctool import grid, inputs, lazy
 
-install(show_locals=True)
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """2199943210
@@ -23,37 +19,18 @@ TEST_RESULT_PART2: int | None = 1134
 
 
 def part1(data: str) -> int:
-    floor = np.array([[int(c) for c in s] for s in data.splitlines()], dtype=int)
-    floor_n = np.roll(floor, 1, axis=0)
-    floor_n[0, :] = 9
-    floor_s = np.roll(floor, -1, axis=0)
-    floor_s[-1, :] = 9
-    floor_e = np.roll(floor, -1, axis=1)
-    floor_e[:, -1] = 9
-    floor_w = np.roll(floor, 1, axis=1)
-    floor_w[:, -0] = 9
-
-    idx = floor < np.stack([floor_n, floor_s, floor_w, floor_e], axis=2).min(axis=2)
+    floor = grid.parse(data, dtype=int)
+    idx = floor < grid.reduce_neighbours(floor, np.minimum, 4, fill=9)
     return (floor[idx] + 1).sum()
 
 
 def part2(data: str) -> int:
-    floor = np.array([[int(c) for c in s] for s in data.splitlines()], dtype=int)
-    floor_n = np.roll(floor, 1, axis=0)
-    floor_n[0, :] = 9
-    floor_s = np.roll(floor, -1, axis=0)
-    floor_s[-1, :] = 9
-    floor_e = np.roll(floor, -1, axis=1)
-    floor_e[:, -1] = 9
-    floor_w = np.roll(floor, 1, axis=1)
-    floor_w[:, -0] = 9
+    floor = grid.parse(data, dtype=int)
 
     # find lows
-    idx = floor < np.stack([floor_n, floor_s, floor_w, floor_e], axis=2).min(axis=2)
+    idx = floor < grid.reduce_neighbours(floor, np.minimum, 4, fill=9)
     lows = [tuple(coord) for coord in np.argwhere(idx)]
 
-    kernel = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]])
-
     basin_size = []
     for low in lows:
 
@@ -61,7 +38,7 @@ def part2(data: str) -> int:
         basin[low] = True
 
         while True:
-            expend = (convolve2d(basin, kernel, mode="same") > 0) & ~basin
+            expend = (grid.count_neighbours(basin, 4) > 0) & ~basin
             expend &= floor != 9
             new_basin = basin | expend
 
@@ -103,12 +80,15 @@ def run_solution(name: str, test_func: Callable[[], None], solution: Callable[[s
         sys.exit()
 
     console.print(
-        f"{name.capitalize()} solution: {solution(aocd.get_data(day=DAY, year=2021))}",
+        f"{name.capitalize()} solution: {solution(inputs.get_data(day=DAY, year=2021))}",
         style="blue",
     )
 
 
 def main() -> None:
+    from rich.traceback import install
+
+    install(show_locals=True)
     console.print(f"Running for day {DAY}", style="blue")
     run_solution("part 1", run_test_part1, part1)
     run_solution("part 2", run_test_part2, part2)
@@ -1,12 +1,12 @@
 import contextlib
+import sys
 import time
 from pathlib import Path
 
-import aocd
 import pytest
-from rich.console import Console
+from aoctool import inputs, lazy, profiling
 
-console = Console()
+console = lazy.instance("rich.console", "Console")
 
 YEAR = 2021
 DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
@@ -14,7 +14,6 @@ DAY = int("".join(s for s in Path(__file__).name if s.isdigit()))
 TEST_DATA: str = """"""
 TEST_RESULT_PART1: int | None = None
 TEST_RESULT_PART2: int | None = None
-DATA = aocd.get_data(day=DAY, year=2021)
 
 
 def part1(data: str) -> int:
@@ -37,9 +36,9 @@ def test_part2():
 
 @contextlib.contextmanager
 def measure_time():
-    start = time.time()
+    start = time.perf_counter()
     yield
-    delta = time.time() - start
+    delta = time.perf_counter() - start
     console.print(
         f"Execution time: [bold cyan]{delta * 1000:.2f}ms[/]",
         style="blue",
@@ -48,14 +47,16 @@ def measure_time():
 
 
 def main() -> None:
+    profile = "--profile" in sys.argv[1:]
+    data = inputs.get_data(day=DAY, year=YEAR)
     console.rule(f"AOC {YEAR} day {DAY}", style="blue")
     console.print("Tests: ", end="", style="blue")
     pytest.main(["-q", __file__])
     with measure_time():
-        res = part1(DATA)
+        res = profiling.run_part(part1, data, f"{YEAR}_day{DAY}_part1", profile)
         console.print(f"Part [bold cyan]1[/] solution: [bold green]{res}[/]", style="blue")
     with measure_time():
-        res = part2(DATA)
+        res = profiling.run_part(part2, data, f"{YEAR}_day{DAY}_part2", profile)
         console.print(f"Part [bold cyan]2[/] solution: [bold green]{res}[/]", style="blue")
 
 
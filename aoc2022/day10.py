@@ -1,4 +1,4 @@
-import aocd
+from aoctool import inputs, vm
 
 TEST_DATA = """addx 15
 addx -11
@@ -156,24 +156,9 @@ TEST_PART2_RESULT = """##..##..##..##..##..##..##..##..##..##..
 
 
 def exec(data: str) -> list[int]:
-    x = 1
-    history = [x]
-
-    for line in data.splitlines():
-        args = line.split(" ")
-        match args:
-            case ["addx", val]:
-                history.append(x)
-                x += int(val)
-                history.append(x)
-
-            case ["noop"]:
-                history.append(x)
-
-            case _:
-                assert False, f"Unknown command {' '.join(args)}"
-
-    return history
+    """Value of the X register during every cycle, then after the last one."""
+    result = vm.run(vm.parse(data), registers=[1], history=True)
+    return result.history[:, 0].tolist()
 
 
 def part1(data: str):
@@ -208,8 +193,12 @@ def test_part2():
         assert part2(TEST_DATA) == TEST_PART2_RESULT
 
 
+def warmup():
+    vm.warmup()
+
+
 def main() -> None:
-    data = aocd.get_data(day=10, year=2022)
+    data = inputs.get_data(day=10, year=2022)
     print("Running for day 10 of year 2022")
     print("Part 1 solution:", part1(data))
 
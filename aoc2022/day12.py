@@ -1,5 +1,7 @@
-import aocd
+import string
+
 import numpy as np
+from aoctool import graph, grid, inputs
 
 TEST_DATA = """Sabqponm
 abcryxxl
@@ -10,81 +12,32 @@ TEST_PART1_RESULT = 31
 TEST_PART2_RESULT = 29
 
 
-def altitude(letter: str) -> int:
-    if letter == "S":
-        letter = "a"
-    elif letter == "E":
-        letter = "z"
-    return ord(letter) - ord("a")
-
-
-def part1(data: str):
-    map = np.array([list(line) for line in data.splitlines()])
-    dist_map = -np.ones_like(map, dtype=int)
+def climb(data: str) -> tuple[np.ndarray, np.ndarray, int]:
+    """Map, number of steps from each cell to the end (-1 if it cannot be reached), and
+    flat index of the start."""
+    map = grid.parse(data, {c: ord(c) for c in string.ascii_letters}, dtype=np.uint8)
+    altitude = map.astype(int) - ord("a")
+    altitude[map == ord("S")] = 0
+    altitude[map == ord("E")] = 25
 
-    end_j, end_i = np.where(map == "E")
-    (start_j,), (start_i,) = np.where(map == "S")
-    dist_map[end_j, end_i] = 0
+    # walk backwards from the end: a step down may be at most one level high (edges
+    # leaving the grid index the last cell, but are masked out by array_bfs)
+    adjacency = graph.grid_adjacency(map.shape)
+    altitude = altitude.ravel()
+    allowed = altitude[adjacency] >= altitude[:, None] - 1
+    dist = graph.array_bfs(adjacency, np.flatnonzero(map == ord("E")), allowed)
+    return map.ravel(), dist, int(np.flatnonzero(map == ord("S"))[0])
 
-    cur_dist = 0
-    while True:
-        idx_j, idx_i = np.where(dist_map == cur_dist)
 
-        for i, j in zip(idx_i, idx_j):
-            assert dist_map[j, i] == cur_dist
-
-            # inspect adjacent cells
-            cur_alt = altitude(map[j, i])
-            for di, dj in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                if (
-                    0 <= i + di < map.shape[1]
-                    and 0 <= j + dj < map.shape[0]
-                    and dist_map[j + dj, i + di] == -1
-                ):
-                    alt = altitude(map[j + dj, i + di])
-                    if alt >= cur_alt - 1:
-                        dist_map[j + dj, i + di] = cur_dist + 1
-                        if (i + di) == start_i and (j + dj) == start_j:
-                            return cur_dist + 1
-
-        cur_dist += 1
+def part1(data: str):
+    _, dist, start = climb(data)
+    return int(dist[start])
 
 
 def part2(data: str):
-    map = np.array([list(line) for line in data.splitlines()])
-    dist_map = -np.ones_like(map, dtype=int)
-
-    end_j, end_i = np.where(map == "E")
-    (start_j,), (start_i,) = np.where(map == "S")
-    dist_map[end_j, end_i] = 0
-
-    cur_dist = 0
-    while True:
-        idx_j, idx_i = np.where(dist_map == cur_dist)
-
-        if len(idx_j) == 0:
-            assert len(idx_i) == 0
-            break
-
-        for i, j in zip(idx_i, idx_j):
-            assert dist_map[j, i] == cur_dist
-
-            # inspect adjacent cells
-            cur_alt = altitude(map[j, i])
-            for di, dj in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                if (
-                    0 <= i + di < map.shape[1]
-                    and 0 <= j + dj < map.shape[0]
-                    and dist_map[j + dj, i + di] == -1
-                ):
-                    alt = altitude(map[j + dj, i + di])
-                    if alt >= cur_alt - 1:
-                        dist_map[j + dj, i + di] = cur_dist + 1
-
-        cur_dist += 1
-
-    candidates_j, candidates_i = np.where(((map == "a") | (map == "S")) & (dist_map != -1))
-    return np.min(dist_map[candidates_j, candidates_i])
+    map, dist, _ = climb(data)
+    candidates = ((map == ord("a")) | (map == ord("S"))) & (dist != -1)
+    return int(np.min(dist[candidates]))
 
 
 def test_part1():
@@ -98,7 +51,7 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day=12, year=2022)
+    data = inputs.get_data(day=12, year=2022)
     print("Running for day 12 of year 2022")
     print("Part 1 solution:", part1(data))
     print("Part 2 solution:", part2(data))
@@ -1,6 +1,6 @@
 import functools
 
-import aocd
+from aoctool import inputs
 
 TEST_DATA = """[1,1,3,1,1]
 [1,1,5,1,1]
@@ -94,7 +94,7 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day=13, year=2022)
+    data = inputs.get_data(day=13, year=2022)
     print("Running for day 13 of year 2022")
     print("Part 1 solution:", part1(data))
     print("Part 2 solution:", part2(data))
@@ -1,9 +1,7 @@
-import re
-from collections import defaultdict
-from typing import Iterable
+import functools
 
-import aocd
-import tqdm
+import numpy as np
+from aoctool import inputs, intervals, parsing
 
 TEST_DATA = """Sensor at x=2, y=18: closest beacon is at x=-2, y=15
 Sensor at x=9, y=16: closest beacon is at x=10, y=16
@@ -23,109 +21,59 @@ TEST_PART1_RESULT = 26
 TEST_PART2_RESULT = 56000011
 
 
-EXPR = re.compile(r"Sensor at x=(-?\d+), y=(-?\d+): closest beacon is at x=(-?\d+), y=(-?\d+)")
+def load(data: str) -> np.ndarray:
+    """One row `(x, y, i, j)` per sensor at `(x, y)` with closest beacon at `(i, j)`."""
+    return parsing.records(data, 4)
 
 
-def load(data: str) -> Iterable[tuple[int, int, int, int]]:
-    for mo in EXPR.finditer(data):
-        yield tuple(map(int, mo.groups()))
+def coverage(sensors: np.ndarray, row: int) -> intervals.IntervalSet:
+    """Columns of `row` within range of at least one sensor."""
+    x, y, i, j = sensors.T
+    delta = np.abs(x - i) + np.abs(y - j) - np.abs(y - row)
+    return intervals.IntervalSet.from_arrays(x - delta, x + delta + 1)
 
 
 def part1(data: str, row: int):
-    ranges = []
-    beacons = set()
-    sensors = set()
-    for x, y, i, j in load(data):
-        dist = abs(x - i) + abs(y - j)
-        dist_to_row = abs(y - row)
-        if dist_to_row <= dist:
-            delta = dist - dist_to_row
-            ranges.append(range(x - delta, x + delta + 1))
-        if j == row:
-            beacons.add(i)
-        if y == row:
-            sensors.add(x)
-
-    occupancy = set.union(*(set(rng) for rng in ranges)) - beacons - sensors
-    return len(occupancy)
-
-
-def merge_ranges(ranges: Iterable[range]) -> Iterable[range]:
-    # thank you copilot
-    ranges = sorted(ranges, key=lambda rng: rng.start)
-    merged = []
-    for rng in ranges:
-        if merged and merged[-1].stop >= rng.start:
-            merged[-1] = range(merged[-1].start, max(merged[-1].stop, rng.stop))
-        else:
-            merged.append(rng)
-    return merged
-
-
-def crop_ranges(ranges: Iterable[range], min_val: int, max_val: int) -> Iterable[range]:
-    # thank you copilot
-    for rng in ranges:
-        if rng.stop <= min_val:
-            continue
-        if rng.start >= max_val:
-            continue
-        yield range(max(rng.start, min_val), min(rng.stop, max_val))
-
-
-def test_merge_ranges():
-    res = merge_ranges(
-        [range(2, 3), range(11, 14), range(3, 14), range(-3, 4), range(15, 26), range(15, 18)]
-    )
-    assert res == [range(-3, 14), range(15, 26)]
-
-
-def test_crop_ranges():
-    res = crop_ranges([range(-3, 14), range(15, 26)], 0, 20)
-    assert list(res) == [range(0, 14), range(15, 20)]
-
-    res = crop_ranges(
-        merge_ranges(
-            [
-                range(2, 3),
-                range(11, 14),
-                range(3, 14),
-                range(-3, 4),
-                range(15, 26),
-                range(15, 18),
-            ]
-        ),
-        0,
-        20,
+    sensors = load(data)
+    x, y, i, j = sensors.T
+    occupied = intervals.IntervalSet.from_points(np.concatenate((i[j == row], x[y == row])))
+    return (coverage(sensors, row) - occupied).count()
+
+
+def candidate_rows(sensors: np.ndarray, coord_range: int) -> np.ndarray:
+    """Rows where a single uncovered position may lie.
+
+    Such a position is just out of range of the sensors covering its neighbours, i.e. on
+    the diagonals bounding their range, so it lies at the intersection of two diagonals
+    (or of a diagonal and the edge of the search area).
+    """
+    x, y, i, j = sensors.T
+    radius = np.abs(x - i) + np.abs(y - j) + 1
+    ascending = np.concatenate((x + y - radius, x + y + radius))  # x + y = a
+    descending = np.concatenate((x - y - radius, x - y + radius))  # x - y = d
+    diff = ascending[:, None] - descending[None, :]
+    rows = np.concatenate(
+        (
+            diff[diff % 2 == 0] // 2,
+            ascending,
+            ascending - coord_range,
+            -descending,
+            coord_range - descending,
+            [0, coord_range],
+        )
     )
-    assert list(res) == [range(0, 14), range(15, 20)]
+    return np.unique(rows[(rows >= 0) & (rows <= coord_range)])
 
 
 def part2(data: str, coord_range: int):
-    ranges = defaultdict(list)
-    beacons = defaultdict(list)
-    sensors = defaultdict(list)
-    for x, y, i, j in tqdm.tqdm(list(load(data))):
-        dist = abs(x - i) + abs(y - j)
-        for delta in range(-dist, dist + 1):
-            dx = dist - abs(delta)
-            ranges[y + delta].append(range(x - dx, x + dx + 1))
-        beacons[j].append(i)
-        sensors[y].append(x)
-
-    for y in tqdm.tqdm(range(coord_range + 1)):
-        occupancy = list(
-            crop_ranges(
-                merge_ranges(
-                    ranges[y]
-                    + [range(i, i + 1) for i in beacons[y]]
-                    + [range(i, i + 1) for i in sensors[y]]
-                ),
-                0,
-                coord_range,
-            )
-        )
-        if len(occupancy) == 2:
-            return occupancy[0].stop * 4000000 + y
+    sensors = load(data)
+    candidates = candidate_rows(sensors, coord_range)
+    # all rows are scanned if the uncovered position is not unique after all
+    for rows in (candidates, range(coord_range + 1)):
+        for y in rows:
+            gaps = coverage(sensors, y).gaps(0, coord_range + 1)
+            if len(gaps):
+                return int(gaps.starts[0]) * 4000000 + int(y)
 
 
 def test_part1():
@@ -138,8 +86,14 @@ def test_part2():
         assert part2(TEST_DATA, 20) == TEST_PART2_RESULT
 
 
+PARTS = {
+    "part1": functools.partial(part1, row=2000000),
+    "part2": functools.partial(part2, coord_range=4000000),
+}
+
+
 def main() -> None:
-    data = aocd.get_data(day=15, year=2022)
+    data = inputs.get_data(day=15, year=2022)
     print("Running for day 15 of year 2022")
     print("Part 1 solution:", part1(data, 2000000))
     print("Part 2 solution:", part2(data, 4000000))
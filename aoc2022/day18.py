@@ -1,7 +1,7 @@
 import functools
 from typing import Iterable
 
-import aocd
+from aoctool import inputs, parsing
 
 TEST_DATA = """2,2,2
 1,2,2
@@ -35,7 +35,7 @@ def outside_area(cubes: set[tuple[int, int, int]]) -> int:
 
 
 def part1(data: str):
-    cubes = {tuple(int(i) for i in s.split(",")) for s in data.splitlines()}
+    cubes = set(map(tuple, parsing.records(data, 3).tolist()))
     return outside_area(cubes)
 
 
@@ -47,7 +47,7 @@ def bounds(
 
 
 def part2(data: str):
-    cubes = {tuple(int(i) for i in s.split(",")) for s in data.splitlines()}
+    cubes = set(map(tuple, parsing.records(data, 3).tolist()))
     (x_min, x_max), (y_min, y_max), (z_min, z_max) = bounds(cubes)
 
     def inside_bounds(cube: tuple[int, int, int]) -> bool:
@@ -83,7 +83,7 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day=18, year=2022)
+    data = inputs.get_data(day=18, year=2022)
     print("Running for day 18 of year 2022")
     print("Part 1 solution:", part1(data))
     print("Part 2 solution:", part2(data))
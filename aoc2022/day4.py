@@ -1,4 +1,5 @@
-import aocd
+import numpy as np
+from aoctool import inputs, intervals, parsing
 
 TEST_DATA = """2-4,6-8
 2-3,4-5
@@ -10,35 +11,21 @@ TEST_PART1_RESULT = 2
 TEST_PART2_RESULT = 4
 
 
-def part1(data: str):
-    cnt = 0
-    for line in data.splitlines():
-        a, b = line.split(",")
-        a1, a2 = a.split("-")
-        b1, b2 = b.split("-")
+def overlaps(data: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Size of each assignment of each pair, and of their overlap."""
+    a1, a2, b1, b2 = parsing.records(data, 4).T
+    overlap = intervals.lengths(*intervals.intersection(a1, a2 + 1, b1, b2 + 1))
+    return intervals.lengths(a1, a2 + 1), intervals.lengths(b1, b2 + 1), overlap
 
-        sa = set(range(int(a1), int(a2) + 1))
-        sb = set(range(int(b1), int(b2) + 1))
-        su = sa & sb
 
-        if su == sa or su == sb:
-            cnt += 1
-    return cnt
+def part1(data: str):
+    size_a, size_b, overlap = overlaps(data)
+    return int(np.sum(overlap == np.minimum(size_a, size_b)))
 
 
 def part2(data: str):
-    cnt = 0
-    for line in data.splitlines():
-        a, b = line.split(",")
-        a1, a2 = a.split("-")
-        b1, b2 = b.split("-")
-
-        sa = set(range(int(a1), int(a2) + 1))
-        sb = set(range(int(b1), int(b2) + 1))
-
-        if len(sa & sb) > 0:
-            cnt += 1
-    return cnt
+    _, _, overlap = overlaps(data)
+    return int(np.sum(overlap > 0))
 
 
 def test_part1():
@@ -52,7 +39,7 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day=4, year=2022)
+    data = inputs.get_data(day=4, year=2022)
     print("Running for day 4 of year 2022")
     print("Part 1 solution:", part1(data))
     print("Part 2 solution:", part2(data))
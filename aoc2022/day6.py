@@ -1,4 +1,4 @@
-import aocd
+from aoctool import inputs
 
 TEST_DATA = """mjqjpqmgbljsphdztnvjfqwrcgsmlb"""
 TEST_PART1_RESULT = 7
@@ -30,7 +30,7 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day=6, year=2022)
+    data = inputs.get_data(day=6, year=2022)
     print("Running for day 6 of year 2022")
     print("Part 1 solution:", part1(data))
     print("Part 2 solution:", part2(data))
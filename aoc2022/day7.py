@@ -4,7 +4,7 @@ import dataclasses
 from collections import defaultdict
 from typing import Callable
 
-import aocd
+from aoctool import inputs
 
 TEST_DATA = """$ cd /
 $ ls
@@ -120,7 +120,7 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day=7, year=2022)
+    data = inputs.get_data(day=7, year=2022)
     print("Running for day 7 of year 2022")
     print("Part 1 solution:", part1(data))
     print("Part 2 solution:", part2(data))
@@ -1,5 +1,5 @@
-import aocd
 import numpy as np
+from aoctool import inputs
 
 TEST_DATA = """30373
 25512
@@ -66,7 +66,7 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day=8, year=2022)
+    data = inputs.get_data(day=8, year=2022)
     print("Running for day 8 of year 2022")
     print("Part 1 solution:", part1(data))
     print("Part 2 solution:", part2(data))
@@ -0,0 +1,352 @@
+"""Cellular automata on dense grids or sparse sets of live cells.
+
+An `Automaton` holds the current generation and steps it with a rule:
+
+- `CountRule`, where the next state of a cell is looked up from its state and the number
+  of its neighbours in a counted state (Conway's life and its variants, on square,
+  hexagonal or N-dimensional grids, see `aoctool.grid.offsets`);
+- `LookupRule`, where it is looked up from a weighted sum over the `3 x ... x 3` block
+  around the cell, e.g. the bit pattern of the block;
+- any other `Rule` subclass, which writes the next generation itself.
+
+The dense backend keeps two padded arrays and alternates between them. Before each step
+the one-cell border is refreshed from the background value (or from the opposite edge on
+a torus), and the arrays grow when live cells reach the border. Binary count rules
+started from a sparse seed run on a set of live cells instead. Generations are hashed,
+so that fixed points and cycles are detected and long runs skip whole periods.
+"""
+
+import hashlib
+import itertools
+from typing import Callable
+
+import numpy as np
+
+from . import grid
+
+# seeds with fewer live cells than this fraction of their bounding box run on sets
+SPARSE_DENSITY = 0.02
+# cells added on every side when live cells reach the border
+GROWTH = 4
+
+
+def interior(padded: np.ndarray) -> np.ndarray:
+    """View of a padded array without its one-cell border."""
+    return padded[(slice(1, -1),) * padded.ndim]
+
+
+class Rule:
+    """Computes the next generation on a dense grid.
+
+    `padded` holds the current generation with a border of one cell, and `out` is the
+    array receiving the next generation. Rules whose next generation does not only depend
+    on the current one, e.g. because they count events, must set `pure = False`, which
+    disables cycle detection.
+    """
+
+    pure = True
+
+    def __call__(self, padded: np.ndarray, out: np.ndarray):
+        raise NotImplementedError
+
+    def next_fill(self, fill):
+        """Background state of the next generation."""
+        return fill
+
+
+class CountRule(Rule):
+    def __init__(self, table, neighbours: int = 8, counted: int = 1):
+        """`table[state, count]` is the next state of a cell in `state` with `count`
+        neighbours in the `counted` state."""
+        self.table = np.asarray(table)
+        self.neighbours = neighbours
+        self.counted = counted
+
+    @classmethod
+    def life(cls, born=(3,), survive=(2, 3), neighbours: int = 8) -> "CountRule":
+        """Binary rule: dead cells come alive with a `born` count of live neighbours, and
+        live cells stay alive with a `survive` count."""
+        table = np.zeros((2, neighbours + 1), dtype=np.uint8)
+        table[0, list(born)] = 1
+        table[1, list(survive)] = 1
+        return cls(table, neighbours)
+
+    def counts(self, padded: np.ndarray) -> np.ndarray:
+        counted = padded == self.counted
+        # 3 ** ndim - 1 neighbours overflow bytes from 6 dimensions on
+        dtype = np.min_scalar_type(self.neighbours)
+        counts = np.zeros(tuple(n - 2 for n in padded.shape), dtype=dtype)
+        for move in grid.offsets(self.neighbours, padded.ndim):
+            counts += grid.shifted(counted, move)
+        return counts
+
+    def __call__(self, padded: np.ndarray, out: np.ndarray):
+        out[...] = self.table[interior(padded), self.counts(padded)]
+
+    def next_fill(self, fill):
+        return self.table[fill, self.neighbours if fill == self.counted else 0].item()
+
+
+class LookupRule(Rule):
+    def __init__(self, weights, table):
+        """`table[code]` is the next state of a cell, where `code` is the sum of the
+        states of the `3 x ... x 3` block around it multiplied by `weights`."""
+        self.weights = np.asarray(weights)
+        self.table = np.asarray(table)
+
+    def __call__(self, padded: np.ndarray, out: np.ndarray):
+        code = np.zeros(out.shape, dtype=np.int64)
+        for move in itertools.product((-1, 0, 1), repeat=padded.ndim):
+            if weight := self.weights[tuple(d + 1 for d in move)]:
+                code += weight * grid.shifted(padded, move)
+        out[...] = self.table[code]
+
+    def next_fill(self, fill):
+        return self.table[int(self.weights.sum()) * fill].item()
+
+
+class Automaton:
+    def __init__(
+        self,
+        cells: np.ndarray,
+        rule: Rule,
+        fill=0,
+        boundary: str = "grow",
+        backend: str = "auto",
+    ):
+        """Automaton started from `cells`, surrounded by cells in the `fill` state.
+
+        With the `"grow"` boundary the grid is infinite, with `"fixed"` cells outside
+        stay in the `fill` state, and with `"wrap"` the grid is a torus. The backend is
+        `"dense"`, `"sparse"` or `"auto"`.
+        """
+        cells = np.asarray(cells)
+        self.rule = rule
+        self.fill = fill
+        self.boundary = boundary
+        self.ndim = cells.ndim
+        self.generation = 0
+        self.cycle: tuple[int, int] | None = None
+        self._seen: dict[bytes, int] = {}
+
+        if backend == "auto":
+            sparse = self._supports_sparse(cells) and (
+                np.count_nonzero(cells) < SPARSE_DENSITY * cells.size
+            )
+            backend = "sparse" if sparse else "dense"
+        elif backend == "sparse" and not self._supports_sparse(cells):
+            raise ValueError(
+                "the sparse backend needs a binary count rule on an infinite grid"
+            )
+        self.backend = backend
+
+        if backend == "sparse":
+            self._live = set(map(tuple, np.argwhere(cells).tolist()))
+        else:
+            self._buffers = [grid.pad(cells, 1, fill), grid.pad(cells, 1, fill)]
+            self._origin = [0] * self.ndim
+        self._remember()
+
+    def _supports_sparse(self, cells: np.ndarray) -> bool:
+        return (
+            isinstance(self.rule, CountRule)
+            and self.rule.table.shape[0] == 2
+            and self.rule.counted == 1
+            and self.rule.table[0, 0] == 0
+            and self.fill == 0
+            and self.boundary == "grow"
+            and np.isin(cells, (0, 1)).all()
+        )
+
+    @property
+    def cells(self) -> np.ndarray:
+        """Current generation: a view of the grid, or the bounding box of live cells."""
+        if self.backend == "dense":
+            return interior(self._buffers[0])
+
+        if not self._live:
+            return np.zeros((0,) * self.ndim, dtype=np.uint8)
+        coords = np.array(list(self._live))
+        coords -= coords.min(axis=0)
+        cells = np.zeros(coords.max(axis=0) + 1, dtype=np.uint8)
+        cells[tuple(coords.T)] = 1
+        return cells
+
+    def count(self, state=1) -> int:
+        """Number of cells in `state` (other than the infinite background)."""
+        if self.backend == "sparse":
+            return len(self._live) if state == 1 else 0
+        return int(np.count_nonzero(self.cells == state))
+
+    @property
+    def stable(self) -> bool:
+        """Whether a fixed point was reached."""
+        return self.cycle is not None and self.cycle[1] == 1
+
+    def _remember(self):
+        if not self.rule.pure or self.cycle is not None:
+            return
+        digest = hashlib.blake2b(digest_size=16)
+        if self.backend == "sparse":
+            digest.update(np.array(sorted(self._live), dtype=np.int64).tobytes())
+        else:
+            # on an infinite grid the bounding box of the cells is hashed, so that growing
+            # the grid does not hide a repeated generation
+            if self.boundary == "grow":
+                box, corner = self._bounding_box()
+            else:
+                box, corner = self.cells, ()
+            digest.update(repr((box.shape, corner, self.fill)).encode())
+            digest.update(np.ascontiguousarray(box).tobytes())
+        key = digest.digest()
+
+        if key in self._seen:
+            self.cycle = (self._seen[key], self.generation - self._seen[key])
+        else:
+            self._seen[key] = self.generation
+
+    def _bounding_box(self) -> tuple[np.ndarray, tuple[int, ...]]:
+        """Smallest part of the grid holding all cells that differ from the background,
+        and the coordinates of its first corner."""
+        cells = self.cells
+        mask = cells != self.fill
+        if not mask.any():
+            return cells[(slice(0, 0),) * self.ndim], ()
+        bounds = []
+        for axis in range(self.ndim):
+            along = np.flatnonzero(
+                mask.any(axis=tuple(a for a in range(self.ndim) if a != axis))
+            )
+            bounds.append((along[0], along[-1] + 1))
+        box = cells[tuple(slice(lo, hi) for lo, hi in bounds)]
+        return box, tuple(int(o + lo) for o, (lo, _) in zip(self._origin, bounds))
+
+    def _grow(self):
+        current = interior(self._buffers[0])
+        edges = [
+            current[(slice(None),) * axis + (index,)]
+            for axis in range(current.ndim)
+            for index in (0, -1)
+        ]
+        if all(np.all(edge == self.fill) for edge in edges):
+            return
+        self._buffers = [grid.pad(current, 1 + GROWTH, self.fill) for _ in range(2)]
+        self._origin = [o - GROWTH for o in self._origin]
+
+    def _refresh_border(self):
+        padded = self._buffers[0]
+        for axis in range(padded.ndim):
+            prefix = (slice(None),) * axis
+            if self.boundary == "wrap":
+                padded[prefix + (0,)] = padded[prefix + (-2,)]
+                padded[prefix + (-1,)] = padded[prefix + (1,)]
+            else:
+                padded[prefix + (0,)] = self.fill
+                padded[prefix + (-1,)] = self.fill
+
+    def _sparse_step(self):
+        cells = np.array(list(self._live), dtype=np.int64)
+        moves = np.array(grid.offsets(self.rule.neighbours, self.ndim))
+        neighbours = (cells[:, None, :] + moves[None, :, :]).reshape(-1, self.ndim)
+        # live cells are added once more so that isolated ones are candidates as well
+        candidates, counts = np.unique(
+            np.concatenate((neighbours, cells)), axis=0, return_counts=True
+        )
+        states = np.fromiter(
+            (cell in self._live for cell in map(tuple, candidates.tolist())),
+            dtype=np.intp,
+            count=len(candidates),
+        )
+        alive = self.rule.table[states, counts - states].astype(bool)
+        self._live = set(map(tuple, candidates[alive].tolist()))
+
+    def step(self):
+        if self.backend == "sparse":
+            if self._live:
+                self._sparse_step()
+        else:
+            if self.boundary == "grow":
+                self._grow()
+            self._refresh_border()
+            self.rule(self._buffers[0], interior(self._buffers[1]))
+            self.fill = self.rule.next_fill(self.fill)
+            self._buffers.reverse()
+        self.generation += 1
+        self._remember()
+
+    def run(
+        self,
+        generations: int | None = None,
+        until: Callable[["Automaton"], bool] | None = None,
+    ) -> int:
+        """Step `generations` times, or until `until` holds or a generation repeats.
+
+        Once a cycle is found, whole periods are skipped. Returns the generation reached.
+        """
+        target = None if generations is None else self.generation + generations
+        while target is None or self.generation < target:
+            self.step()
+            if until is not None and until(self):
+                break
+            if self.cycle is not None:
+                if target is None:
+                    break
+                period = self.cycle[1]
+                self.generation += (target - self.generation) // period * period
+        return self.generation
+
+
+def test_life():
+    glider = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+    for backend in ("dense", "sparse"):
+        world = Automaton(glider, CountRule.life(), backend=backend)
+        assert world.run(4) == 4 and world.count() == 5
+        live = np.argwhere(world.cells)
+        lo, hi = live.min(axis=0), live.max(axis=0) + 1
+        assert world.cells[lo[0] : hi[0], lo[1] : hi[1]].tolist() == glider.tolist()
+        assert world.cycle is None
+
+    blinker = Automaton(np.ones((1, 3), dtype=np.uint8), CountRule.life())
+    assert blinker.run(10**9) == 10**9 and blinker.cycle == (0, 2)
+    assert blinker.count() == 3 and blinker.cells.shape[0] > 1
+
+    block = Automaton(np.ones((2, 2), dtype=np.uint8), CountRule.life(), backend="sparse")
+    assert block.run() == 1 and block.stable
+
+
+def test_higher_dimensions():
+    seed = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+    world = Automaton(seed[:, :, None], CountRule.life(neighbours=26))
+    world.run(6)
+    assert world.count() == 112
+    world = Automaton(seed[:, :, None], CountRule.life(neighbours=26), backend="sparse")
+    world.run(6)
+    assert world.count() == 112
+
+
+def test_counts_do_not_overflow():
+    rule = CountRule.life(neighbours=3**6 - 1)
+    counts = rule.counts(np.ones((3,) * 6, dtype=np.uint8))
+    assert counts.shape == (1,) * 6 and counts.item() == 728
+    # only the centre of an all-live block has all its neighbours alive
+    rule = CountRule.life(born=(), survive=(728,), neighbours=728)
+    world = Automaton(np.ones((3,) * 6, dtype=np.uint8), rule)
+    world.run(1)
+    assert world.count() == 1
+
+
+def test_lookup_rule():
+    # every cell becomes the complement of the previous background, which flips
+    rule = LookupRule(np.ones((3, 3), dtype=int), [1] + [0] * 9)
+    world = Automaton(np.zeros((2, 2), dtype=np.uint8), rule, boundary="fixed")
+    world.run(1)
+    assert world.fill == 1 and world.cells.tolist() == [[1, 1], [1, 1]]
+    world.run(1)
+    assert world.fill == 0 and world.count() == 0
+
+
+def test_wrap():
+    rule = CountRule.life(born=(1,), survive=(), neighbours=4)
+    world = Automaton(np.array([[1, 0, 0, 0]], dtype=np.uint8), rule, boundary="wrap")
+    world.run(1)
+    assert world.cells.tolist() == [[0, 1, 0, 1]]
@@ -0,0 +1,133 @@
+import dataclasses
+import functools
+import math
+import pathlib
+import platform
+import statistics
+import time
+import traceback
+from typing import Callable
+
+from .days import DayModule, find_parts
+from .inputs import default_store
+from .profiling import profile_call
+
+
+@dataclasses.dataclass
+class BenchResult:
+    year: int
+    day: int
+    part: str
+    function: str
+    status: str = "ok"
+    result: str | None = None
+    error: str | None = None
+    timings: list[float] = dataclasses.field(default_factory=list)
+    peak_memory: int | None = None
+    profile: str | None = None
+
+    @property
+    def median(self) -> float | None:
+        return statistics.median(self.timings) if self.timings else None
+
+    @property
+    def p95(self) -> float | None:
+        if not self.timings:
+            return None
+        # nearest-rank percentile, meaningful even for a handful of samples
+        timings = sorted(self.timings)
+        return timings[math.ceil(0.95 * len(timings)) - 1]
+
+    def to_dict(self) -> dict:
+        return {
+            **dataclasses.asdict(self),
+            "min": min(self.timings) if self.timings else None,
+            "mean": statistics.mean(self.timings) if self.timings else None,
+            "median": self.median,
+            "p95": self.p95,
+        }
+
+
+def function_name(func: Callable) -> str:
+    if isinstance(func, functools.partial):
+        args = ", ".join(f"{k}={v!r}" for k, v in func.keywords.items())
+        return f"{function_name(func.func)}({args})"
+    return getattr(func, "__name__", repr(func))
+
+
+def format_error(exc: BaseException) -> str:
+    return "".join(traceback.format_exception_only(exc)).strip()
+
+
+def get_input(year: int, day: int) -> str:
+    # benchmarks never touch the network, inputs must be fetched beforehand
+    return default_store().get(year, day)
+
+
+def time_function(
+    func: Callable[[str], object], data: str, warmup: int, repeat: int
+) -> tuple[object, list[float]]:
+    """Call `func(data)` `warmup` times untimed, then `repeat` times with `perf_counter`."""
+    result = None
+    for _ in range(warmup):
+        result = func(data)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(data)
+        timings.append(time.perf_counter() - start)
+
+    return result, timings
+
+
+def bench_day(
+    day_module: DayModule,
+    warmup: int = 1,
+    repeat: int = 5,
+    get_input: Callable[[int, int], str] = get_input,
+    profile_dir: pathlib.Path | None = None,
+) -> list[BenchResult]:
+    year, day = day_module.year, day_module.day
+
+    try:
+        module = day_module.load()
+        parts = find_parts(module, day)
+        data = get_input(year, day) if parts else ""
+    except Exception as exc:
+        return [BenchResult(year, day, "", "", status="error", error=format_error(exc))]
+
+    results = []
+    for part, func in parts.items():
+        res = BenchResult(year, day, part, function_name(func))
+        try:
+            value, res.timings = time_function(func, data, warmup, repeat)
+            res.result = str(value)
+            if profile_dir is not None:
+                # profiled separately, so that the overhead does not skew the timings
+                _, report = profile_call(
+                    func, data, name=f"{year}_day{day}_{part}", output_dir=profile_dir
+                )
+                res.peak_memory = report.peak_memory
+                res.profile = str(report.hotspots)
+        except Exception as exc:
+            res.status = "error"
+            res.error = format_error(exc)
+        results.append(res)
+    return results
+
+
+def make_report(results: list[BenchResult], warmup: int, repeat: int) -> dict:
+    ok = [r for r in results if r.status == "ok"]
+    total = sum(r.median for r in ok)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "warmup": warmup,
+        "repeat": repeat,
+        "total_median": total,
+        "results": [
+            {**r.to_dict(), "share": r.median / total if r.status == "ok" and total else None}
+            for r in results
+        ],
+    }
@@ -0,0 +1,188 @@
+"""On-disk memoization for expensive results and intermediates.
+
+Entries are keyed on the function's qualified name, a hash of its source code (plus an
+optional explicit version) and a hash of its inputs, so that editing a function
+invalidates its entries. Writes are atomic and the cache directory is kept below a size
+bound by evicting the least recently used entries, which makes it safe to share
+between concurrent processes.
+"""
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import os
+import pathlib
+import pickle
+from typing import Any, Callable
+
+from .fsutil import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+DEFAULT_ROOT = pathlib.Path(
+    os.environ.get("AOCTOOL_CACHE", pathlib.Path.home() / ".cache" / "aoctool" / "results")
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_MISSING = object()
+
+
+class ResultCache:
+    def __init__(
+        self, root: pathlib.Path | str = DEFAULT_ROOT, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.root / key[:2] / f"{key}.pickle"
+
+    @contextlib.contextmanager
+    def _lock(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as fp:
+            if fcntl is not None:
+                fcntl.flock(fp, fcntl.LOCK_EX)
+            yield
+
+    def get(self, key: str) -> Any:
+        """Return the cached value or `_MISSING`, marking the entry as recently used."""
+        path = self._path(key)
+        try:
+            value = pickle.loads(path.read_bytes())
+            os.utime(path)
+        except FileNotFoundError:
+            # possibly evicted by another process in the meantime
+            return _MISSING
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            path.unlink(missing_ok=True)
+            return _MISSING
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        atomic_write(self._path(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock():
+            entries = []
+            for path in self.root.glob("*/*.pickle"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock():
+            for path in self.root.glob("*/*.pickle"):
+                path.unlink(missing_ok=True)
+
+
+_default_cache = None
+
+
+def default_cache() -> ResultCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def code_version(func: Callable) -> str:
+    try:
+        code = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        code = func.__code__.co_code
+    return hashlib.sha256(code).hexdigest()
+
+
+def memoize(
+    func: Callable | None = None,
+    *,
+    key: Callable[..., Any] | None = None,
+    version: str = "",
+    cache: ResultCache | None = None,
+):
+    """Cache a function's results on disk.
+
+    By default, all arguments are pickled to compute the input hash. `key` may be
+    provided to hash something cheaper or more stable instead (e.g. the raw puzzle
+    input rather than the parsed data), and is called with the same arguments as the
+    function. `version` can be bumped to invalidate entries when code the function
+    depends on changes.
+    """
+
+    if func is None:
+        return functools.partial(memoize, key=key, version=version, cache=cache)
+
+    func_version = code_version(func) + version
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key_data = key(*args, **kwargs) if key is not None else (args, sorted(kwargs.items()))
+        digest = hashlib.sha256()
+        digest.update(f"{func.__module__}.{func.__qualname__}".encode())
+        digest.update(func_version.encode())
+        digest.update(pickle.dumps(key_data, protocol=pickle.HIGHEST_PROTOCOL))
+        cache_key = digest.hexdigest()
+
+        the_cache = cache if cache is not None else default_cache()
+        value = the_cache.get(cache_key)
+        if value is _MISSING:
+            value = func(*args, **kwargs)
+            the_cache.put(cache_key, value)
+        return value
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def test_memoize(tmp_path):
+    calls = []
+    cache = ResultCache(tmp_path)
+
+    @memoize(cache=cache)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(4) == 16
+    assert calls == [3, 4]
+
+
+def test_memoize_key(tmp_path):
+    calls = []
+
+    @memoize(key=lambda data, parsed: data, cache=ResultCache(tmp_path))
+    def count(data, parsed):
+        calls.append(data)
+        return len(parsed)
+
+    assert count("1,2,3", [1, 2, 3]) == 3
+    assert count("1,2,3", [1, 2, 3]) == 3
+    assert calls == ["1,2,3"]
+
+
+def test_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=3000)
+    for i in range(10):
+        cache.put(f"{i:064x}", b"x" * 1000)
+        os.utime(cache._path(f"{i:064x}"), (i, i))
+
+    assert cache.get(f"{0:064x}") is _MISSING
+    assert cache.get(f"{9:064x}") == b"x" * 1000
+    assert sum(p.stat().st_size for p in tmp_path.glob("*/*.pickle")) <= 3000
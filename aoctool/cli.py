@@ -1,10 +1,27 @@
+import dataclasses
 import datetime
+import json
 import os
 import pathlib
+import time
 
 import click
 
-TEMPLATE = '''import aocd
+from . import scaling
+from .bench import bench_day, format_error, make_report
+from .days import discover
+from .generators import GENERATORS
+from .history import Record, compare, default_history, find_run, machine_fingerprint
+from .importtime import measure_day
+from .inputs import default_store
+from .profiling import DEFAULT_OUTPUT_DIR
+from .runner import make_tasks, run_tasks
+from .scaling import scale_day
+from .variants import VariantMismatchError, find_groups
+
+TEMPLATE = '''import sys
+
+from aoctool import inputs, profiling
 
 TEST_DATA = """"""
 TEST_PART1_RESULT = None
@@ -30,10 +47,11 @@ def test_part2():
 
 
 def main() -> None:
-    data = aocd.get_data(day={day}, year={year})
+    profile = "--profile" in sys.argv[1:]
+    data = inputs.get_data(day={day}, year={year})
     print("Running for day {day} of year {year}")
-    print("Part 1 solution:", part1(data))
-    print("Part 2 solution:", part2(data))
+    print("Part 1 solution:", profiling.run_part(part1, data, "{year}_day{day}_part1", profile))
+    print("Part 2 solution:", profiling.run_part(part2, data, "{year}_day{day}_part2", profile))
 
 
 if __name__ == "__main__":
@@ -41,11 +59,15 @@ if __name__ == "__main__":
 '''
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option("-d", "--day", type=int)
 @click.option("-y", "--year", type=int)
 @click.option("-e", "--editor", type=str)
-def cli(day: int | None, year: int | None, editor: str | None):
+@click.pass_context
+def cli(ctx: click.Context, day: int | None, year: int | None, editor: str | None):
+    if ctx.invoked_subcommand is not None:
+        return
+
     today = datetime.date.today()
     if day is None:
         day = today.day
@@ -60,6 +82,386 @@ def cli(day: int | None, year: int | None, editor: str | None):
         os.system(f"{editor} {path.absolute()}")
 
 
+@cli.command()
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Restrict to year(s).")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Restrict to day(s).")
+@click.option("-w", "--warmup", type=int, default=1, show_default=True)
+@click.option("-r", "--repeat", type=int, default=5, show_default=True)
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=pathlib.Path))
+@click.option(
+    "--profile", is_flag=True, help="Also profile each part once (cProfile, memory)."
+)
+@click.option(
+    "--profile-dir",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    default=DEFAULT_OUTPUT_DIR,
+    show_default=True,
+)
+@click.option(
+    "--history/--no-history",
+    default=True,
+    show_default=True,
+    help="Record the timings in the benchmark history.",
+)
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Directory containing the aoc<year> directories.",
+)
+def bench(
+    years: tuple[int, ...],
+    days: tuple[int, ...],
+    warmup: int,
+    repeat: int,
+    output: pathlib.Path | None,
+    profile: bool,
+    profile_dir: pathlib.Path,
+    history: bool,
+    root: pathlib.Path,
+):
+    """Time every day's part functions and emit a JSON report."""
+
+    results = []
+    for day_module in discover(root, years, days):
+        for res in bench_day(
+            day_module,
+            warmup=warmup,
+            repeat=repeat,
+            profile_dir=profile_dir if profile else None,
+        ):
+            results.append(res)
+            if res.status == "ok":
+                msg = f"median {res.median * 1000:.2f}ms, p95 {res.p95 * 1000:.2f}ms"
+                if res.peak_memory is not None:
+                    msg += f", peak memory {res.peak_memory / 2**20:.2f}MiB"
+            else:
+                msg = res.error.splitlines()[-1]
+            click.echo(f"{res.year} day {res.day:2} {res.part:5}: {msg}", err=True)
+
+    if history:
+        records = [
+            Record(r.year, r.day, r.part, r.function, r.timings)
+            for r in results
+            if r.status == "ok"
+        ]
+        run_id = default_history().add_run("bench", records, root)
+        click.echo(f"recorded as run #{run_id}", err=True)
+
+    report = json.dumps(make_report(results, warmup, repeat), indent=2)
+    if output is None:
+        click.echo(report)
+    else:
+        output.write_text(report)
+
+
+@cli.command("history")
+@click.option("-n", "--limit", type=int, default=20, show_default=True)
+@click.option("--all-machines", is_flag=True, help="Include runs from other machines.")
+def history_(limit: int, all_machines: bool):
+    """List recorded benchmark runs, most recent first."""
+
+    machine = None if all_machines else machine_fingerprint()
+    for run in default_history().runs(machine)[:limit]:
+        click.echo(run.label)
+
+
+@cli.command("compare")
+@click.argument("baseline", required=False)
+@click.argument("candidate", required=False)
+@click.option("--source", type=click.Choice(["bench", "pytest"]), default="bench")
+@click.option(
+    "--threshold", type=float, default=0.05, show_default=True, help="Minimum relative change."
+)
+@click.option(
+    "--alpha", type=float, default=0.05, show_default=True, help="Significance level."
+)
+@click.option("-a", "--all", "show_all", is_flag=True, help="Also list unchanged parts.")
+def compare_(
+    baseline: str | None,
+    candidate: str | None,
+    source: str,
+    threshold: float,
+    alpha: float,
+    show_all: bool,
+):
+    """Flag significant slowdowns between two benchmark runs.
+
+    BASELINE and CANDIDATE are run ids (see `aoctool history`) or commit prefixes. By
+    default, the last two runs of this machine are compared.
+    """
+
+    history = default_history()
+    runs = history.runs(machine_fingerprint(), source)
+    try:
+        candidate_run = find_run(runs, candidate) if candidate else runs[0]
+        older = [run for run in runs if run.id < candidate_run.id]
+        baseline_run = find_run(runs, baseline) if baseline else older[0]
+    except (LookupError, IndexError):
+        raise click.ClickException("not enough matching runs, see `aoctool history`")
+    if baseline_run.python != candidate_run.python:
+        click.echo("warning: the runs used different Python versions", err=True)
+
+    click.echo(f"baseline:  {baseline_run.label}")
+    click.echo(f"candidate: {candidate_run.label}")
+    comparisons = compare(
+        history.records(baseline_run.id),
+        history.records(candidate_run.id),
+        threshold,
+        alpha,
+    )
+    for c in comparisons:
+        if c.status == "same" and not show_all:
+            continue
+        name = f"{c.year} day {c.day:2} {c.part}" if c.year else c.part
+        if c.ratio is None:
+            msg = c.status
+        else:
+            p_value = "n/a" if c.p_value is None else f"{c.p_value:.3f}"
+            msg = (
+                f"{c.baseline * 1000:.3f}ms -> {c.candidate * 1000:.3f}ms "
+                f"({c.ratio - 1:+.1%}, p={p_value}) {c.status}"
+            )
+        click.echo(f"{name} {c.function}: {msg}")
+
+    slower = [c for c in comparisons if c.status == "slower"]
+    if slower:
+        raise click.ClickException(f"{len(slower)} significant slowdown(s)")
+
+
+@cli.command()
+@click.option("-a", "--all", "run_all", is_flag=True, help="Run every year and day.")
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Restrict to year(s).")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Restrict to day(s).")
+@click.option("-j", "--jobs", type=int, default=os.cpu_count(), show_default=True)
+@click.option("-t", "--timeout", type=float, help="Per-part timeout in seconds.")
+@click.option("--json", "as_json", is_flag=True, help="Stream results as JSON lines.")
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Directory containing the aoc<year> directories.",
+)
+def run(
+    run_all: bool,
+    years: tuple[int, ...],
+    days: tuple[int, ...],
+    jobs: int,
+    timeout: float | None,
+    as_json: bool,
+    root: pathlib.Path,
+):
+    """Solve many days in parallel, streaming results as they complete."""
+
+    if not run_all and not years and not days:
+        raise click.UsageError("select days with --year/--day, or pass --all")
+
+    start = time.perf_counter()
+    cumulative = 0.0
+    for res in run_tasks(make_tasks(discover(root, years, days)), jobs, timeout):
+        cumulative += res.duration or 0.0
+        if as_json:
+            click.echo(json.dumps(dataclasses.asdict(res)))
+        elif res.status != "skipped":
+            match res.status:
+                case "ok":
+                    msg = f"{res.result} ({res.duration:.2f}s)"
+                case "timeout":
+                    msg = f"timed out after {res.duration:.0f}s"
+                case _:
+                    msg = res.error.splitlines()[-1]
+            click.echo(f"{res.year} day {res.day:2} {res.part}: {msg}")
+
+    click.echo(
+        f"wall time: {time.perf_counter() - start:.2f}s, cumulative: {cumulative:.2f}s",
+        err=True,
+    )
+
+
+@cli.command()
+@click.option("-a", "--all", "fetch_all", is_flag=True, help="Fetch every year and day.")
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Restrict to year(s).")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Restrict to day(s).")
+@click.option("-f", "--force", is_flag=True, help="Download inputs even if already stored.")
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Directory containing the aoc<year> directories.",
+)
+def fetch(
+    fetch_all: bool,
+    years: tuple[int, ...],
+    days: tuple[int, ...],
+    force: bool,
+    root: pathlib.Path,
+):
+    """Download puzzle inputs into the local input store."""
+
+    if not fetch_all and not years and not days:
+        raise click.UsageError("select days with --year/--day, or pass --all")
+
+    store = default_store()
+    for day_module in discover(root, years, days):
+        store.fetch(day_module.year, day_module.day, force=force)
+        digest = store.digest(day_module.year, day_module.day)
+        click.echo(f"{day_module.year} day {day_module.day:2}: {digest[:12]}")
+
+
+@cli.command()
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Restrict to year(s).")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Restrict to day(s).")
+@click.option(
+    "-s", "--size", "sizes", type=int, multiple=True, help="Input size(s) [generator default]."
+)
+@click.option("-r", "--repeat", type=int, default=3, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--max-time", type=float, help="Stop growing a part's input past this time (s).")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=pathlib.Path))
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Directory containing the aoc<year> directories.",
+)
+def scale(
+    years: tuple[int, ...],
+    days: tuple[int, ...],
+    sizes: tuple[int, ...],
+    repeat: int,
+    seed: int,
+    max_time: float | None,
+    output: pathlib.Path | None,
+    root: pathlib.Path,
+):
+    """Measure runtime and memory against synthetic input size."""
+
+    points = []
+    for day_module in discover(root, years, days):
+        generator = GENERATORS.get((day_module.year, day_module.day))
+        if generator is None:
+            continue
+        click.echo(
+            f"{day_module.year} day {day_module.day:2} ({generator.description})", err=True
+        )
+        for point in scale_day(day_module, generator, sizes, repeat, seed, max_time):
+            points.append(point)
+            if point.status == "ok":
+                msg = f"{point.median * 1000:.2f}ms, peak memory {point.peak_memory / 2**20:.2f}MiB"
+            else:
+                msg = point.error.splitlines()[-1]
+            click.echo(f"  {point.part} size {point.size}: {msg}", err=True)
+
+    report = json.dumps(scaling.make_report(points, GENERATORS), indent=2)
+    if output is None:
+        click.echo(report)
+    else:
+        output.write_text(report)
+
+
+@cli.command()
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Restrict to year(s).")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Restrict to day(s).")
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Directory containing the aoc<year> directories.",
+)
+def warm(years: tuple[int, ...], days: tuple[int, ...], root: pathlib.Path):
+    """Precompile numba kernels into their on-disk cache."""
+
+    for day_module in discover(root, years, days):
+        module = day_module.load()
+        if not callable(getattr(module, "warmup", None)):
+            continue
+
+        start = time.perf_counter()
+        try:
+            module.warmup()
+            msg = f"{time.perf_counter() - start:.2f}s"
+        except Exception as exc:
+            msg = format_error(exc).splitlines()[-1]
+        click.echo(f"{day_module.year} day {day_module.day:2}: {msg}")
+
+
+@cli.command("variants")
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Restrict to year(s).")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Restrict to day(s).")
+@click.option("-w", "--warmup", type=int, default=1, show_default=True)
+@click.option("-r", "--repeat", type=int, default=5, show_default=True)
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Directory containing the aoc<year> directories.",
+)
+def variants_(
+    years: tuple[int, ...], days: tuple[int, ...], warmup: int, repeat: int, root: pathlib.Path
+):
+    """Cross-check alternative implementations and time them to pick the default.
+
+    Groups with a variant marked `default=True` keep it unless created with `auto=True`.
+    """
+
+    mismatches = []
+    for day_module in discover(root, years, days):
+        for group in find_groups(day_module.load()):
+            label = f"{day_module.year} day {day_module.day:2} {group.name}"
+            try:
+                group.check()
+            except VariantMismatchError as exc:
+                mismatches.append(label)
+                click.echo(f"{label}: {exc}", err=True)
+                continue
+
+            timings = group.benchmark(warmup, repeat)
+            click.echo(f"{label}: default {group.default.name}")
+            for name, timing in timings.items():
+                click.echo(f"  {name:30} {timing * 1000:10.3f}ms")
+
+    if mismatches:
+        raise click.ClickException(f"variants disagree: {', '.join(mismatches)}")
+
+
+@cli.command()
+@click.option("-y", "--year", "years", type=int, multiple=True, help="Restrict to year(s).")
+@click.option("-d", "--day", "days", type=int, multiple=True, help="Restrict to day(s).")
+@click.option("-r", "--repeat", type=int, default=3, show_default=True)
+@click.option("--top", type=int, default=3, show_default=True, help="Packages listed per day.")
+@click.option("--budget", type=float, help="Fail if a day takes longer to import (ms).")
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Directory containing the aoc<year> directories.",
+)
+def importtime(
+    years: tuple[int, ...],
+    days: tuple[int, ...],
+    repeat: int,
+    top: int,
+    budget: float | None,
+    root: pathlib.Path,
+):
+    """Measure how long each day module takes to import."""
+
+    over_budget = []
+    for day_module in discover(root, years, days):
+        try:
+            res = measure_day(day_module, repeat)
+        except RuntimeError as exc:
+            click.echo(f"{day_module.year} day {day_module.day:2}: {exc}", err=True)
+            continue
+
+        packages = ", ".join(f"{name} {t * 1000:.1f}ms" for name, t in res.top(top))
+        click.echo(f"{res.year} day {res.day:2}: {res.total * 1000:6.1f}ms ({packages})")
+        if budget is not None and res.total * 1000 > budget:
+            over_budget.append(f"{res.year} day {res.day}")
+
+    if over_budget:
+        raise click.ClickException(f"over the {budget}ms budget: {', '.join(over_budget)}")
+
+
 def main():
     cli()
-
@@ -0,0 +1,111 @@
+import dataclasses
+import importlib.util
+import inspect
+import pathlib
+import re
+import sys
+from types import ModuleType
+from typing import Callable, Iterable
+
+DAY_FILE_EXPR = re.compile(r"^day(\d+)\.py$")
+YEAR_DIR_EXPR = re.compile(r"^aoc(\d{4})$")
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class DayModule:
+    year: int
+    day: int
+    path: pathlib.Path = dataclasses.field(compare=False)
+
+    @property
+    def name(self) -> str:
+        return f"aoc{self.year}_day{self.day}"
+
+    def load(self) -> ModuleType:
+        """Import the day module from its path.
+
+        The year directory is added to `sys.path` so that sibling imports such as
+        `from aoc_utils import ...` keep working.
+        """
+        if self.name in sys.modules:
+            return sys.modules[self.name]
+
+        year_dir = str(self.path.parent.absolute())
+        if year_dir not in sys.path:
+            sys.path.insert(0, year_dir)
+
+        spec = importlib.util.spec_from_file_location(self.name, self.path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[self.name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[self.name]
+            raise
+        return module
+
+
+def discover(
+    root: pathlib.Path, years: Iterable[int] = (), days: Iterable[int] = ()
+) -> list[DayModule]:
+    """Find all `aoc<year>/day<N>.py` files below `root`, sorted by year and day."""
+    years = set(years)
+    days = set(days)
+    modules = []
+    for year_dir in root.iterdir():
+        if not year_dir.is_dir() or not (mo := YEAR_DIR_EXPR.match(year_dir.name)):
+            continue
+        year = int(mo.group(1))
+        if years and year not in years:
+            continue
+
+        for path in year_dir.iterdir():
+            if not (mo := DAY_FILE_EXPR.match(path.name)):
+                continue
+            day = int(mo.group(1))
+            if days and day not in days:
+                continue
+            modules.append(DayModule(year, day, path))
+
+    return sorted(modules)
+
+
+def _accepts_single_argument(func: Callable) -> bool:
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        return True
+
+    required = [
+        p
+        for p in sig.parameters.values()
+        if p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+    ]
+    return len(required) == 1
+
+
+def find_parts(module: ModuleType, day: int) -> dict[str, Callable[[str], object]]:
+    """Return the part functions of a day module, keyed by "part1"/"part2".
+
+    A module may define a `PARTS` dict mapping part names to callables taking the raw
+    puzzle input, which takes precedence. Otherwise, the usual naming conventions are
+    looked up: `part1`/`part2`, `dayN_part1`/`dayN_part2` and `solve_dayN`/
+    `solve_dayN_part2`. Functions which cannot be called with the puzzle input alone are
+    ignored.
+    """
+    if (parts := getattr(module, "PARTS", None)) is not None:
+        return dict(parts)
+
+    candidates = {
+        "part1": ["part1", f"day{day}_part1", f"solve_day{day}"],
+        "part2": ["part2", f"day{day}_part2", f"solve_day{day}_part2"],
+    }
+
+    parts = {}
+    for part, names in candidates.items():
+        for name in names:
+            func = getattr(module, name, None)
+            if callable(func) and _accepts_single_argument(func):
+                parts[part] = func
+                break
+    return parts
@@ -0,0 +1,16 @@
+import os
+import pathlib
+import tempfile
+
+
+def atomic_write(path: pathlib.Path, data: bytes) -> None:
+    """Write `data` to `path` so that concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
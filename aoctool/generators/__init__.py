@@ -0,0 +1,93 @@
+"""Synthetic, arbitrarily large puzzle inputs for scaling benchmarks.
+
+Each generator is registered for a (year, day) and builds a valid input of a given
+`size` from a seeded `random.Random`. What `size` means (number of lines, grid side,
+coordinate range...) depends on the puzzle and is stated in the generator's
+description. Parts whose work is driven by an argument rather than by the input (e.g.
+number of turns) may receive size-dependent keyword arguments through `part_kwargs`.
+"""
+
+import dataclasses
+import random
+from typing import Callable
+
+GeneratorFunc = Callable[[int, random.Random], str]
+
+
+@dataclasses.dataclass(frozen=True)
+class Generator:
+    year: int
+    day: int
+    func: GeneratorFunc
+    description: str
+    sizes: tuple[int, ...]
+    part_kwargs: Callable[[int], dict[str, dict]] | None = None
+
+    def generate(self, size: int, seed: int = 0) -> str:
+        return self.func(size, random.Random(seed))
+
+    def kwargs(self, size: int, part: str) -> dict:
+        if self.part_kwargs is None:
+            return {}
+        return self.part_kwargs(size).get(part, {})
+
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def register(
+    year: int,
+    day: int,
+    description: str,
+    sizes: tuple[int, ...],
+    part_kwargs: Callable[[int], dict[str, dict]] | None = None,
+) -> Callable[[GeneratorFunc], GeneratorFunc]:
+    def decorator(func: GeneratorFunc) -> GeneratorFunc:
+        GENERATORS[(year, day)] = Generator(year, day, func, description, sizes, part_kwargs)
+        return func
+
+    return decorator
+
+
+def get_generator(year: int, day: int) -> Generator:
+    return GENERATORS[(year, day)]
+
+
+# populate the registry
+from . import y2020, y2021, y2022  # noqa: E402, F401
+
+
+def test_generators_deterministic():
+    for generator in GENERATORS.values():
+        size = min(generator.sizes)
+        data = generator.generate(size, seed=1)
+        assert data and data == generator.generate(size, seed=1)
+
+
+def _day_parts(year: int, day: int) -> dict:
+    import pathlib
+
+    from ..days import discover, find_parts
+
+    (day_module,) = discover(pathlib.Path(__file__).parents[2], years=[year], days=[day])
+    return find_parts(day_module.load(), day)
+
+
+def test_generators_solved():
+    # the smallest inputs, as some days take minutes on the largest ones
+    for (year, day), generator in GENERATORS.items():
+        size = min(generator.sizes)
+        data = generator.generate(size)
+        for part, func in _day_parts(year, day).items():
+            assert func(data, **generator.kwargs(size, part)) is not None, (year, day, part)
+
+
+def test_seat_layouts_settle():
+    # random seat layouts used to alternate forever, which the day reports as an error
+    generator = get_generator(2020, 11)
+    parts = _day_parts(2020, 11)
+    for size in generator.sizes:
+        for seed in range(5):
+            data = generator.generate(size, seed)
+            for func in parts.values():
+                func(data)
@@ -0,0 +1,124 @@
+import random
+
+from . import register
+
+HEX_DIRECTIONS = ("e", "se", "sw", "w", "nw", "ne")
+
+
+@register(2020, 1, "number of expense entries", (50, 100, 200))
+def day1(size: int, rng: random.Random) -> str:
+    # values above 1010 cannot pair up, so the planted pair and triple are the answers
+    planted = [1000, 1020, 500, 600, 920]
+    excluded = {2020 - p for p in planted}
+    entries = [e for e in range(1011, 2000) if e not in excluded]
+    entries = rng.choices(entries, k=size - len(planted)) + planted
+    rng.shuffle(entries)
+    return "\n".join(str(e) for e in entries)
+
+
+def _seating_settles(block: list[list[bool]]) -> bool:
+    """Whether people settle in the seats of `block` under the adjacency rule.
+
+    The rule is a symmetric threshold network, so the seats end up either fixed or
+    alternating between two layouts, which is detected by comparing every round with
+    the one two rounds before.
+    """
+    height, width = len(block), len(block[0])
+    occupied = [[False] * width for _ in range(height)]
+    before = None
+    while True:
+        following = [[False] * width for _ in range(height)]
+        for i in range(height):
+            for j in range(width):
+                if not block[i][j]:
+                    continue
+                count = sum(
+                    occupied[i + di][j + dj]
+                    for di in (-1, 0, 1)
+                    for dj in (-1, 0, 1)
+                    if (di or dj) and 0 <= i + di < height and 0 <= j + dj < width
+                )
+                following[i][j] = count < 4 if occupied[i][j] else count == 0
+        if following == occupied:
+            return True
+        if following == before:
+            return False
+        before, occupied = occupied, following
+
+
+def _aisles(size: int, rng: random.Random) -> list[tuple[int, int]]:
+    """Spans of blocks of seats along one side, separated by aisles of one floor cell."""
+    spans, start = [], 0
+    while start < size:
+        stop = min(size, start + rng.randint(4, 12))
+        spans.append((start, stop))
+        start = stop + 1
+    return spans
+
+
+@register(2020, 11, "side of the square seat layout", (10, 20, 40, 80, 160))
+def day11(size: int, rng: random.Random) -> str:
+    # large random layouts tend to alternate forever: blocks of seats are drawn until they
+    # settle on their own, and aisles keep them apart for the adjacency rule
+    layout = [["."] * size for _ in range(size)]
+    rows, columns = _aisles(size, rng), _aisles(size, rng)
+    for top, bottom in rows:
+        for left, right in columns:
+            while True:
+                block = [
+                    [rng.random() < 0.85 for _ in range(left, right)]
+                    for _ in range(top, bottom)
+                ]
+                if _seating_settles(block):
+                    break
+            for i, line in enumerate(block, start=top):
+                layout[i][left:right] = ["L" if seat else "." for seat in line]
+    return "\n".join("".join(line) for line in layout)
+
+
+@register(
+    2020,
+    15,
+    "number of turns",
+    (10**4, 10**5, 10**6),
+    part_kwargs=lambda size: {"part1": {"rank": size}, "part2": {"rank": size}},
+)
+def day15(size: int, rng: random.Random) -> str:
+    return ",".join(str(n) for n in rng.sample(range(20), 6))
+
+
+@register(2020, 17, "side of the square initial slice", (4, 8, 16))
+def day17(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join("#" if rng.random() < 0.4 else "." for _ in range(size)) for _ in range(size)
+    )
+
+
+@register(2020, 22, "number of cards in each deck", (10, 15, 20, 25))
+def day22(size: int, rng: random.Random) -> str:
+    cards = list(range(1, 2 * size + 1))
+    rng.shuffle(cards)
+    p1 = "\n".join(str(c) for c in cards[:size])
+    p2 = "\n".join(str(c) for c in cards[size:])
+    return f"Player 1:\n{p1}\n\nPlayer 2:\n{p2}"
+
+
+@register(
+    2020,
+    23,
+    "number of cups (part 2 plays ten moves per cup)",
+    (10**4, 10**5, 10**6),
+    part_kwargs=lambda size: {"part2": {"n": 10 * size, "n_cups": size}},
+)
+def day23(size: int, rng: random.Random) -> str:
+    labels = list(range(1, 10))
+    rng.shuffle(labels)
+    return "".join(str(c) for c in labels)
+
+
+@register(2020, 24, "number of tile paths", (100, 200, 400, 800))
+def day24(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choice(HEX_DIRECTIONS) for _ in range(rng.randint(10, 25)))
+        for _ in range(size)
+    )
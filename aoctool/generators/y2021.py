@@ -0,0 +1,79 @@
+import random
+
+from . import register
+
+
+def _digit_grid(size: int, rng: random.Random, low: int, high: int) -> str:
+    return "\n".join(
+        "".join(str(rng.randint(low, high)) for _ in range(size)) for _ in range(size)
+    )
+
+
+@register(2021, 1, "number of depth measurements", (10**3, 10**4, 10**5))
+def day1(size: int, rng: random.Random) -> str:
+    depth = 100
+    depths = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-5, 10))
+        depths.append(depth)
+    return "\n".join(str(d) for d in depths)
+
+
+@register(2021, 5, "number of vent lines", (100, 200, 400, 800))
+def day5(size: int, rng: random.Random) -> str:
+    extent = 1000
+    lines = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(extent), rng.randrange(extent)
+        dx, dy = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1)])
+        length = rng.randint(1, 200)
+        # shorten the line so that it stays within the ocean floor
+        if dx:
+            length = min(length, extent - 1 - x1)
+        if dy:
+            length = min(length, extent - 1 - y1 if dy > 0 else y1)
+        x2, y2 = x1 + dx * length, y1 + dy * length
+        lines.append(f"{x1},{y1} -> {x2},{y2}")
+    return "\n".join(lines)
+
+
+@register(
+    2021,
+    6,
+    "number of generations for part 2",
+    (256, 1024, 4096),
+    part_kwargs=lambda size: {"part2": {"gen_count": size}},
+)
+def day6(size: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randint(1, 5)) for _ in range(300))
+
+
+@register(2021, 7, "number of crabs", (10**3, 2 * 10**3, 4 * 10**3))
+def day7(size: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randrange(size)) for _ in range(size))
+
+
+@register(2021, 9, "side of the square heightmap", (50, 100, 200))
+def day9(size: int, rng: random.Random) -> str:
+    return _digit_grid(size, rng, 0, 9)
+
+
+@register(2021, 15, "side of the square cavern", (25, 50, 100))
+def day15(size: int, rng: random.Random) -> str:
+    return _digit_grid(size, rng, 1, 9)
+
+
+@register(2021, 22, "number of reboot steps", (50, 100, 200, 400))
+def day22(size: int, rng: random.Random) -> str:
+    steps = []
+    for i in range(size):
+        # the first fifth of the steps lies within the part 1 initialization region
+        extent, max_width = (50, 30) if i < size // 5 else (100000, 50000)
+        ranges = []
+        for axis in "xyz":
+            lo = rng.randint(-extent, extent - 1)
+            hi = min(lo + rng.randint(0, max_width), extent)
+            ranges.append(f"{axis}={lo}..{hi}")
+        onoff = "on" if i == 0 or rng.random() < 0.7 else "off"
+        steps.append(f"{onoff} {','.join(ranges)}")
+    return "\n".join(steps)
@@ -0,0 +1,75 @@
+import random
+import string
+
+from . import register
+
+
+@register(2022, 4, "number of assignment pairs", (10**3, 10**4, 10**5))
+def day4(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        a1, b1 = rng.randint(1, 90), rng.randint(1, 90)
+        a2, b2 = a1 + rng.randint(0, 9), b1 + rng.randint(0, 9)
+        lines.append(f"{a1}-{a2},{b1}-{b2}")
+    return "\n".join(lines)
+
+
+@register(2022, 6, "length of the datastream", (10**4, 10**5, 10**6))
+def day6(size: int, rng: random.Random) -> str:
+    # a three-letter alphabet cannot contain any marker before the end
+    stream = [rng.choice("abc") for _ in range(size - 14)]
+    return "".join(stream) + string.ascii_lowercase[4:18]
+
+
+@register(2022, 12, "side of the square heightmap", (20, 40, 80))
+def day12(size: int, rng: random.Random) -> str:
+    size = max(size, 14)
+    rows = []
+    for j in range(size):
+        row = []
+        for i in range(size):
+            alt = min(i + j, 25)
+            # keep a staircase along the diagonal so that a path always exists
+            if i - j not in (0, 1) and rng.random() < 0.2:
+                alt = rng.randint(0, alt)
+            row.append(string.ascii_lowercase[alt])
+        rows.append(row)
+
+    rows[0][0] = "S"
+    rows[-1][-1] = "E"
+    return "\n".join("".join(row) for row in rows)
+
+
+@register(
+    2022,
+    15,
+    "extent of the coordinate range",
+    (4 * 10**3, 4 * 10**4, 4 * 10**5),
+    part_kwargs=lambda size: {
+        "part1": {"row": size // 2},
+        "part2": {"coord_range": size},
+    },
+)
+def day15(size: int, rng: random.Random) -> str:
+    # sensors never reach the hidden point, which thus remains uncovered
+    hx, hy = rng.randrange(size), rng.randrange(size)
+    lines = []
+    for _ in range(30):
+        x, y = rng.randrange(size), rng.randrange(size)
+        dist = abs(x - hx) + abs(y - hy)
+        if dist < 2:
+            continue
+        radius = rng.randint(1, min(dist - 1, size // 3))
+        dx = rng.randint(-radius, radius)
+        dy = (radius - abs(dx)) * rng.choice((-1, 1))
+        lines.append(f"Sensor at x={x}, y={y}: closest beacon is at x={x + dx}, y={y + dy}")
+    return "\n".join(lines)
+
+
+@register(2022, 18, "number of lava cubes", (10**3, 4 * 10**3, 10**4))
+def day18(size: int, rng: random.Random) -> str:
+    extent = max(int(round(size ** (1 / 3) * 1.5)), 3)
+    cubes = set()
+    while len(cubes) < min(size, extent**3):
+        cubes.add((rng.randrange(extent), rng.randrange(extent), rng.randrange(extent)))
+    return "\n".join(f"{x},{y},{z}" for x, y, z in cubes)
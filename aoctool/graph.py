@@ -0,0 +1,347 @@
+"""Shortest paths, on graphs given by a neighbour function or backed by arrays.
+
+The generic searches take the start nodes and a function returning the neighbours of a
+node (with the weight of each edge, except for `bfs`), so that the graph is only ever
+explored as far as needed. `dial` replaces the heap of `dijkstra` by a ring of buckets
+when weights are small integers, and `dijkstra` becomes A* when given a heuristic, which
+must never overestimate the remaining cost.
+
+Grids and other graphs with integer nodes can be stored as an `(N, k)` adjacency array
+(see `grid_adjacency`) and searched by `array_bfs`, one vectorized step per level, or by
+`array_dial`, a compiled bucket queue.
+"""
+
+import dataclasses
+import heapq
+from collections import defaultdict, deque
+from typing import Callable, Hashable, Iterable
+
+import numpy as np
+
+from . import jit
+
+Node = Hashable
+
+
+def all_pairs_shortest_paths(
+    edges: Iterable[tuple[Node, Node, int]]
+) -> dict[tuple[Node, Node], tuple[list[Node], int]]:
+    """Shortest path and its length between every pair of distinct nodes of a small
+    undirected weighted graph given as `(u, v, weight)` edges."""
+    adjacency = defaultdict(list)
+    for u, v, weight in edges:
+        adjacency[u].append((v, weight))
+        adjacency[v].append((u, weight))
+
+    paths = {}
+    for source in adjacency:
+        dist = {source: 0}
+        prev = {}
+        queue = [(0, source)]
+        while queue:
+            d, node = heapq.heappop(queue)
+            if d > dist[node]:
+                continue
+            for neighbor, weight in adjacency[node]:
+                if d + weight < dist.get(neighbor, d + weight + 1):
+                    dist[neighbor] = d + weight
+                    prev[neighbor] = node
+                    heapq.heappush(queue, (d + weight, neighbor))
+
+        for target, d in dist.items():
+            if target == source:
+                continue
+            path = [target]
+            while path[-1] != source:
+                path.append(prev[path[-1]])
+            paths[(source, target)] = (path[::-1], d)
+    return paths
+
+
+@dataclasses.dataclass
+class Search:
+    """Distances from the start nodes to every node reached by a search."""
+
+    distances: dict[Node, int]
+    previous: dict[Node, Node]
+    goal: Node | None = None
+
+    @property
+    def cost(self) -> int | None:
+        """Distance to the goal, or `None` if the goal was not reached."""
+        return None if self.goal is None else self.distances[self.goal]
+
+    def path(self, node: Node | None = None) -> list[Node]:
+        """Path from a start node to `node`, by default the goal."""
+        node = self.goal if node is None else node
+        if node not in self.distances:
+            raise KeyError(f"{node!r} was not reached")
+        path = [node]
+        while path[-1] in self.previous:
+            path.append(self.previous[path[-1]])
+        return path[::-1]
+
+
+def bfs(
+    starts: Iterable[Node],
+    neighbours: Callable[[Node], Iterable[Node]],
+    goal: Callable[[Node], bool] | None = None,
+) -> Search:
+    """Breadth-first search of an unweighted graph, stopping at the first `goal` node."""
+    distances = {start: 0 for start in starts}
+    previous = {}
+    queue = deque(distances)
+    while queue:
+        node = queue.popleft()
+        if goal is not None and goal(node):
+            return Search(distances, previous, node)
+        for neighbour in neighbours(node):
+            if neighbour not in distances:
+                distances[neighbour] = distances[node] + 1
+                previous[neighbour] = node
+                queue.append(neighbour)
+    return Search(distances, previous)
+
+
+def dijkstra(
+    starts: Iterable[Node],
+    neighbours: Callable[[Node], Iterable[tuple[Node, int]]],
+    goal: Callable[[Node], bool] | None = None,
+    heuristic: Callable[[Node], int] | None = None,
+) -> Search:
+    """Dijkstra's algorithm, or A* with a `heuristic`, stopping at the first `goal` node.
+
+    Nodes do not need to be comparable: ties are broken by insertion order.
+    """
+    distances = {start: 0 for start in starts}
+    previous = {}
+    queue = [
+        (heuristic(start) if heuristic else 0, i, 0, start)
+        for i, start in enumerate(distances)
+    ]
+    heapq.heapify(queue)
+    counter = len(queue)
+    while queue:
+        _, _, dist, node = heapq.heappop(queue)
+        if dist > distances[node]:
+            continue  # stale entry
+        if goal is not None and goal(node):
+            return Search(distances, previous, node)
+        for neighbour, weight in neighbours(node):
+            if dist + weight < distances.get(neighbour, dist + weight + 1):
+                distances[neighbour] = dist + weight
+                previous[neighbour] = node
+                priority = dist + weight + (heuristic(neighbour) if heuristic else 0)
+                heapq.heappush(queue, (priority, counter, dist + weight, neighbour))
+                counter += 1
+    return Search(distances, previous)
+
+
+def astar(
+    starts: Iterable[Node],
+    neighbours: Callable[[Node], Iterable[tuple[Node, int]]],
+    goal: Callable[[Node], bool],
+    heuristic: Callable[[Node], int],
+) -> Search:
+    """A* search, i.e. `dijkstra` guided by an admissible `heuristic`."""
+    return dijkstra(starts, neighbours, goal, heuristic)
+
+
+def dial(
+    starts: Iterable[Node],
+    neighbours: Callable[[Node], Iterable[tuple[Node, int]]],
+    goal: Callable[[Node], bool] | None = None,
+    max_weight: int = 9,
+) -> Search:
+    """Dijkstra's algorithm with a bucket queue, for integer weights up to `max_weight`.
+
+    Nodes are kept in `max_weight + 1` buckets indexed by distance modulo the number of
+    buckets, which makes every queue operation constant time.
+    """
+    distances = {start: 0 for start in starts}
+    previous = {}
+    buckets = [[] for _ in range(max_weight + 1)]
+    buckets[0].extend(distances)
+    pending = len(distances)
+    dist = 0
+    while pending:
+        bucket = buckets[dist % len(buckets)]
+        while bucket:
+            node = bucket.pop()
+            pending -= 1
+            if distances[node] != dist:
+                continue  # stale entry
+            if goal is not None and goal(node):
+                return Search(distances, previous, node)
+            for neighbour, weight in neighbours(node):
+                if dist + weight < distances.get(neighbour, dist + weight + 1):
+                    if not 0 < weight <= max_weight:
+                        raise ValueError(f"weight {weight} out of range for dial")
+                    distances[neighbour] = dist + weight
+                    previous[neighbour] = node
+                    buckets[(dist + weight) % len(buckets)].append(neighbour)
+                    pending += 1
+        dist += 1
+    return Search(distances, previous)
+
+
+def grid_adjacency(shape: tuple[int, ...], neighbours: int = 4) -> np.ndarray:
+    """`(N, k)` array of the flat indices of the neighbours of each cell of a grid, -1
+    for neighbours outside the grid (see `aoctool.grid.offsets`)."""
+    from .grid import offsets
+
+    coords = np.indices(shape).reshape(len(shape), -1)
+    moves = np.array(offsets(neighbours, len(shape))).T
+    adjacent = coords[:, :, None] + moves[:, None, :]
+    inside = np.all((adjacent >= 0) & (adjacent < np.array(shape)[:, None, None]), axis=0)
+    flat = np.ravel_multi_index(tuple(np.where(inside, adjacent, 0)), shape)
+    return np.where(inside, flat, -1)
+
+
+def array_bfs(
+    adjacency: np.ndarray, starts: Iterable[int], allowed: np.ndarray | None = None
+) -> np.ndarray:
+    """Distances from the start nodes of an unweighted graph, -1 if unreachable.
+
+    `allowed` optionally masks the edges of the adjacency array that may be followed.
+    Each level is expanded in a single vectorized step.
+    """
+    followed = adjacency >= 0 if allowed is None else (adjacency >= 0) & allowed
+    distances = np.full(len(adjacency), -1, dtype=np.int64)
+    frontier = np.unique(np.asarray(list(starts), dtype=np.int64))
+    distances[frontier] = 0
+    level = 0
+    while len(frontier):
+        reached = adjacency[frontier][followed[frontier]]
+        frontier = np.unique(reached[distances[reached] < 0])
+        level += 1
+        distances[frontier] = level
+    return distances
+
+
+@jit.njit
+def _array_dial(adjacency, weights, starts, goal, max_weight):
+    n, k = adjacency.shape
+    unreached = np.iinfo(np.int64).max
+    distances = np.full(n, unreached, dtype=np.int64)
+
+    # buckets are linked lists of entries, indexed by distance modulo the bucket count
+    capacity = n * k + len(starts)
+    entry_node = np.empty(capacity, dtype=np.int64)
+    entry_next = np.empty(capacity, dtype=np.int64)
+    heads = np.full(max_weight + 1, -1, dtype=np.int64)
+    size = 0
+    for start in starts:
+        distances[start] = 0
+        entry_node[size] = start
+        entry_next[size] = heads[0]
+        heads[0] = size
+        size += 1
+
+    pending = size
+    dist = 0
+    while pending:
+        bucket = dist % (max_weight + 1)
+        while heads[bucket] >= 0:
+            entry = heads[bucket]
+            heads[bucket] = entry_next[entry]
+            pending -= 1
+            node = entry_node[entry]
+            if distances[node] != dist:
+                continue
+            if node == goal:
+                return distances
+            for j in range(k):
+                neighbour = adjacency[node, j]
+                if neighbour < 0:
+                    continue
+                new_dist = dist + weights[neighbour]
+                if new_dist < distances[neighbour]:
+                    distances[neighbour] = new_dist
+                    target = new_dist % (max_weight + 1)
+                    entry_node[size] = neighbour
+                    entry_next[size] = heads[target]
+                    heads[target] = size
+                    size += 1
+                    pending += 1
+        dist += 1
+    return distances
+
+
+def array_dial(
+    adjacency: np.ndarray,
+    weights: np.ndarray,
+    starts: Iterable[int],
+    goal: int | None = None,
+    max_weight: int | None = None,
+) -> np.ndarray:
+    """Distances from the start nodes, where entering node `i` costs `weights[i]`.
+
+    Unreachable nodes are at distance `np.iinfo(np.int64).max`. With a `goal`, the
+    search stops once its distance is final; other distances may then be too large.
+    """
+    weights = np.asarray(weights, dtype=np.int64)
+    if len(weights) and weights.min() <= 0:
+        raise ValueError("dial needs positive weights")
+    return _array_dial(
+        np.ascontiguousarray(adjacency, dtype=np.int64),
+        weights,
+        np.asarray(list(starts), dtype=np.int64),
+        -1 if goal is None else goal,
+        int(weights.max(initial=1)) if max_weight is None else max_weight,
+    )
+
+
+def test_all_pairs_shortest_paths():
+    paths = all_pairs_shortest_paths([(0, 1, 1), (1, 2, 1), (0, 2, 5), (2, 3, 1)])
+    assert paths[(0, 3)] == ([0, 1, 2, 3], 3)
+    assert paths[(3, 0)] == ([3, 2, 1, 0], 3)
+    assert (0, 0) not in paths
+    assert len(paths) == 12
+
+
+def _weighted_neighbours(node: int) -> list[tuple[int, int]]:
+    # a line 0 - 1 - ... - 20 with shortcuts of weight 3 skipping two nodes
+    return [(n, 1) for n in (node - 1, node + 1) if 0 <= n <= 20] + [
+        (n, 3) for n in (node - 3, node + 3) if 0 <= n <= 20
+    ]
+
+
+def test_bfs():
+    search = bfs([0], lambda node: [node + 1, 2 * node], goal=lambda node: node == 10)
+    assert search.cost == 5
+    assert search.path() == [0, 1, 2, 4, 5, 10]
+    assert bfs(["a"], lambda node: []).goal is None
+
+
+def test_weighted_searches():
+    expected = {node: node // 3 * 3 + node % 3 for node in range(21)}
+    assert dijkstra([0], _weighted_neighbours).distances == expected
+    assert dial([0], _weighted_neighbours, max_weight=3).distances == expected
+
+    search = astar([0], _weighted_neighbours, lambda n: n == 20, lambda n: (20 - n) // 3)
+    assert search.cost == 20
+    assert search.path()[0] == 0 and search.path()[-1] == 20
+
+    import pytest
+
+    with pytest.raises(ValueError):
+        dial([0], _weighted_neighbours, max_weight=2)
+
+
+def test_array_searches():
+    adjacency = grid_adjacency((2, 3))
+    assert adjacency.tolist() == [
+        [-1, -1, 1, 3],
+        [-1, 0, 2, 4],
+        [-1, 1, -1, 5],
+        [0, -1, 4, -1],
+        [1, 3, 5, -1],
+        [2, 4, -1, -1],
+    ]
+    assert array_bfs(adjacency, [0]).tolist() == [0, 1, 2, 1, 2, 3]
+    assert array_bfs(adjacency, [0], adjacency != 1).tolist() == [0, -1, 4, 1, 2, 3]
+
+    weights = np.array([1, 9, 1, 1, 1, 1])
+    assert array_dial(adjacency, weights, [0]).tolist() == [0, 9, 4, 1, 2, 3]
+    assert array_dial(adjacency, weights, [0], goal=5)[5] == 3
@@ -0,0 +1,155 @@
+"""NumPy helpers for puzzles played on a grid.
+
+Text grids are parsed in a single vectorized pass: the input is viewed as a 2D byte array
+whose rows stride over the newlines, and characters are mapped through a lookup table.
+Neighbourhood operations pad the grid once and combine shifted views of the padded array,
+so they need neither scipy nor per-neighbour copies.
+"""
+
+import functools
+import itertools
+
+import numpy as np
+
+
+def parse(data: str, mapping: dict[str, int] | None = None, dtype=np.int8) -> np.ndarray:
+    """Parse lines of equal length into a 2D array.
+
+    Characters are mapped through `mapping`, or read as digits when it is not given.
+    """
+    if mapping is None:
+        mapping = {str(digit): digit for digit in range(10)}
+
+    buffer = np.frombuffer(data.strip("\n").encode(), dtype=np.uint8)
+    width = data.strip("\n").find("\n")
+    if width == -1:
+        width = len(buffer)
+    height = (len(buffer) + 1) // (width + 1)
+    if height * (width + 1) - 1 != len(buffer) or np.any(buffer[width :: width + 1] != 10):
+        raise ValueError("grid lines are not all of the same length")
+    chars = np.lib.stride_tricks.as_strided(buffer, (height, width), (width + 1, 1))
+
+    table = np.zeros(256, dtype=dtype)
+    known = np.zeros(256, dtype=bool)
+    for char, value in mapping.items():
+        table[ord(char)] = value
+        known[ord(char)] = True
+    if not known[chars].all():
+        unknown = sorted({chr(c) for c in chars[~known[chars]]})
+        raise ValueError(f"unexpected characters in grid: {''.join(unknown)!r}")
+    return table[chars]
+
+
+@functools.cache
+def offsets(neighbours: int = 8, ndim: int = 2) -> tuple[tuple[int, ...], ...]:
+    """Offsets of the neighbours of a cell.
+
+    `neighbours` is `2 * ndim` (cells sharing a face), `3 ** ndim - 1` (cells sharing a
+    corner) or, in 2D, 6 for a hexagonal grid in axial coordinates.
+    """
+    moves = [move for move in itertools.product((-1, 0, 1), repeat=ndim) if any(move)]
+    if neighbours == 3**ndim - 1:
+        return tuple(moves)
+    if neighbours == 2 * ndim:
+        return tuple(move for move in moves if sum(map(abs, move)) == 1)
+    if neighbours == 6 and ndim == 2:
+        return tuple(move for move in moves if move not in ((-1, -1), (1, 1)))
+    raise ValueError(f"no {neighbours}-neighbourhood in {ndim} dimensions")
+
+
+@functools.cache
+def kernel(neighbours: int = 8, ndim: int = 2) -> np.ndarray:
+    """Read-only `3 x ... x 3` mask of the neighbours of the central cell."""
+    mask = np.zeros((3,) * ndim, dtype=np.int8)
+    for move in offsets(neighbours, ndim):
+        mask[tuple(d + 1 for d in move)] = 1
+    mask.flags.writeable = False
+    return mask
+
+
+def pad(array: np.ndarray, width: int = 1, fill=0) -> np.ndarray:
+    """Copy of `array` with a border of `width` cells set to `fill` on every side."""
+    padded = np.full(tuple(n + 2 * width for n in array.shape), fill, dtype=array.dtype)
+    padded[(slice(width, -width),) * array.ndim] = array
+    return padded
+
+
+def shifted(padded: np.ndarray, move: tuple[int, ...], width: int = 1) -> np.ndarray:
+    """View of `padded` holding, for every cell of the unpadded array, the value of its
+    neighbour at `move`."""
+    return padded[tuple(slice(width + d, n - width + d) for d, n in zip(move, padded.shape))]
+
+
+def reduce_neighbours(
+    array: np.ndarray, ufunc=np.add, neighbours: int = 8, fill=0, dtype=None
+) -> np.ndarray:
+    """Combine the neighbours of every cell with `ufunc`, cells outside being `fill`."""
+    padded = pad(array, 1, fill)
+    moves = offsets(neighbours, array.ndim)
+    out = shifted(padded, moves[0]).astype(dtype or array.dtype)
+    for move in moves[1:]:
+        ufunc(out, shifted(padded, move), out=out)
+    return out
+
+
+def count_neighbours(mask: np.ndarray, neighbours: int = 8) -> np.ndarray:
+    """Number of set neighbours of every cell of a boolean array."""
+    return reduce_neighbours(mask, np.add, neighbours, fill=False, dtype=np.int16)
+
+
+def correlate(array: np.ndarray, weights: np.ndarray, fill=0, grow: int = 0) -> np.ndarray:
+    """Weighted sum over the `3 x ... x 3` neighbourhood of every cell, cells outside
+    being `fill`.
+
+    With `grow`, the output also covers that many cells around the array, like
+    `scipy.signal.correlate(..., mode="full")` does for `grow=1`.
+    """
+    padded = pad(array, 1 + grow, fill)
+    out = np.zeros(tuple(n + 2 * grow for n in array.shape), dtype=weights.dtype)
+    for move in itertools.product((-1, 0, 1), repeat=array.ndim):
+        if weight := weights[tuple(d + 1 for d in move)]:
+            out += weight * shifted(padded, move)
+    return out
+
+
+def test_parse():
+    import pytest
+
+    assert parse("12\n34\n").tolist() == [[1, 2], [3, 4]]
+    assert parse("#.\n.#", {"#": True, ".": False}, bool).tolist() == [
+        [True, False],
+        [False, True],
+    ]
+    with pytest.raises(ValueError):
+        parse("12\n3\n")
+    with pytest.raises(ValueError, match="'x'"):
+        parse("12\n3x")
+
+
+def test_offsets():
+    assert len(offsets(4)) == 4 and len(offsets(8)) == 8 and len(offsets(6)) == 6
+    assert len(offsets(26, 3)) == 26 and len(offsets(8, 4)) == 8
+    assert kernel(4).tolist() == [[0, 1, 0], [1, 0, 1], [0, 1, 0]]
+    assert kernel(6).tolist() == [[0, 1, 1], [1, 0, 1], [1, 1, 0]]
+    assert kernel(26, 3).sum() == 26
+
+
+def test_neighbours():
+    mask = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 0]], dtype=bool)
+    assert count_neighbours(mask).tolist() == [[1, 2, 1], [2, 1, 1], [1, 1, 1]]
+    assert count_neighbours(mask, 4).tolist() == [[0, 2, 0], [2, 0, 1], [0, 1, 0]]
+
+    floor = np.array([[2, 1], [3, 9]])
+    assert reduce_neighbours(floor, np.minimum, 4, fill=9).tolist() == [[1, 2], [2, 1]]
+
+
+def test_correlate():
+    array = np.arange(12).reshape(3, 4)
+    weights = np.arange(9).reshape(3, 3)
+    padded = np.pad(array, 2)
+    full = [
+        [(padded[i : i + 3, j : j + 3] * weights).sum() for j in range(padded.shape[1] - 2)]
+        for i in range(padded.shape[0] - 2)
+    ]
+    assert correlate(array, weights, grow=1).tolist() == full
+    assert correlate(array, weights).tolist() == [row[1:-1] for row in full[1:-1]]
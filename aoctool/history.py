@@ -0,0 +1,303 @@
+"""Benchmark history, to catch performance regressions across commits.
+
+Every `aoctool bench` run, as well as every pytest session using the `benchmark` fixture,
+is stored as a run in a SQLite database, along with the git commit, the Python version
+and a fingerprint of the machine. Two runs are then compared per (year, day, part,
+function) with a Mann-Whitney U test on the raw timings, so that a slowdown is only
+flagged when it is both large enough and unlikely to be noise.
+"""
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+from typing import Iterable, Iterator
+
+DEFAULT_PATH = pathlib.Path(
+    os.environ.get(
+        "AOCTOOL_HISTORY", pathlib.Path.home() / ".cache" / "aoctool" / "history.sqlite3"
+    )
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    source TEXT NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    python TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    machine_info TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    year INTEGER,
+    day INTEGER,
+    part TEXT NOT NULL,
+    function TEXT NOT NULL,
+    timings TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_run_id ON records (run_id);
+"""
+
+
+@dataclasses.dataclass
+class Run:
+    id: int
+    timestamp: float
+    source: str
+    git_commit: str | None
+    git_dirty: bool | None
+    python: str
+    machine: str
+
+    @property
+    def label(self) -> str:
+        commit = self.git_commit[:10] if self.git_commit else "no commit"
+        if self.git_dirty:
+            commit += "+"
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.timestamp))
+        return f"#{self.id} {when} {commit} ({self.source}, Python {self.python})"
+
+
+@dataclasses.dataclass
+class Record:
+    year: int | None
+    day: int | None
+    part: str
+    function: str
+    timings: list[float]
+
+    @property
+    def key(self) -> tuple:
+        return self.year, self.day, self.part, self.function
+
+
+def machine_info() -> dict:
+    return {
+        "node": platform.node(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def machine_fingerprint(info: dict | None = None) -> str:
+    info = machine_info() if info is None else info
+    return hashlib.sha256(json.dumps(info, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def git_state(root: pathlib.Path | str = ".") -> tuple[str | None, bool | None]:
+    """Current commit and whether tracked files have uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+class History:
+    def __init__(self, path: pathlib.Path | str = DEFAULT_PATH):
+        self.path = pathlib.Path(path)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.executescript(SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_run(
+        self, source: str, records: Iterable[Record], root: pathlib.Path | str = "."
+    ) -> int:
+        commit, dirty = git_state(root)
+        info = machine_info()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (timestamp, source, git_commit, git_dirty, python, machine, "
+                "machine_info) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    source,
+                    commit,
+                    dirty,
+                    platform.python_version(),
+                    machine_fingerprint(info),
+                    json.dumps(info),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO records (run_id, year, day, part, function, timings) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        cursor.lastrowid,
+                        r.year,
+                        r.day,
+                        r.part,
+                        r.function,
+                        json.dumps(r.timings),
+                    )
+                    for r in records
+                ],
+            )
+            return cursor.lastrowid
+
+    def runs(self, machine: str | None = None, source: str | None = None) -> list[Run]:
+        """All runs, most recent first."""
+        query = (
+            "SELECT id, timestamp, source, git_commit, git_dirty, python, machine FROM runs "
+            "WHERE (? IS NULL OR machine = ?) AND (? IS NULL OR source = ?) ORDER BY id DESC"
+        )
+        with self._connect() as conn:
+            rows = conn.execute(query, (machine, machine, source, source)).fetchall()
+        return [
+            Run(i, ts, src, commit, None if dirty is None else bool(dirty), python, mach)
+            for i, ts, src, commit, dirty, python, mach in rows
+        ]
+
+    def records(self, run_id: int) -> list[Record]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT year, day, part, function, timings FROM records WHERE run_id = ?",
+                (run_id,),
+            ).fetchall()
+        return [
+            Record(year, day, part, function, json.loads(timings))
+            for year, day, part, function, timings in rows
+        ]
+
+
+def find_run(runs: list[Run], selector: str) -> Run:
+    """Select a run by id (`#12` or `12`) or by commit prefix (latest run wins)."""
+    if selector.lstrip("#").isdigit():
+        matches = [run for run in runs if run.id == int(selector.lstrip("#"))]
+    else:
+        matches = [run for run in runs if (run.git_commit or "").startswith(selector)]
+    if not matches:
+        raise LookupError(f"no run matches {selector!r}")
+    return matches[0]
+
+
+_default_history = None
+
+
+def default_history() -> History:
+    global _default_history
+    if _default_history is None:
+        _default_history = History()
+    return _default_history
+
+
+@dataclasses.dataclass
+class Comparison:
+    year: int | None
+    day: int | None
+    part: str
+    function: str
+    baseline: float | None
+    candidate: float | None
+    p_value: float | None = None
+    status: str = "same"
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline or self.candidate is None:
+            return None
+        return self.candidate / self.baseline
+
+
+def compare(
+    baseline: list[Record],
+    candidate: list[Record],
+    threshold: float = 0.05,
+    alpha: float = 0.05,
+) -> list[Comparison]:
+    """Compare the median timings of two runs.
+
+    A part is `slower` (or `faster`) when its median changed by more than `threshold`
+    (relative) and the two-sided Mann-Whitney U test rejects identical distributions at
+    level `alpha`. Parts present in a single run are `new` or `missing`.
+    """
+    from scipy.stats import mannwhitneyu
+
+    base = {r.key: r for r in baseline}
+    cand = {r.key: r for r in candidate}
+    comparisons = []
+    for key in sorted(base.keys() | cand.keys(), key=lambda k: tuple(map(str, k))):
+        b, c = base.get(key), cand.get(key)
+        comparison = Comparison(
+            *key,
+            baseline=statistics.median(b.timings) if b else None,
+            candidate=statistics.median(c.timings) if c else None,
+        )
+        comparisons.append(comparison)
+
+        if b is None or c is None:
+            comparison.status = "new" if b is None else "missing"
+            continue
+        if len(b.timings) < 2 or len(c.timings) < 2:
+            continue
+
+        comparison.p_value = float(
+            mannwhitneyu(c.timings, b.timings, alternative="two-sided").pvalue
+        )
+        if comparison.p_value < alpha:
+            if comparison.ratio > 1 + threshold:
+                comparison.status = "slower"
+            elif comparison.ratio < 1 / (1 + threshold):
+                comparison.status = "faster"
+
+    return comparisons
+
+
+def test_history(tmp_path):
+    history = History(tmp_path / "history.sqlite3")
+    records = [
+        Record(2020, 1, "part1", "day1_part1", [0.1, 0.2]),
+        Record(None, None, "g", "f", [1]),
+    ]
+    first = history.add_run("bench", records, tmp_path)
+    second = history.add_run("pytest", records[:1], tmp_path)
+
+    runs = history.runs()
+    assert [run.id for run in runs] == [second, first]
+    assert runs[0].git_commit is None and runs[0].machine == machine_fingerprint()
+    assert history.runs(source="bench")[0].id == first
+    assert find_run(runs, f"#{first}").id == first
+    assert history.records(first) == records
+
+
+def test_compare():
+    base = [0.100, 0.101, 0.099, 0.102, 0.100]
+    baseline = [Record(2020, 1, "part1", "f", base), Record(2020, 1, "part2", "f", base)]
+    candidate = [
+        Record(2020, 1, "part1", "f", [t * 1.5 for t in base]),
+        Record(2020, 1, "part2", "f", [t * 1.01 for t in base]),
+        Record(2020, 2, "part1", "f", base),
+    ]
+    status = {(c.day, c.part): c.status for c in compare(baseline, candidate)}
+    assert status == {(1, "part1"): "slower", (1, "part2"): "same", (2, "part1"): "new"}
@@ -0,0 +1,115 @@
+"""Import cost of day modules, as measured by `python -X importtime`.
+
+Each module is imported in a fresh interpreter so that nothing is already cached in
+`sys.modules`. The subtree of the importtime log below the day module is aggregated by
+top-level package, which points at the dependencies worth deferring (see `aoctool.lazy`).
+"""
+
+import dataclasses
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from .days import DayModule
+
+# must not be imported by any day module until a solution runs
+DEFERRED_PACKAGES = {
+    "matplotlib",
+    "multiprocess",
+    "networkx",
+    "numba",
+    "rich",
+    "scipy",
+    "skimage",
+}
+
+LINE_EXPR = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclasses.dataclass
+class ImportTime:
+    year: int
+    day: int
+    total: float
+    packages: dict[str, float]
+
+    def top(self, n: int) -> list[tuple[str, float]]:
+        return sorted(self.packages.items(), key=lambda item: -item[1])[:n]
+
+
+def parse_importtime(log: str, module: str) -> tuple[float, dict[str, float]]:
+    """Cumulative import time of `module` and the self time of its dependencies summed
+    by top-level package, all in seconds."""
+    entries = []
+    for line in log.splitlines():
+        if mo := LINE_EXPR.match(line):
+            self_us, cumulative_us, indent, name = mo.groups()
+            entries.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+
+    # children are logged before their parent
+    for idx in range(len(entries) - 1, -1, -1):
+        if entries[idx][2] == 0 and entries[idx][3] == module:
+            break
+    else:
+        raise ValueError(f"{module} not found in importtime log")
+
+    packages = defaultdict(float)
+    packages[module] = entries[idx][0] / 1e6
+    for self_us, _, depth, name in reversed(entries[:idx]):
+        if depth == 0:
+            break
+        packages[name.split(".")[0]] += self_us / 1e6
+    return entries[idx][1] / 1e6, dict(packages)
+
+
+def measure_module(day_module: DayModule) -> tuple[float, dict[str, float]]:
+    module = day_module.path.stem
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=day_module.path.parent,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return parse_importtime(proc.stderr, module)
+
+
+def measure_day(day_module: DayModule, repeat: int = 3) -> ImportTime:
+    """Best of `repeat` fresh imports, which filters out disk cache and scheduling noise."""
+    total, packages = min(
+        (measure_module(day_module) for _ in range(repeat)), key=lambda res: res[0]
+    )
+    return ImportTime(day_module.year, day_module.day, total, packages)
+
+
+def test_parse_importtime():
+    log = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:       300 |        300 |     numpy.core
+import time:        50 |        350 |   numpy
+import time:        20 |         20 |   aoctool.lazy
+import time:        10 |         10 |     aoctool.inputs
+import time:         5 |         35 |   aoctool
+import time:         7 |        392 | day3
+"""
+    import pytest
+
+    total, packages = parse_importtime(log, "day3")
+    assert total == 392e-6
+    assert packages == pytest.approx({"day3": 7e-6, "numpy": 350e-6, "aoctool": 35e-6})
+
+    with pytest.raises(ValueError):
+        parse_importtime(log, "day4")
+
+
+def test_heavy_imports_deferred():
+    import pathlib
+
+    from .days import discover
+
+    root = pathlib.Path(__file__).parents[1]
+    for day_module in discover(root, years=(2020, 2021), days=(11, 15, 19, 23)):
+        res = measure_day(day_module, repeat=1)
+        assert not DEFERRED_PACKAGES & res.packages.keys(), day_module
@@ -0,0 +1,145 @@
+"""Local, content-addressed store for puzzle inputs.
+
+Inputs are stored once per content under `objects/<sha256>`, and `<year>/day<N>` files
+map each puzzle to the digest of its input. Reads are fully offline: the object is
+memory-mapped and its checksum verified. The network is only used by `fetch`, or by
+`get_data` on a cache miss unless `AOCTOOL_OFFLINE` is set.
+"""
+
+import hashlib
+import mmap
+import os
+import pathlib
+
+from .fsutil import atomic_write
+
+DEFAULT_ROOT = pathlib.Path(
+    os.environ.get("AOCTOOL_INPUTS", pathlib.Path.home() / ".cache" / "aoctool" / "inputs")
+)
+
+
+class MissingInputError(LookupError):
+    pass
+
+
+class CorruptInputError(ValueError):
+    pass
+
+
+class InputStore:
+    def __init__(self, root: pathlib.Path | str = DEFAULT_ROOT):
+        self.root = pathlib.Path(root)
+
+    def _index_path(self, year: int, day: int) -> pathlib.Path:
+        return self.root / str(year) / f"day{day}"
+
+    def _object_path(self, digest: str) -> pathlib.Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def digest(self, year: int, day: int) -> str:
+        try:
+            return self._index_path(year, day).read_text().strip()
+        except FileNotFoundError:
+            raise MissingInputError(
+                f"no input stored for {year} day {day}, run `aoctool fetch -y {year} -d {day}`"
+            ) from None
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return self._index_path(*key).exists()
+
+    def put(self, year: int, day: int, data: str) -> str:
+        raw = data.encode()
+        digest = hashlib.sha256(raw).hexdigest()
+        obj_path = self._object_path(digest)
+        if not obj_path.exists():
+            atomic_write(obj_path, raw)
+        atomic_write(self._index_path(year, day), digest.encode())
+        return digest
+
+    def get_bytes(self, year: int, day: int) -> bytes | mmap.mmap:
+        """Return the verified input as a read-only memory map (or `b""` if empty)."""
+        digest = self.digest(year, day)
+        with open(self._object_path(digest), "rb") as fp:
+            if os.fstat(fp.fileno()).st_size == 0:
+                buf = b""
+            else:
+                buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if hashlib.sha256(buf).hexdigest() != digest:
+            raise CorruptInputError(f"checksum mismatch for {year} day {day} input")
+        return buf
+
+    def get(self, year: int, day: int) -> str:
+        buf = self.get_bytes(year, day)
+        try:
+            return buf[:].decode()
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    def fetch(self, year: int, day: int, force: bool = False) -> str:
+        if not force and (year, day) in self:
+            return self.get(year, day)
+
+        import aocd
+
+        data = aocd.get_data(day=day, year=year)
+        self.put(year, day, data)
+        return data
+
+
+_default_store = None
+
+
+def default_store() -> InputStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = InputStore()
+    return _default_store
+
+
+def get_data(day: int, year: int) -> str:
+    """Drop-in replacement for `aocd.get_data()` backed by the default store."""
+    store = default_store()
+    if os.environ.get("AOCTOOL_OFFLINE"):
+        return store.get(year, day)
+    return store.fetch(year, day)
+
+
+def get_bytes(day: int, year: int) -> bytes | mmap.mmap:
+    """Like `get_data`, but return the memory-mapped input for zero-copy parsing (see
+    `aoctool.parsing`)."""
+    store = default_store()
+    if not os.environ.get("AOCTOOL_OFFLINE"):
+        store.fetch(year, day)
+    return store.get_bytes(year, day)
+
+
+def test_store_roundtrip(tmp_path):
+    store = InputStore(tmp_path)
+    assert (2020, 1) not in store
+    digest = store.put(2020, 1, "1721\n979\n366")
+    assert (2020, 1) in store
+    assert store.digest(2020, 1) == digest
+    assert store.get(2020, 1) == "1721\n979\n366"
+
+    # identical content is stored once
+    store.put(2020, 2, "1721\n979\n366")
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2
+
+
+def test_store_checksum(tmp_path):
+    import pytest
+
+    store = InputStore(tmp_path)
+    digest = store.put(2021, 5, "0,9 -> 5,9")
+    store._object_path(digest).write_bytes(b"0,9 -> 5,8")
+    with pytest.raises(CorruptInputError):
+        store.get(2021, 5)
+
+
+def test_store_missing(tmp_path):
+    import pytest
+
+    with pytest.raises(MissingInputError):
+        InputStore(tmp_path).get(2022, 3)
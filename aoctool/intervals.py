@@ -0,0 +1,217 @@
+"""Sets of integers stored as sorted, disjoint half-open intervals.
+
+An `IntervalSet` keeps the bounds of its intervals in two NumPy arrays, so that sizes and
+membership are computed from the bounds alone, whatever the magnitude of the
+coordinates. Sets are built in bulk from arrays of (possibly overlapping) intervals, and
+combined with `|`, `&`, `-` and `^` by a sweep over the bounds of both operands. Single
+intervals added with `add` are buffered, and merged in bulk the next time the bounds are
+read.
+
+The module level functions work elementwise on arrays of intervals instead.
+"""
+
+from typing import Iterable, Iterator
+
+import numpy as np
+
+
+def lengths(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Number of integers in each interval `[start, stop)`, 0 for empty ones."""
+    return np.maximum(np.asarray(stops) - np.asarray(starts), 0)
+
+
+def intersection(
+    starts: np.ndarray, stops: np.ndarray, other_starts: np.ndarray, other_stops: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Elementwise intersection of two arrays of intervals (empty when `start >= stop`)."""
+    return np.maximum(starts, other_starts), np.minimum(stops, other_stops)
+
+
+class IntervalSet:
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()):
+        """Union of the half-open intervals `[start, stop)`."""
+        bounds = np.array(list(intervals), dtype=np.int64).reshape(-1, 2)
+        self._starts, self._stops = self._normalize(bounds[:, 0], bounds[:, 1])
+        self._pending: list[tuple[int, int]] = []
+
+    @classmethod
+    def from_arrays(cls, starts: np.ndarray, stops: np.ndarray) -> "IntervalSet":
+        """Union of the intervals `[starts[i], stops[i])`, merged in a vectorized pass."""
+        result = cls()
+        result._starts, result._stops = cls._normalize(
+            np.asarray(starts, dtype=np.int64), np.asarray(stops, dtype=np.int64)
+        )
+        return result
+
+    def _merge_pending(self):
+        if self._pending:
+            pending = np.array(self._pending, dtype=np.int64)
+            self._pending = []
+            self._starts, self._stops = self._normalize(
+                np.concatenate((self._starts, pending[:, 0])),
+                np.concatenate((self._stops, pending[:, 1])),
+            )
+
+    @property
+    def starts(self) -> np.ndarray:
+        self._merge_pending()
+        return self._starts
+
+    @property
+    def stops(self) -> np.ndarray:
+        self._merge_pending()
+        return self._stops
+
+    @classmethod
+    def from_points(cls, points: Iterable[int]) -> "IntervalSet":
+        points = np.fromiter(points, dtype=np.int64)
+        return cls.from_arrays(points, points + 1)
+
+    @staticmethod
+    def _normalize(starts: np.ndarray, stops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        keep = starts < stops
+        starts, stops = starts[keep], stops[keep]
+        if len(starts) == 0:
+            return starts, stops
+
+        order = np.argsort(starts, kind="stable")
+        starts, stops = starts[order], np.maximum.accumulate(stops[order])
+        # an interval starts a new group unless it overlaps or touches the previous ones
+        first = np.ones(len(starts), dtype=bool)
+        first[1:] = starts[1:] > stops[:-1]
+        last = np.append(first[1:], True)
+        return starts[first], stops[last]
+
+    def __len__(self) -> int:
+        """Number of disjoint intervals."""
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[range]:
+        return (
+            range(start, stop)
+            for start, stop in zip(self.starts.tolist(), self.stops.tolist())
+        )
+
+    def __repr__(self) -> str:
+        intervals = ", ".join(
+            f"[{start}, {stop})" for start, stop in zip(self.starts, self.stops)
+        )
+        return f"IntervalSet({intervals})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return np.array_equal(self.starts, other.starts) and np.array_equal(
+            self.stops, other.stops
+        )
+
+    def count(self) -> int:
+        """Number of integers in the set."""
+        return int(np.sum(self.stops - self.starts))
+
+    def __contains__(self, value: int) -> bool:
+        idx = np.searchsorted(self.stops, value, side="right")
+        return bool(idx < len(self.starts) and self.starts[idx] <= value)
+
+    def covers(self, start: int, stop: int) -> bool:
+        """Whether every integer of `[start, stop)` is in the set."""
+        if start >= stop:
+            return True
+        idx = np.searchsorted(self.stops, start, side="right")
+        return bool(
+            idx < len(self.starts) and self.starts[idx] <= start and stop <= self.stops[idx]
+        )
+
+    def add(self, start: int, stop: int):
+        """Insert `[start, stop)` in amortized constant time.
+
+        The interval is buffered. Buffered intervals are merged with the set in a single
+        sort the next time its bounds are read, so interleaving inserts with queries costs
+        one merge per query.
+        """
+        if start < stop:
+            self._pending.append((start, stop))
+
+    def _combine(self, other: "IntervalSet", op) -> "IntervalSet":
+        bounds = np.unique(
+            np.concatenate((self.starts, self.stops, other.starts, other.stops))
+        )
+        if len(bounds) < 2:
+            return IntervalSet()
+        segments = bounds[:-1]
+        keep = op(self._members(segments), other._members(segments))
+        return IntervalSet.from_arrays(segments[keep], bounds[1:][keep])
+
+    def _members(self, values: np.ndarray) -> np.ndarray:
+        idx = np.searchsorted(self.stops, values, side="right")
+        inside = idx < len(self.starts)
+        inside[inside] = self.starts[idx[inside]] <= values[inside]
+        return inside
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet.from_arrays(
+            np.concatenate((self.starts, other.starts)),
+            np.concatenate((self.stops, other.stops)),
+        )
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, np.logical_and)
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def __xor__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, np.logical_xor)
+
+    def crop(self, start: int, stop: int) -> "IntervalSet":
+        """Part of the set within `[start, stop)`."""
+        lo = np.searchsorted(self.stops, start, side="right")
+        hi = np.searchsorted(self.starts, stop, side="left")
+        return IntervalSet.from_arrays(
+            np.maximum(self.starts[lo:hi], start), np.minimum(self.stops[lo:hi], stop)
+        )
+
+    def gaps(self, start: int, stop: int) -> "IntervalSet":
+        """Integers of `[start, stop)` missing from the set."""
+        return IntervalSet([(start, stop)]) - self
+
+
+def test_interval_set():
+    ranges = IntervalSet([(2, 3), (11, 14), (3, 14), (-3, 4), (15, 26), (15, 18)])
+    assert list(ranges) == [range(-3, 14), range(15, 26)]
+    assert len(ranges) == 2 and ranges.count() == 28
+    assert 13 in ranges and 14 not in ranges and -4 not in ranges
+    assert ranges.covers(0, 14) and not ranges.covers(0, 15)
+    assert list(ranges.crop(0, 20)) == [range(0, 14), range(15, 20)]
+    assert list(ranges.gaps(0, 20)) == [range(14, 15)]
+    assert IntervalSet.from_points([1, 2, 3, 7]) == IntervalSet([(1, 4), (7, 8)])
+
+    big = IntervalSet.from_arrays(np.array([0, 10**15]), np.array([10**12, 3 * 10**15]))
+    assert big.count() == 10**12 + 2 * 10**15
+
+
+def test_add():
+    ranges = IntervalSet()
+    for start, stop in [(5, 7), (0, 2), (10, 12), (2, 3), (6, 11), (20, 20)]:
+        ranges.add(start, stop)
+    assert list(ranges) == [range(0, 3), range(5, 12)]
+    ranges.add(12, 15)
+    assert 14 in ranges and ranges.count() == 13
+    ranges.add(-5, 0)
+    assert ranges == IntervalSet([(-5, 3), (5, 15)]) and len(ranges) == 2
+
+
+def test_set_operations():
+    a = IntervalSet([(0, 10), (20, 30)])
+    b = IntervalSet([(5, 25)])
+    assert a | b == IntervalSet([(0, 30)])
+    assert a & b == IntervalSet([(5, 10), (20, 25)])
+    assert a - b == IntervalSet([(0, 5), (25, 30)])
+    assert a ^ b == IntervalSet([(0, 5), (10, 20), (25, 30)])
+    assert a - a == IntervalSet() and IntervalSet() & a == IntervalSet()
+
+
+def test_elementwise():
+    starts, stops = intersection(np.array([0, 5]), np.array([10, 7]), 3, 6)
+    assert starts.tolist() == [3, 5] and stops.tolist() == [6, 6]
+    assert lengths(np.array([0, 8]), np.array([3, 4])).tolist() == [3, 0]
@@ -0,0 +1,179 @@
+"""Numba kernels, compiled on first use and cached on disk.
+
+`njit` defers importing numba and compiling to the first call, which keeps day modules
+cheap to import, and caches the machine code next to the source file by default, so
+that later processes skip compilation altogether. Generated code, e.g. a kernel
+translated from the puzzle input, goes through `compile_source`, which writes it to a
+file named after its hash so that it is cached the same way.
+
+Day modules may define a `warmup()` function exercising their kernels. `aoctool warm`
+calls them to populate the cache ahead of batch runs, where cold start dominates.
+"""
+
+import functools
+import hashlib
+import importlib
+import importlib.util
+import os
+import pathlib
+import re
+import sys
+from types import ModuleType
+from typing import Callable
+
+from .fsutil import atomic_write
+
+DEFAULT_KERNEL_DIR = pathlib.Path(
+    os.environ.get("AOCTOOL_KERNELS", pathlib.Path.home() / ".cache" / "aoctool" / "kernels")
+)
+
+
+# day modules, imported as `dayN` by scripts and tests, as `aoc<year>_dayN` by `aoctool`
+DAY_MODULE = re.compile(r"^(aoc\d{4}_)?day\d+$")
+
+
+def _origin(module: ModuleType) -> pathlib.Path | None:
+    spec = getattr(module, "__spec__", None)
+    if spec is None or spec.origin is None:
+        return None
+    return pathlib.Path(spec.origin).resolve()
+
+
+class LazyJit:
+    """Kernel compiled with `numba.njit` on first call.
+
+    Other lazy kernels referenced by the function are compiled first and substituted in
+    the module namespace, so that numba sees plain dispatchers when compiling the caller.
+
+    Numba's disk cache refers to the module of a kernel by name, while day modules are
+    imported as `dayN` by scripts and tests but as `aoc<year>_dayN` (or `aoc<year>.dayN`)
+    elsewhere. Cached day kernels are therefore always compiled from the module importable
+    under the name of its file, and not cached at all if there is none. Kernels of package
+    modules are cached under their own name.
+    """
+
+    def __init__(self, func: Callable, options: dict):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.options = options
+        self.dispatcher = None
+
+    def _canonical(self) -> "LazyJit | None":
+        """The same kernel in the module the disk cache refers to."""
+        path = pathlib.Path(self.func.__code__.co_filename).resolve()
+        name = self.func.__module__
+        if not DAY_MODULE.match(name.rpartition(".")[2]):
+            # package modules are always imported under their own dotted name
+            module = sys.modules.get(name)
+            return self if module is not None and _origin(module) == path else None
+
+        module = sys.modules.get(path.stem)
+        if module is None:
+            # look before importing, as another year's day of the same name may come first
+            # on the path
+            spec = importlib.util.find_spec(path.stem)
+            if (
+                spec is None
+                or spec.origin is None
+                or pathlib.Path(spec.origin).resolve() != path
+            ):
+                return None
+            module = importlib.import_module(path.stem)
+        elif _origin(module) != path:
+            return None
+        other = getattr(module, self.func.__name__, None)
+        if (
+            isinstance(other, LazyJit)
+            and pathlib.Path(other.func.__code__.co_filename).resolve() == path
+        ):
+            return other
+        return None
+
+    def compile(self):
+        if self.dispatcher is None and self.options.get("cache"):
+            canonical = self._canonical()
+            if canonical is None:
+                self.options = {**self.options, "cache": False}
+            elif canonical is not self:
+                self.dispatcher = canonical.compile()
+
+        if self.dispatcher is None:
+            import numba
+
+            namespace = self.func.__globals__
+            for name in self.func.__code__.co_names:
+                if isinstance(namespace.get(name), LazyJit):
+                    namespace[name] = namespace[name].compile()
+
+            self.dispatcher = numba.njit(**self.options)(self.func)
+        return self.dispatcher
+
+    def __call__(self, *args, **kwargs):
+        return self.compile()(*args, **kwargs)
+
+
+def njit(func: Callable | None = None, *, cache: bool = True, **options):
+    """Drop-in for `numba.njit` that defers importing numba and compiling, and caches the
+    compiled code on disk unless `cache=False`."""
+    options["cache"] = cache
+    if func is None:
+        return lambda f: LazyJit(f, options)
+    return LazyJit(func, options)
+
+
+def compile_source(
+    source: str, name: str, kernel_dir: pathlib.Path | str = DEFAULT_KERNEL_DIR
+) -> Callable:
+    """Return the function `name` defined by the generated `source`.
+
+    The source is stored as `<name>_<hash>.py` in `kernel_dir` and imported from there,
+    which lets numba cache kernels it defines with `cache=True`: the same program is
+    only ever compiled once.
+    """
+    module_name = f"{name}_{hashlib.sha256(source.encode()).hexdigest()[:16]}"
+    if module_name not in sys.modules:
+        path = pathlib.Path(kernel_dir) / f"{module_name}.py"
+        if not path.exists():
+            atomic_write(path, source.encode())
+
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+    return getattr(sys.modules[module_name], name)
+
+
+def test_canonical_module(tmp_path, monkeypatch):
+    kernel = "from aoctool import jit\n\n\n@jit.njit\ndef double(x):\n    return 2 * x\n"
+    for directory in ("pkg", "aoc2020", "aoc2021"):
+        (tmp_path / directory).mkdir()
+    (tmp_path / "pkg" / "kernels.py").write_text(kernel)
+    (tmp_path / "aoc2020" / "day11.py").write_text(kernel)
+    (tmp_path / "aoc2021" / "day11.py").write_text(kernel)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.syspath_prepend(str(tmp_path / "aoc2020"))
+    for name in ("pkg", "pkg.kernels", "aoc2021", "aoc2021.day11", "day11"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    # package kernels are cached under their own name
+    package = importlib.import_module("pkg.kernels")
+    assert package.double._canonical() is package.double
+
+    # day kernels are cached under the name of their file, which here is another day
+    dotted = importlib.import_module("aoc2021.day11")
+    assert dotted.double._canonical() is None and "day11" not in sys.modules
+
+    monkeypatch.syspath_prepend(str(tmp_path / "aoc2021"))
+    plain = importlib.import_module("day11")
+    assert plain.double._canonical() is plain.double
+    assert dotted.double._canonical() is plain.double
+    for name in ("pkg", "pkg.kernels", "aoc2021", "aoc2021.day11", "day11"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+def test_compile_source(tmp_path):
+    source = "def double(x):\n    return 2 * x\n"
+    double = compile_source(source, "double", tmp_path)
+    assert double(21) == 42
+    assert compile_source(source, "double", tmp_path) is double
+    assert len(list(tmp_path.glob("double_*.py"))) == 1
@@ -0,0 +1,82 @@
+"""Deferred imports, so that importing a day module stays cheap.
+
+Heavy dependencies (scipy, networkx, numba, rich...) are only needed once a solution
+actually runs. The proxies below look like the module, function or object they stand
+for, but only import it on first use:
+
+    nx = lazy.module("networkx")
+    convolve2d = lazy.attribute("scipy.signal", "convolve2d")
+    console = lazy.instance("rich.console", "Console")
+
+Numba kernels are deferred in the same way by `aoctool.jit.njit`.
+"""
+
+import functools
+import importlib
+from typing import Any, Callable
+
+_UNSET = object()
+
+
+class LazyObject:
+    """Proxy to the object returned by `factory`, which is called on first use."""
+
+    __slots__ = ("_factory", "_target")
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", _UNSET)
+
+    def resolve(self) -> Any:
+        if self._target is _UNSET:
+            object.__setattr__(self, "_target", self._factory())
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        if self._target is _UNSET:
+            return f"<lazy {self._factory!r}>"
+        return repr(self._target)
+
+
+def module(name: str) -> Any:
+    """Stand-in for `import name`."""
+    return LazyObject(functools.partial(importlib.import_module, name))
+
+
+def attribute(module_name: str, name: str) -> Any:
+    """Stand-in for `from module_name import name`."""
+    return LazyObject(lambda: getattr(importlib.import_module(module_name), name))
+
+
+def instance(module_name: str, name: str, *args, **kwargs) -> Any:
+    """Stand-in for `module_name.name(*args, **kwargs)`, e.g. a module-level console."""
+    return LazyObject(
+        lambda: getattr(importlib.import_module(module_name), name)(*args, **kwargs)
+    )
+
+
+def test_lazy_module():
+    import sys
+
+    sys.modules.pop("colorsys", None)
+    colorsys = module("colorsys")
+    assert "colorsys" not in sys.modules
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+def test_lazy_instance():
+    calls = []
+    obj = LazyObject(lambda: calls.append(1) or {"a": 1})
+    assert not calls
+    assert obj.get("a") == 1 and obj.get("b") is None
+    assert calls == [1]
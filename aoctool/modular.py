@@ -0,0 +1,173 @@
+"""Modular arithmetic: factorization and discrete logarithms.
+
+`discrete_log` solves `base ** x == target (mod modulus)` with the Pohlig-Hellman
+reduction: the order of `base` is factored, the logarithm is found modulo every prime
+power of the order by baby-step giant-step searches in subgroups of prime order, and
+the results are combined with the Chinese remainder theorem. The work is then about the
+square root of the largest prime factor of the order, rather than the order itself.
+"""
+
+import math
+import random
+
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def is_prime(n: int) -> bool:
+    """Miller-Rabin test, deterministic below 3.3e24."""
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in SMALL_PRIMES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_rho(n: int, rng: random.Random) -> int:
+    """A non-trivial factor of the composite `n`."""
+    if n % 2 == 0:
+        return 2
+    while True:
+        x = y = rng.randrange(2, n)
+        c = rng.randrange(1, n)
+        d = 1
+        while d == 1:
+            x = (x * x + c) % n
+            y = (y * y + c) % n
+            y = (y * y + c) % n
+            d = math.gcd(abs(x - y), n)
+        if d != n:
+            return d
+
+
+def factorize(n: int) -> dict[int, int]:
+    """Prime factors of `n` and their multiplicities."""
+    factors: dict[int, int] = {}
+    for p in SMALL_PRIMES:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+
+    rng = random.Random(0)
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_rho(m, rng)
+            stack += [d, m // d]
+    return dict(sorted(factors.items()))
+
+
+def totient(modulus: int) -> int:
+    """Order of the multiplicative group modulo `modulus`."""
+    result = modulus
+    for p in factorize(modulus):
+        result = result // p * (p - 1)
+    return result
+
+
+def multiplicative_order(base: int, modulus: int, group_order: int | None = None) -> int:
+    """Smallest `n > 0` such that `base ** n == 1 (mod modulus)`."""
+    if math.gcd(base, modulus) != 1:
+        raise ValueError(f"{base} is not invertible modulo {modulus}")
+    order = totient(modulus) if group_order is None else group_order
+    for p, e in factorize(order).items():
+        for _ in range(e):
+            if pow(base, order // p, modulus) != 1:
+                break
+            order //= p
+    return order
+
+
+def bsgs(target: int, base: int, modulus: int, order: int) -> int | None:
+    """Smallest `x` in `[0, order)` with `base ** x == target (mod modulus)`, if any."""
+    m = math.isqrt(order - 1) + 1
+    baby = {}
+    value = 1
+    for j in range(m):
+        baby.setdefault(value, j)
+        value = value * base % modulus
+
+    giant = pow(base, -m, modulus)
+    value = target % modulus
+    for i in range(m):
+        if value in baby and (x := i * m + baby[value]) < order:
+            return x
+        value = value * giant % modulus
+    return None
+
+
+def discrete_log(target: int, base: int, modulus: int, group_order: int | None = None) -> int:
+    """Smallest `x >= 0` with `base ** x == target (mod modulus)`.
+
+    `group_order` is a multiple of the order of `base`, by default the totient of
+    `modulus` (`modulus - 1` for a prime). Raises `ValueError` if there is no solution.
+    """
+    if group_order is None and is_prime(modulus):
+        group_order = modulus - 1
+    order = multiplicative_order(base, modulus, group_order)
+
+    residues, moduli = [], []
+    for p, e in factorize(order).items():
+        # x mod p^e, one base-p digit at a time, in the subgroup of order p
+        generator = pow(base, order // p, modulus)
+        x = 0
+        for k in range(e):
+            shifted = pow(target * pow(base, -x, modulus), order // p ** (k + 1), modulus)
+            digit = bsgs(shifted, generator, modulus, p)
+            if digit is None:
+                raise ValueError(f"{target} is not a power of {base} modulo {modulus}")
+            x += digit * p**k
+        residues.append(x)
+        moduli.append(p**e)
+
+    x = crt(residues, moduli)
+    if pow(base, x, modulus) != target % modulus:
+        raise ValueError(f"{target} is not a power of {base} modulo {modulus}")
+    return x
+
+
+def crt(residues: list[int], moduli: list[int]) -> int:
+    """Smallest `x >= 0` congruent to every residue modulo the (coprime) moduli."""
+    x, m = 0, 1
+    for r, n in zip(residues, moduli):
+        x += (r - x) * pow(m, -1, n) % n * m
+        m *= n
+    return x % m
+
+
+def test_factorize():
+    assert factorize(1) == {}
+    assert factorize(20201226) == {2: 1, 3: 1, 29: 1, 116099: 1}
+    assert factorize(2**61 - 1) == {2**61 - 1: 1}
+    assert factorize(1000003 * 999983 * 4) == {2: 2, 999983: 1, 1000003: 1}
+    assert totient(36) == 12 and multiplicative_order(7, 20201227) == 20201226
+
+
+def test_discrete_log():
+    import pytest
+
+    assert discrete_log(5764801, 7, 20201227) == 8
+    assert discrete_log(1, 7, 20201227) == 0
+    assert bsgs(17807724, 7, 20201227, 20201226) == 11
+
+    p = 2**61 - 1
+    assert discrete_log(pow(3, 123456789012345, p), 3, p) == 123456789012345
+    assert discrete_log(pow(5, 1234, 77), 5, 77) == 1234 % multiplicative_order(5, 77)
+    with pytest.raises(ValueError):
+        discrete_log(3, 4, 7)
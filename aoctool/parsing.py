@@ -0,0 +1,132 @@
+"""Bulk extraction of the integers of a puzzle input.
+
+The input is viewed as a byte array and every integer is decoded at once with NumPy:
+digit runs are located from the edges of a digit mask, and each run is summed from its
+digits weighted by powers of ten. Besides `str`, any buffer is accepted, e.g. the memory
+map returned by `aoctool.inputs.get_bytes`, which is then read without being copied.
+
+A `-` directly before a digit is a minus sign, unless it follows a digit itself, so that
+ranges such as `2-4` are read as two positive integers.
+"""
+
+import mmap
+
+import numpy as np
+
+Text = str | bytes | bytearray | memoryview | mmap.mmap
+
+MAX_DIGITS = 18
+POWERS_OF_TEN = 10 ** np.arange(MAX_DIGITS, dtype=np.int64)
+
+
+def _chars(data: Text) -> np.ndarray:
+    if isinstance(data, str):
+        data = data.encode()
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _scan(chars: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Values and start offsets of all integers."""
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    edges = np.diff(is_digit.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64), starts
+
+    lengths = ends - starts
+    if lengths.max() > MAX_DIGITS:
+        raise ValueError(f"integer with more than {MAX_DIGITS} digits")
+    exponents = np.repeat(ends - 1, lengths) - np.flatnonzero(is_digit)
+    weighted = (chars[is_digit] - ord("0")).astype(np.int64) * POWERS_OF_TEN[exponents]
+    values = np.add.reduceat(weighted, np.cumsum(lengths) - lengths)
+
+    sign = np.maximum(starts - 1, 0)
+    before_sign = np.maximum(starts - 2, 0)
+    negative = (
+        (starts >= 1) & (chars[sign] == ord("-")) & ((starts < 2) | ~is_digit[before_sign])
+    )
+    values[negative] *= -1
+    starts[negative] -= 1
+    return values, starts
+
+
+def ints(data: Text) -> np.ndarray:
+    """All integers of `data`, in order, as an int64 array."""
+    return _scan(_chars(data))[0]
+
+
+def records(data: Text, arity: int) -> np.ndarray:
+    """All integers of `data` as an `(N, arity)` array, e.g. one row per line."""
+    values = ints(data)
+    if len(values) % arity:
+        raise ValueError(f"{len(values)} integers cannot be split in records of {arity}")
+    return values.reshape(-1, arity)
+
+
+def blocks(data: Text, arity: int | None = None, header: int = 0) -> list[np.ndarray]:
+    """Integers of each block of lines separated by blank lines.
+
+    The first `header` lines of every block are skipped. With `arity`, the integers of
+    each block are reshaped into records, as by `records`.
+    """
+    chars = _chars(data)
+    values, starts = _scan(chars)
+
+    is_newline = chars == ord("\n")
+    separators = np.flatnonzero(is_newline[:-1] & is_newline[1:])
+    block_starts = np.concatenate(([0], separators + 2))
+    block_of = np.searchsorted(block_starts, starts, side="right") - 1
+
+    if header:
+        newlines = np.append(np.flatnonzero(is_newline), len(chars))
+        header_ends = newlines[
+            np.minimum(np.searchsorted(newlines, block_starts) + header - 1, len(newlines) - 1)
+        ]
+        keep = starts > header_ends[block_of]
+        values, block_of = values[keep], block_of[keep]
+
+    counts = np.bincount(block_of, minlength=len(block_starts))
+    if arity is not None and np.any(counts % arity):
+        raise ValueError(f"block integers cannot be split in records of {arity}")
+    return [
+        block if arity is None else block.reshape(-1, arity)
+        for block in np.split(values, np.cumsum(counts)[:-1])
+    ]
+
+
+def test_ints():
+    assert ints("").tolist() == []
+    assert ints("1721\n979\n-366\n").tolist() == [1721, 979, -366]
+    assert ints("target area: x=20..30, y=-10..-5").tolist() == [20, 30, -10, -5]
+    assert ints("2-4,6-8").tolist() == [2, 4, 6, 8]
+    assert ints(b"-0 x-07").tolist() == [0, -7]
+
+
+def test_records():
+    import pytest
+
+    assert records("0,9 -> 5,9\n8,0 -> 0,8", 4).tolist() == [[0, 9, 5, 9], [8, 0, 0, 8]]
+    with pytest.raises(ValueError):
+        records("1,2,3\n4,5", 3)
+    with pytest.raises(ValueError):
+        ints("1" * 19)
+
+
+def test_blocks():
+    data = "--- scanner 0 ---\n1,2,3\n-4,5,6\n\n--- scanner 1 ---\n7,8,9\n"
+    assert [b.tolist() for b in blocks(data, 3, header=1)] == [
+        [[1, 2, 3], [-4, 5, 6]],
+        [[7, 8, 9]],
+    ]
+    assert [b.tolist() for b in blocks("1\n2\n\n3\n\n")] == [[1, 2], [3], []]
+    assert [b.tolist() for b in blocks("7\n\n8", header=1)] == [[], []]
+
+
+def test_mmap(tmp_path):
+    path = tmp_path / "input"
+    path.write_bytes(b"1,2\n3,4\n")
+    with open(path, "rb") as fp:
+        buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        assert records(buf, 2).tolist() == [[1, 2], [3, 4]]
+        buf.close()
@@ -0,0 +1,164 @@
+import collections
+import cProfile
+import dataclasses
+import io
+import pathlib
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable
+
+DEFAULT_OUTPUT_DIR = pathlib.Path("profiles")
+
+
+@dataclasses.dataclass
+class ProfileReport:
+    name: str
+    duration: float
+    peak_memory: int
+    hotspots: pathlib.Path
+    stats: pathlib.Path
+    collapsed: pathlib.Path | None
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: {self.duration * 1000:.2f}ms (profiled), "
+            f"peak memory {self.peak_memory / 2**20:.2f}MiB, hotspots in {self.hotspots}"
+        )
+
+
+class StackSampler:
+    """Sample the Python call stack on a CPU timer and count collapsed stacks.
+
+    Frames above the one entering the sampler are not recorded. Sampling requires
+    `signal.setitimer` and the main thread, and is silently disabled otherwise.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.enabled = False
+        self._base_depth = 0
+        self._prev_handler = None
+
+    def _handler(self, signum, frame) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.reverse()
+        if len(stack) > self._base_depth:
+            self.counts[";".join(stack[self._base_depth :])] += 1
+
+    def __enter__(self) -> "StackSampler":
+        self.enabled = (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+        if self.enabled:
+            frame = sys._getframe(1)
+            while frame is not None:
+                self._base_depth += 1
+                frame = frame.f_back
+            self._prev_handler = signal.signal(signal.SIGPROF, self._handler)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.enabled:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._prev_handler)
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+def profile_call(
+    func: Callable,
+    *args,
+    name: str,
+    output_dir: pathlib.Path = DEFAULT_OUTPUT_DIR,
+    top: int = 25,
+    **kwargs,
+) -> tuple[object, ProfileReport]:
+    """Call `func` under cProfile, tracemalloc and a stack sampler.
+
+    Writes `<name>.prof` (pstats), `<name>.txt` (hotspot tables and peak memory) and
+    `<name>.collapsed` (collapsed stacks for flamegraph tools) to `output_dir`.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    try:
+        with StackSampler() as sampler:
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    stats_path = output_dir / f"{name}.prof"
+    profiler.dump_stats(stats_path)
+
+    stream = io.StringIO()
+    stream.write(f"{name}\n")
+    stream.write(f"duration (profiled): {duration * 1000:.2f}ms\n")
+    stream.write(f"peak memory: {peak_memory} bytes ({peak_memory / 2**20:.2f}MiB)\n\n")
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    hotspots_path = output_dir / f"{name}.txt"
+    hotspots_path.write_text(stream.getvalue())
+
+    collapsed_path = None
+    if sampler.enabled:
+        collapsed_path = output_dir / f"{name}.collapsed"
+        collapsed_path.write_text(sampler.collapsed())
+
+    return result, ProfileReport(
+        name, duration, peak_memory, hotspots_path, stats_path, collapsed_path
+    )
+
+
+def run_part(
+    func: Callable[[str], object], data: str, name: str, profile: bool = False
+) -> object:
+    """Run a part, profiling it and printing a summary when `profile` is set."""
+    if not profile:
+        return func(data)
+
+    result, report = profile_call(func, data, name=name)
+    print(report.summary())
+    return result
+
+
+def test_profile_call(tmp_path):
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    def work():
+        lst = [fib(15) for _ in range(20)]
+        return sum(lst)
+
+    result, report = profile_call(work, name="fib", output_dir=tmp_path)
+    assert result == 20 * 610
+    assert report.peak_memory > 0
+    assert "fib" in report.hotspots.read_text()
+    if report.collapsed is not None:
+        for line in report.collapsed.read_text().splitlines():
+            assert line.startswith("work ")
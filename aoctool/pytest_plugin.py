@@ -0,0 +1,49 @@
+"""Record `pytest-benchmark` results in the benchmark history (see `aoctool.history`).
+
+Loaded from the repository's `conftest.py`. Benchmarks defined in `aoc<year>/day<N>.py`
+files are recorded with their year and day, the benchmark group as part and the
+parametrization (or test name) as function.
+"""
+
+import re
+
+import pytest
+
+from .history import Record, default_history
+
+PATH_EXPR = re.compile(r"aoc(\d{4})/day(\d+)\.py")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-history",
+        action="store_true",
+        help="do not record benchmark results in the aoctool history",
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    # the benchmark session is private to pytest-benchmark, which may not be installed
+    bench_session = getattr(session.config, "_benchmarksession", None)
+    if bench_session is None or session.config.getoption("no_history"):
+        return
+
+    records = []
+    for bench in bench_session.benchmarks:
+        if not bench:
+            continue
+        mo = PATH_EXPR.search(bench.fullname)
+        year, day = (int(mo.group(1)), int(mo.group(2))) if mo else (None, None)
+        records.append(
+            Record(
+                year,
+                day,
+                bench.group or bench.name,
+                bench.param or bench.name,
+                bench.stats.data,
+            )
+        )
+
+    if records:
+        default_history().add_run("pytest", records, session.config.rootpath)
@@ -0,0 +1,115 @@
+import collections
+import dataclasses
+import multiprocessing
+import multiprocessing.connection
+import os
+import pathlib
+import sys
+import time
+from typing import Iterable, Iterator
+
+from .bench import format_error, get_input
+from .days import DayModule, find_parts
+
+PART_NAMES = ("part1", "part2")
+
+
+@dataclasses.dataclass(frozen=True)
+class Task:
+    year: int
+    day: int
+    part: str
+    path: pathlib.Path
+
+
+@dataclasses.dataclass
+class TaskResult:
+    year: int
+    day: int
+    part: str
+    status: str
+    result: str | None = None
+    error: str | None = None
+    duration: float | None = None
+
+    @classmethod
+    def for_task(cls, task: Task, status: str, **kwargs) -> "TaskResult":
+        return cls(task.year, task.day, task.part, status, **kwargs)
+
+
+def make_tasks(day_modules: Iterable[DayModule]) -> list[Task]:
+    # The parent does not import the day modules: workers report a missing part as skipped.
+    return [Task(dm.year, dm.day, part, dm.path) for dm in day_modules for part in PART_NAMES]
+
+
+def _worker(task: Task, conn: multiprocessing.connection.Connection) -> None:
+    # keep the streamed output readable by silencing the solutions' own prints
+    sys.stdout = sys.stderr = open(os.devnull, "w")
+
+    try:
+        module = DayModule(task.year, task.day, task.path).load()
+        func = find_parts(module, task.day).get(task.part)
+        if func is None:
+            result = TaskResult.for_task(task, "skipped")
+        else:
+            data = get_input(task.year, task.day)
+            start = time.perf_counter()
+            value = func(data)
+            duration = time.perf_counter() - start
+            result = TaskResult.for_task(task, "ok", result=str(value), duration=duration)
+    except Exception as exc:
+        result = TaskResult.for_task(task, "error", error=format_error(exc))
+
+    conn.send(result)
+    conn.close()
+
+
+def run_tasks(tasks: Iterable[Task], jobs: int, timeout: float | None) -> Iterator[TaskResult]:
+    """Run tasks in up to `jobs` worker processes, yielding results as they complete.
+
+    Each task gets its own process so that it can be killed when it exceeds `timeout`
+    seconds, and so that solutions may themselves use `multiprocess` pools.
+    """
+    pending = collections.deque(tasks)
+    running = {}
+
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                task = pending.popleft()
+                recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+                proc = multiprocessing.Process(target=_worker, args=(task, send_conn))
+                proc.start()
+                send_conn.close()
+                deadline = time.monotonic() + timeout if timeout is not None else None
+                running[recv_conn] = (task, proc, deadline)
+
+            deadlines = [deadline for _, _, deadline in running.values() if deadline]
+            wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+            for conn in multiprocessing.connection.wait(list(running), timeout=wait_time):
+                task, proc, _ = running.pop(conn)
+                try:
+                    result = conn.recv()
+                except EOFError:
+                    proc.join()
+                    result = TaskResult.for_task(
+                        task, "error", error=f"worker died with exit code {proc.exitcode}"
+                    )
+                conn.close()
+                proc.join()
+                yield result
+
+            now = time.monotonic()
+            for conn, (task, proc, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    del running[conn]
+                    proc.terminate()
+                    proc.join()
+                    conn.close()
+                    yield TaskResult.for_task(task, "timeout", duration=timeout)
+    finally:
+        for conn, (_, proc, _) in running.items():
+            proc.terminate()
+            proc.join()
+            conn.close()
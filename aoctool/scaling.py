@@ -0,0 +1,115 @@
+import dataclasses
+import math
+import statistics
+import tracemalloc
+from typing import Iterable
+
+from .bench import format_error, time_function
+from .days import DayModule, find_parts
+from .generators import Generator
+
+
+@dataclasses.dataclass
+class ScalePoint:
+    year: int
+    day: int
+    part: str
+    size: int
+    input_bytes: int
+    status: str = "ok"
+    error: str | None = None
+    median: float | None = None
+    peak_memory: int | None = None
+
+
+def peak_memory(func, *args, **kwargs) -> int:
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def fit_exponent(sizes: Iterable[float], values: Iterable[float]) -> float | None:
+    """Least-squares slope in log-log space, i.e. `k` in `value ~ size**k`."""
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s > 0 and v > 0]
+    if len(points) < 2:
+        return None
+    xs, ys = zip(*points)
+    x_mean, y_mean = statistics.mean(xs), statistics.mean(ys)
+    denom = sum((x - x_mean) ** 2 for x in xs)
+    if denom == 0:
+        return None
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / denom
+
+
+def scale_day(
+    day_module: DayModule,
+    generator: Generator,
+    sizes: Iterable[int] | None = None,
+    repeat: int = 3,
+    seed: int = 0,
+    max_time: float | None = None,
+) -> list[ScalePoint]:
+    """Run each part on generated inputs of increasing size.
+
+    A part is no longer run on larger inputs once its median time exceeds `max_time`.
+    """
+    module = day_module.load()
+    parts = find_parts(module, day_module.day)
+    sizes = sorted(sizes if sizes else generator.sizes)
+
+    points = []
+    for part, func in parts.items():
+        for size in sizes:
+            data = generator.generate(size, seed)
+            kwargs = generator.kwargs(size, part)
+            point = ScalePoint(day_module.year, day_module.day, part, size, len(data))
+            points.append(point)
+            try:
+                _, timings = time_function(lambda d: func(d, **kwargs), data, 0, repeat)
+                point.median = statistics.median(timings)
+                point.peak_memory = peak_memory(func, data, **kwargs)
+            except Exception as exc:
+                point.status = "error"
+                point.error = format_error(exc)
+                break
+
+            if max_time is not None and point.median > max_time:
+                break
+
+    return points
+
+
+def make_report(
+    points: list[ScalePoint], generators: dict[tuple[int, int], Generator]
+) -> dict:
+    summary = []
+    keys = sorted({(p.year, p.day, p.part) for p in points})
+    for year, day, part in keys:
+        ok = [p for p in points if (p.year, p.day, p.part) == (year, day, part) and p.median]
+        summary.append(
+            {
+                "year": year,
+                "day": day,
+                "part": part,
+                "size": generators[(year, day)].description,
+                "time_exponent": fit_exponent([p.size for p in ok], [p.median for p in ok]),
+                "memory_exponent": fit_exponent(
+                    [p.size for p in ok], [p.peak_memory for p in ok]
+                ),
+            }
+        )
+
+    return {"summary": summary, "points": [dataclasses.asdict(p) for p in points]}
+
+
+def test_fit_exponent():
+    assert abs(fit_exponent([10, 100, 1000], [1, 100, 10000]) - 2.0) < 1e-12
+    assert abs(fit_exponent([2, 4, 8], [3, 6, 12]) - 1.0) < 1e-12
+    assert fit_exponent([10], [1]) is None
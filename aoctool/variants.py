@@ -0,0 +1,220 @@
+"""Competing implementations of the same computation.
+
+Days often keep several alternative implementations side by side. Grouping them makes it
+possible to check that they agree on shared sample inputs and to time them head-to-head:
+
+    part2 = variants.VariantGroup("part2", samples=["17,x,13,19"])
+
+    @part2.variant
+    def day13_part2_crt(data: str) -> int:
+        ...
+
+Calling the group calls its default variant. A variant marked `default=True` stays the
+default: the samples are usually too small for their timings to say which variant is
+fastest on real input. Otherwise, or when the group is created with `auto=True`, this is
+the fastest one according to the last recorded benchmark of the current code of all
+variants (see `aoctool variants`), and failing that the first one registered.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import pickle
+import statistics
+from types import ModuleType
+from typing import Any, Callable, Iterable
+
+from .cache import _MISSING, ResultCache, code_version, default_cache
+
+
+class VariantMismatchError(AssertionError):
+    pass
+
+
+@dataclasses.dataclass
+class Variant:
+    name: str
+    func: Callable
+    kwargs: dict
+    selectable: bool = True
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **self.kwargs, **kwargs)
+
+
+def _equal(a: Any, b: Any) -> bool:
+    try:
+        return bool(a == b)
+    except ValueError:  # numpy arrays
+        return a.tolist() == b.tolist()
+
+
+class VariantGroup:
+    def __init__(
+        self,
+        name: str,
+        samples: Iterable = (),
+        cache: ResultCache | None = None,
+        auto: bool = False,
+    ):
+        """Samples are tuples of positional arguments, or single arguments.
+
+        With `auto`, benchmark timings take precedence over a variant marked `default=True`.
+        """
+        self.name = name
+        self.samples = [s if isinstance(s, tuple) else (s,) for s in samples]
+        self.variants: dict[str, Variant] = {}
+        self.cache = cache
+        self.auto = auto
+        self._pinned: str | None = None
+        self._fallback: str | None = None
+        self._default: str | None = None
+
+    def variant(
+        self,
+        func: Callable | None = None,
+        *,
+        name: str | None = None,
+        default: bool = False,
+        selectable: bool = True,
+        **kwargs,
+    ):
+        """Register `func` as a variant and return it unchanged.
+
+        Keyword arguments are bound when the group calls the variant. Variants that are
+        not `selectable` (e.g. searches bounded for small inputs only) are checked and
+        timed, but never become the default.
+        """
+        if func is None:
+            return functools.partial(
+                self.variant, name=name, default=default, selectable=selectable, **kwargs
+            )
+
+        name = name or func.__name__
+        if name in self.variants:
+            raise ValueError(f"{self.name} already has a variant named {name}")
+        self.variants[name] = Variant(name, func, kwargs, selectable)
+        if default:
+            self._pinned = name
+        if default or (self._fallback is None and selectable):
+            self._fallback = name
+        self._default = None
+        return func
+
+    @property
+    def key(self) -> str:
+        digest = hashlib.sha256(self.name.encode())
+        for variant in self.variants.values():
+            digest.update(variant.name.encode())
+            digest.update(code_version(variant.func).encode())
+            digest.update(pickle.dumps(sorted(variant.kwargs.items())))
+        digest.update(pickle.dumps(self.samples))
+        return digest.hexdigest()
+
+    def _cache(self) -> ResultCache:
+        return self.cache if self.cache is not None else default_cache()
+
+    def recorded_timings(self) -> dict[str, float] | None:
+        record = self._cache().get(self.key)
+        return None if record is _MISSING else record
+
+    @property
+    def default(self) -> Variant:
+        if self._default is None and self._pinned is not None and not self.auto:
+            self._default = self._pinned
+        if self._default is None:
+            timings = self.recorded_timings() or {}
+            fastest = [name for name in timings if self.variants[name].selectable]
+            self._default = fastest[0] if fastest else self._fallback
+        return self.variants[self._default]
+
+    def __call__(self, *args, **kwargs):
+        return self.default(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"{self.name}[{self.default.name}]"
+
+    def check(self, samples: Iterable | None = None) -> list[Any]:
+        """Run every variant on every sample and return the results they agree on."""
+        results = []
+        for args in self.samples if samples is None else samples:
+            outputs = {name: variant(*args) for name, variant in self.variants.items()}
+            ref_name, ref = next(iter(outputs.items()))
+            for name, output in outputs.items():
+                if not _equal(output, ref):
+                    raise VariantMismatchError(
+                        f"{self.name}: {name} returned {output!r} "
+                        f"but {ref_name} returned {ref!r}"
+                    )
+            results.append(ref)
+        return results
+
+    def benchmark(self, warmup: int = 1, repeat: int = 5) -> dict[str, float]:
+        """Time every variant on the samples (sum of per-sample medians), fastest first.
+
+        The timings are recorded in the result cache and the fastest selectable variant
+        becomes the default, unless a variant marked `default=True` takes precedence.
+        """
+        from .bench import time_function
+
+        timings = {}
+        for name, variant in self.variants.items():
+            timings[name] = sum(
+                statistics.median(
+                    time_function(lambda a: variant(*a), args, warmup, repeat)[1]
+                )
+                for args in self.samples
+            )
+
+        timings = dict(sorted(timings.items(), key=lambda item: item[1]))
+        self._cache().put(self.key, timings)
+        self._default = None
+        return timings
+
+
+def find_groups(module: ModuleType) -> list[VariantGroup]:
+    groups = []
+    for obj in vars(module).values():
+        if isinstance(obj, VariantGroup) and obj not in groups:
+            groups.append(obj)
+    return groups
+
+
+def test_variant_group(tmp_path):
+    import pytest
+
+    group = VariantGroup("square", samples=[3, (4,)], cache=ResultCache(tmp_path))
+
+    @group.variant(selectable=False)
+    def square_loop(x):
+        return sum(x for _ in range(x))
+
+    @group.variant(default=True)
+    def square_mul(x):
+        return x * x
+
+    group.variant(name="square_pow")(lambda x: x**2)
+
+    assert group(5) == 25
+    assert group.default.name == "square_mul"
+    assert group.check() == [9, 16]
+
+    timings = group.benchmark(warmup=0, repeat=1)
+    assert list(timings) == list(group.recorded_timings())
+    assert group.default.name == "square_mul"
+
+    auto = VariantGroup("square", samples=[3, (4,)], cache=group.cache, auto=True)
+    for variant in group.variants.values():
+        auto.variant(
+            variant.func,
+            name=variant.name,
+            default=variant.name == "square_mul",
+            selectable=variant.selectable,
+        )
+    assert auto.recorded_timings() == timings
+    assert auto.default.name == next(name for name in timings if name != "square_loop")
+
+    group.variant(name="square_bad")(lambda x: x + x)
+    with pytest.raises(VariantMismatchError):
+        group.check()
+    assert group.recorded_timings() is None
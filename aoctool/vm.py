@@ -0,0 +1,296 @@
+"""Bytecode interpreter for the assembly-style puzzles.
+
+Programs are parsed once into integer arrays, one entry per instruction, and run by a
+numba kernel dispatching on the opcode, so that brute-force searches over patched
+programs or over many inputs (`run_batch`) stay in compiled code.
+
+The instruction set is the union of the puzzles' ones:
+
+- `nop`/`noop`, `jmp offset` and `acc value` (2020 day 8);
+- `inp a`, `add a b`, `mul a b`, `div a b`, `mod a b` and `eql a b`, where `b` is a
+  register or a value (2021 day 24);
+- `addx value`, which takes two cycles (2022 day 10).
+
+There are no conditional jumps, so a program executing an instruction twice loops
+forever: the interpreter stops there and reports `LOOP`. Runs can record which
+instructions were executed and the registers during every cycle.
+"""
+
+import dataclasses
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from . import jit
+
+NOP, JMP, INP, ADD, MUL, DIV, MOD, EQL = range(8)
+
+# opcode, implicit operands and number of cycles of each mnemonic
+MNEMONICS = {
+    "nop": (NOP, (), 1),
+    "noop": (NOP, (), 1),
+    "jmp": (JMP, (), 1),
+    "acc": (ADD, ("acc",), 1),
+    "addx": (ADD, ("x",), 2),
+    "inp": (INP, (), 1),
+    "add": (ADD, (), 1),
+    "mul": (MUL, (), 1),
+    "div": (DIV, (), 1),
+    "mod": (MOD, (), 1),
+    "eql": (EQL, (), 1),
+}
+
+HALTED, LOOP, OUT_OF_BOUNDS, NO_INPUT = range(4)
+
+
+@dataclasses.dataclass
+class Program:
+    ops: np.ndarray
+    # destination register, and source register or value (the offset of jumps)
+    dest: np.ndarray
+    src: np.ndarray
+    src_is_register: np.ndarray
+    cycles: np.ndarray
+    registers: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def copy(self) -> "Program":
+        return dataclasses.replace(
+            self,
+            ops=self.ops.copy(),
+            dest=self.dest.copy(),
+            src=self.src.copy(),
+            src_is_register=self.src_is_register.copy(),
+            cycles=self.cycles.copy(),
+        )
+
+    def arrays(self) -> tuple[np.ndarray, ...]:
+        return self.ops, self.dest, self.src, self.src_is_register, self.cycles
+
+
+def _is_value(operand: str) -> bool:
+    return operand.lstrip("+-").isdigit()
+
+
+def parse(data: str, registers: Sequence[str] | None = None) -> Program:
+    """Parse one instruction per line.
+
+    Registers are numbered in the order of `registers`, in alphabetical order by default.
+    """
+    instructions = []
+    for line in data.splitlines():
+        mnemonic, *operands = line.split()
+        if mnemonic not in MNEMONICS:
+            raise ValueError(f"unknown instruction: {line!r}")
+        op, implicit, cycles = MNEMONICS[mnemonic]
+        operands = [*implicit, *operands]
+        if op in (NOP, JMP):
+            operands.insert(0, None)
+        instructions.append((op, operands + [None] * (2 - len(operands)), cycles))
+
+    names = {
+        operand
+        for _, operands, _ in instructions
+        for operand in operands
+        if operand is not None and not _is_value(operand)
+    }
+    registers = tuple(sorted(names) if registers is None else registers)
+    if unknown := names - set(registers):
+        raise ValueError(f"unknown registers: {sorted(unknown)}")
+
+    def encode(operand: str | None) -> int:
+        if operand is None:
+            return 0
+        return int(operand) if _is_value(operand) else registers.index(operand)
+
+    return Program(
+        ops=np.array([op for op, _, _ in instructions], dtype=np.int8),
+        dest=np.array(
+            [encode(operands[0]) for _, operands, _ in instructions], dtype=np.int64
+        ),
+        src=np.array([encode(operands[1]) for _, operands, _ in instructions], dtype=np.int64),
+        src_is_register=np.array(
+            [o[1] is not None and not _is_value(o[1]) for _, o, _ in instructions], dtype=bool
+        ),
+        cycles=np.array([cycles for _, _, cycles in instructions], dtype=np.int64),
+        registers=registers,
+    )
+
+
+@jit.njit
+def _execute(ops, dest, src, src_is_register, cycles, registers, inputs, executed, history):
+    """Run until the program halts or loops, updating `registers` in place.
+
+    `history` receives the registers during every cycle and after the last one, unless
+    it is empty. Returns the status, the program counter, and the numbers of executed
+    instructions and of cycles.
+    """
+    pc = steps = cycle = consumed = 0
+    record = len(history) > 0
+    while True:
+        if pc == len(ops):
+            status = HALTED
+            break
+        if pc < 0 or pc > len(ops):
+            status = OUT_OF_BOUNDS
+            break
+        if executed[pc]:
+            status = LOOP
+            break
+        op = ops[pc]
+        if op == INP and consumed == len(inputs):
+            status = NO_INPUT
+            break
+        executed[pc] = True
+
+        for _ in range(cycles[pc]):
+            if record:
+                history[cycle] = registers
+            cycle += 1
+        steps += 1
+
+        value = registers[src[pc]] if src_is_register[pc] else src[pc]
+        d = dest[pc]
+        if op == JMP:
+            pc += value
+            continue
+        if op == ADD:
+            registers[d] += value
+        elif op == MUL:
+            registers[d] *= value
+        elif op == DIV:
+            # truncated towards zero
+            quotient = abs(registers[d]) // abs(value)
+            registers[d] = quotient if (registers[d] < 0) == (value < 0) else -quotient
+        elif op == MOD:
+            registers[d] %= value
+        elif op == EQL:
+            registers[d] = 1 if registers[d] == value else 0
+        elif op == INP:
+            registers[d] = inputs[consumed]
+            consumed += 1
+        pc += 1
+
+    if record:
+        history[cycle] = registers
+    return status, pc, steps, cycle
+
+
+@jit.njit
+def _execute_batch(ops, dest, src, src_is_register, cycles, initial, inputs, out, statuses):
+    executed = np.zeros(len(ops), dtype=np.bool_)
+    history = np.zeros((0, len(initial)), dtype=np.int64)
+    for row in range(len(inputs)):
+        out[row] = initial
+        executed[:] = False
+        statuses[row] = _execute(
+            ops, dest, src, src_is_register, cycles, out[row], inputs[row], executed, history
+        )[0]
+
+
+@dataclasses.dataclass
+class Result:
+    status: int
+    registers: np.ndarray
+    pc: int
+    steps: int
+    cycles: int
+    # whether each instruction was executed
+    executed: np.ndarray
+    # registers during every cycle, then after the last one
+    history: np.ndarray | None
+    names: tuple[str, ...]
+
+    def __getitem__(self, register: str) -> int:
+        return int(self.registers[self.names.index(register)])
+
+
+def _initial(program: Program, registers: Iterable[int] | None) -> np.ndarray:
+    initial = np.zeros(len(program.registers), dtype=np.int64)
+    if registers is not None:
+        initial[:] = list(registers)
+    return initial
+
+
+def run(
+    program: Program,
+    inputs: Iterable[int] = (),
+    registers: Iterable[int] | None = None,
+    history: bool = False,
+) -> Result:
+    """Run `program` from the given register values (zero by default), reading the `inp`
+    instructions from `inputs`, until it halts or loops."""
+    values = _initial(program, registers)
+    inputs = np.asarray(list(inputs), dtype=np.int64)
+    executed = np.zeros(len(program), dtype=bool)
+    # instructions are executed at most once
+    trace = np.zeros(
+        (int(program.cycles.sum()) + 1 if history else 0, len(values)), dtype=np.int64
+    )
+    status, pc, steps, cycles = _execute(*program.arrays(), values, inputs, executed, trace)
+    return Result(
+        status=status,
+        registers=values,
+        pc=pc,
+        steps=steps,
+        cycles=cycles,
+        executed=executed,
+        history=trace[: cycles + 1] if history else None,
+        names=program.registers,
+    )
+
+
+def run_batch(
+    program: Program, inputs: np.ndarray, registers: Iterable[int] | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run `program` once per row of `inputs`, returning the final registers of every run
+    and its status."""
+    inputs = np.atleast_2d(np.asarray(inputs, dtype=np.int64))
+    initial = _initial(program, registers)
+    out = np.empty((len(inputs), len(initial)), dtype=np.int64)
+    statuses = np.empty(len(inputs), dtype=np.int64)
+    _execute_batch(*program.arrays(), initial, inputs, out, statuses)
+    return out, statuses
+
+
+def warmup():
+    run(parse("inp a\nadd a 1\nnop +0\njmp +1"), [1], history=True)
+    run_batch(parse("inp a"), [[1]])
+
+
+def test_loop():
+    program = parse("nop +0\nacc +1\njmp +4\nacc +3\njmp -3\nacc -99\nacc +1\njmp -4\nacc +6")
+    result = run(program)
+    assert result.status == LOOP and result["acc"] == 5 and result.pc == 1
+    assert result.executed.tolist() == [1, 1, 1, 1, 1, 0, 1, 1, 0]
+
+    program.ops[7] = NOP
+    result = run(program)
+    assert result.status == HALTED and result["acc"] == 8
+    assert run(parse("jmp +2")).status == OUT_OF_BOUNDS
+
+
+def test_alu():
+    program = parse(
+        "inp w\nadd z w\nmod z 2\ndiv w 2\nadd y w\nmod y 2\n"
+        "div w 2\nadd x w\nmod x 2\ndiv w 2\nmod w 2"
+    )
+    assert program.registers == ("w", "x", "y", "z")
+    assert run(program, [3]).registers.tolist() == [0, 0, 1, 1]
+    assert run(program).status == NO_INPUT
+
+    out, statuses = run_batch(program, np.arange(16)[:, None])
+    assert out[:, ::-1].tolist() == [
+        [n & 1, n >> 1 & 1, n >> 2 & 1, n >> 3 & 1] for n in range(16)
+    ]
+    assert (statuses == HALTED).all()
+
+    assert run(parse("inp a\ndiv a -2"), [-7]).registers.tolist() == [3]
+
+
+def test_history():
+    result = run(parse("noop\naddx 3\naddx -5"), registers=[1], history=True)
+    assert result.cycles == 5
+    assert result.history[:, 0].tolist() == [1, 1, 1, 4, 4, -1]
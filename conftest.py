@@ -0,0 +1 @@
+pytest_plugins = ["aoctool.pytest_plugin"]